@@ -1,8 +1,16 @@
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
-from typing import Optional
-from ...services.financial_chat_service import get_financial_advice
-from ...models.schemas import ChatResponse
+from typing import Optional, Dict, Any
+from ...services.financial_chat_service import (
+    get_financial_advice,
+    stream_financial_advice,
+    get_chat_cache_stats,
+    get_chat_coalescing_stats,
+    get_research_cache_stats
+)
+from ...models.schemas import ChatResponse, JobSubmission
+from ...services.job_store import job_store, JobStoreFullError
+from ..sse import sse_response
 
 router = APIRouter()
 
@@ -33,4 +41,51 @@ async def chat_with_financial_advisor(request: ChatRequest):
         raise HTTPException(
             status_code=500,
             detail=f"Error processing your query: {str(e)}"
-        ) 
\ No newline at end of file
+        ) 
+
+@router.post("/chat/stream")
+async def stream_chat_with_financial_advisor(request: ChatRequest):
+    """
+    Chat with a financial advisor AI agent, streaming progress as Server-Sent Events.
+
+    Events are sent as each step finishes:
+    - `research`: research findings
+    - `advice`: the advisor's analysis
+    - `result`: the final `ChatResponse`
+    - `error`: sent instead of `result` if the crew fails
+    """
+    return sse_response(stream_financial_advice(request.query))
+
+@router.post("/chat/jobs", response_model=JobSubmission, status_code=202)
+async def submit_chat_job(request: ChatRequest):
+    """
+    Submit a financial chat query as a background job.
+
+    Returns a job id immediately; poll `GET /api/jobs/{job_id}` for the
+    `ChatResponse` once it is ready.
+    """
+    try:
+        job = job_store.submit("financial_chat", lambda: get_financial_advice(request.query))
+    except JobStoreFullError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+    return JobSubmission(
+        job_id=job.id,
+        status=job.status,
+        status_url=f"/api/jobs/{job.id}"
+    )
+
+@router.get("/chat/cache")
+async def get_chat_cache_statistics() -> Dict[str, Any]:
+    """Hit/miss statistics for the financial chat response cache"""
+    return get_chat_cache_stats()
+
+@router.get("/chat/research-cache")
+async def get_research_cache_statistics() -> Dict[str, Any]:
+    """Hit/miss statistics for the research tool's search result and page text caches"""
+    return get_research_cache_stats()
+
+@router.get("/chat/coalescing")
+async def get_chat_coalescing_statistics() -> Dict[str, Any]:
+    """How many financial chat requests shared an in-flight crew run"""
+    return get_chat_coalescing_stats()
\ No newline at end of file
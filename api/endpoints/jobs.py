@@ -0,0 +1,27 @@
+from fastapi import APIRouter, HTTPException
+from ...models.schemas import JobStatusResponse
+from ...services.job_store import job_store
+
+router = APIRouter()
+
+@router.get("/{job_id}", response_model=JobStatusResponse)
+async def get_job_status(job_id: str):
+    """
+    Poll a background job submitted to one of the `/jobs` submit endpoints.
+
+    Once the job has completed, `result` holds the same response the
+    synchronous endpoint would have returned.
+    """
+    job = job_store.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+
+    return JobStatusResponse(
+        job_id=job.id,
+        kind=job.kind,
+        status=job.status,
+        created_at=job.created_at,
+        finished_at=job.finished_at,
+        result=job.result,
+        error=job.error
+    )
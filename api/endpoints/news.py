@@ -1,20 +1,93 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel
 from typing import List, Dict, Any
 from datetime import datetime
-from app.services.news_service import fetch_financial_news
-from app.models.schemas import NewsArticleCollection
+import asyncio
+from app.services.news_scheduler import news_scheduler
+from app.services.article_store import article_store
+from app.services.market_digest import market_digest
+from app.services.news_service import summarize_recent_news
+from app.services.news_summaries import article_summarizer
+from app.tools.news_pipeline import news_pipeline
+from app.models.schemas import MarketDigest, NewsArticleCollection, NewsSearchResponse, NewsSummaryCollection
 
 router = APIRouter()
 
 @router.get("/latest", response_model=NewsArticleCollection)
 async def get_latest_news():
-    """Get the latest financial news"""
+    """
+    Get the latest financial news.
+
+    Served from memory; sources are refreshed in the background, so
+    latency does not depend on the upstream news sites.
+    """
+    try:
+        return await news_scheduler.get_latest()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/digest", response_model=MarketDigest)
+async def get_market_digest():
+    """
+    Get the market analysis digest of the latest news.
+
+    Built once per news refresh and shared by all wealth advice requests;
+    `version` increases each time the news changes.
+    """
+    try:
+        return await market_digest.get()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/summaries", response_model=NewsSummaryCollection)
+async def get_news_summaries(limit: int = Query(20, ge=1, le=100)):
+    """
+    Get LLM summaries of the latest financial news.
+
+    Each article is summarized once per version of its content; repeat
+    requests are answered from stored summaries without calling the LLM.
+    """
+    try:
+        return await summarize_recent_news(limit)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/summaries/stats")
+async def get_news_summary_stats() -> Dict[str, Any]:
+    """Get summary cache hits and misses, LLM calls and coalesced prompts"""
+    return article_summarizer.stats()
+
+@router.get("/search", response_model=NewsSearchResponse)
+async def search_news(
+    q: str = Query(..., min_length=1, max_length=200),
+    page: int = Query(1, ge=1),
+    page_size: int = Query(20, ge=1, le=100)
+):
+    """
+    Search ingested news articles by title and summary.
+
+    Matches articles containing every word of the query, ranked by
+    relevance with title matches weighted above summary matches.
+    """
     try:
-        # Fetch news using the news service
-        news_data = await fetch_financial_news()
-        
-        # Parse the JSON string into a NewsArticleCollection
-        return NewsArticleCollection.parse_raw(news_data)
+        articles, has_more = await asyncio.to_thread(article_store.search, q, page, page_size)
+        return NewsSearchResponse(
+            query=q,
+            page=page,
+            page_size=page_size,
+            has_more=has_more,
+            articles=articles
+        )
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e)) 
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/sources")
+async def get_news_source_stats() -> Dict[str, Dict[str, Any]]:
+    """
+    Get per-source stats of the latest news crawl.
+
+    For each source: fetch and parse time, pages fetched, unchanged or
+    failed, articles parsed and new, and whether the crawl stopped early
+    on a page of already stored articles.
+    """
+    return news_pipeline.stats()
\ No newline at end of file
@@ -1,8 +1,25 @@
-from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
-from typing import List, Dict, Any
-from ...models.schemas import UserProfile, NewsArticleCollection, WealthManagementResponse
-from ...services.wealth_service import get_wealth_management_advice
+from fastapi import APIRouter, HTTPException, Request, Query
+from pydantic import BaseModel, Field
+from typing import List, Dict, Any, Optional
+import asyncio
+import time
+from ...models.schemas import (
+    UserProfile,
+    WealthManagementResponse,
+    JobSubmission,
+    RiskBatchResponse,
+    GoalSimulationResponse
+)
+from ...services.risk_scoring import load_profiles, score_risk_frame
+from ...services.goal_simulator import simulate_goals, GOAL_SIM_PATHS
+from ...services.allocation_optimizer import optimize_allocation
+from ...services.job_store import job_store, JobStoreFullError
+from ..sse import sse_response
+from ...services.wealth_service import (
+    get_wealth_management_advice,
+    stream_wealth_management_advice,
+    get_wealth_coalescing_stats
+)
 
 router = APIRouter()
 
@@ -16,6 +33,25 @@ class WealthAdviceRequest(BaseModel):
     risk_tolerance: str
     goals: List[Dict[str, Any]]
 
+class GoalSimulationRequest(WealthAdviceRequest):
+    """Request model for goal feasibility simulation"""
+    asset_allocation: Optional[Dict[str, float]] = None
+    paths: int = Field(default=GOAL_SIM_PATHS, ge=100, le=100000)
+    annual_contribution: Optional[float] = None
+    seed: Optional[int] = None
+
+def _to_user_profile(request: WealthAdviceRequest) -> UserProfile:
+    """Convert a wealth advice request to a UserProfile"""
+    return UserProfile(
+        age=request.age,
+        income=request.income,
+        dependents=request.dependents,
+        investment_horizon=request.investment_horizon,
+        existing_investments=request.existing_investments,
+        risk_tolerance=request.risk_tolerance,
+        goals=request.goals
+    )
+
 @router.post("/advice", response_model=WealthManagementResponse)
 async def get_wealth_advice(request: WealthAdviceRequest):
     """
@@ -23,27 +59,125 @@ async def get_wealth_advice(request: WealthAdviceRequest):
     
     The advice includes:
     - Risk analysis
-    - Market analysis
+    - Market analysis of the latest news
     - Investment recommendations
     """
     try:
         # Convert request to UserProfile
-        user_profile = UserProfile(
-            age=request.age,
-            income=request.income,
-            dependents=request.dependents,
-            investment_horizon=request.investment_horizon,
-            existing_investments=request.existing_investments,
-            risk_tolerance=request.risk_tolerance,
-            goals=request.goals
-        )
+        user_profile = _to_user_profile(request)
         
-        # Create empty news collection (news will be fetched by the service)
-        market_news = NewsArticleCollection(articles=[])
-        
-        return await get_wealth_management_advice(user_profile, market_news)
+        return await get_wealth_management_advice(user_profile)
     except Exception as e:
         raise HTTPException(
             status_code=500,
             detail=f"Error processing wealth management advice: {str(e)}"
-        ) 
\ No newline at end of file
+        ) 
+
+@router.post("/advice/stream")
+async def stream_wealth_advice(request: WealthAdviceRequest):
+    """
+    Get personalized wealth management advice, streaming progress as Server-Sent Events.
+
+    Events are sent as each step finishes, with the value itself as data:
+    - `risk_analysis`: the `RiskAnalysis`
+    - `market_analysis`: the `MarketAnalysis`
+    - `recommendations`: the specific investment recommendations
+    - `result`: the final `WealthManagementResponse`
+    - `error`: sent instead of `result` if the crew fails
+    """
+    user_profile = _to_user_profile(request)
+    return sse_response(stream_wealth_management_advice(user_profile))
+
+@router.post("/advice/jobs", response_model=JobSubmission, status_code=202)
+async def submit_wealth_advice_job(request: WealthAdviceRequest):
+    """
+    Submit a wealth management advice request as a background job.
+
+    Returns a job id immediately; poll `GET /api/jobs/{job_id}` for the
+    `WealthManagementResponse` once it is ready.
+    """
+    user_profile = _to_user_profile(request)
+
+    try:
+        job = job_store.submit(
+            "wealth_advice",
+            lambda: get_wealth_management_advice(user_profile)
+        )
+    except JobStoreFullError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+    return JobSubmission(
+        job_id=job.id,
+        status=job.status,
+        status_url=f"/api/jobs/{job.id}"
+    )
+
+@router.get("/advice/coalescing")
+async def get_wealth_coalescing_statistics() -> Dict[str, Any]:
+    """How many wealth advice requests shared an in-flight crew run"""
+    return get_wealth_coalescing_stats()
+
+@router.post("/risk/batch", response_model=RiskBatchResponse)
+async def score_risk_batch(request: Request):
+    """
+    Score many user profiles at once with the local risk scoring engine.
+
+    Send either a JSON array of `UserProfile` records, or newline-delimited
+    JSON with `Content-Type: application/x-ndjson`. Returns a
+    `RiskAnalysis` per profile, in input order, plus throughput figures.
+    """
+    payload = await request.body()
+    content_type = request.headers.get("content-type", "")
+    ndjson = "ndjson" in content_type or "jsonlines" in content_type
+
+    try:
+        start = time.perf_counter()
+        profiles = await asyncio.to_thread(load_profiles, payload, ndjson)
+        results = await asyncio.to_thread(score_risk_frame, profiles)
+        elapsed = time.perf_counter() - start
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid profiles: {str(e)}")
+
+    return RiskBatchResponse(
+        count=len(results),
+        elapsed_ms=round(elapsed * 1000, 2),
+        profiles_per_second=round(len(results) / elapsed, 1) if elapsed > 0 else 0.0,
+        results=results
+    )
+
+@router.post("/goals/simulate", response_model=GoalSimulationResponse)
+async def simulate_goal_feasibility(request: GoalSimulationRequest):
+    """
+    Estimate how likely each goal in the profile is to be reached.
+
+    Runs a Monte Carlo simulation of the portfolio under `asset_allocation`
+    (by default, the efficient allocation for the profile's risk score and
+    investment horizon) and
+    reports, for each goal, the probability of reaching `target_amount`
+    within `timeline` years and percentiles of the projected corpus.
+    `annual_contribution` defaults to a share of income.
+    """
+    try:
+        return await asyncio.to_thread(
+            simulate_goals,
+            _to_user_profile(request),
+            request.asset_allocation,
+            request.paths,
+            request.annual_contribution,
+            request.seed
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/allocation", response_model=Dict[str, float])
+async def get_efficient_allocation(
+    risk_score: float = Query(..., ge=0, le=100),
+    investment_horizon: int = Query(..., ge=1)
+):
+    """
+    Efficient asset allocation, in percent, for a risk score and investment horizon.
+
+    Computed locally by mean-variance optimization over the configured
+    market assumptions.
+    """
+    return optimize_allocation(risk_score, investment_horizon)
\ No newline at end of file
@@ -2,6 +2,7 @@ from fastapi import APIRouter
 from .endpoints.wealth import router as wealth_router
 from .endpoints.financial_chat import router as financial_chat_router
 from .endpoints.news import router as news_router
+from .endpoints.jobs import router as jobs_router
 
 # Create the main API router
 router = APIRouter()
@@ -25,4 +26,11 @@ router.include_router(
     news_router,
     prefix="/news",
     tags=["news"]
-) 
\ No newline at end of file
+) 
+
+# Include background job routes
+router.include_router(
+    jobs_router,
+    prefix="/jobs",
+    tags=["jobs"]
+)
\ No newline at end of file
@@ -0,0 +1,3 @@
+"""
+Database models and sessions for the Wealth Management API
+"""
@@ -0,0 +1,84 @@
+from sqlalchemy import BigInteger, Column, DateTime, Index, Integer, LargeBinary, String, Text
+from sqlalchemy.orm import declarative_base
+from datetime import datetime
+
+Base = declarative_base()
+
+class Article(Base):
+    """A scraped news article, deduplicated on the hash of its URL"""
+    __tablename__ = "articles"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    url_hash = Column(String(64), nullable=False)
+    url = Column(Text, nullable=False)
+    title = Column(Text, nullable=False)
+    summary = Column(Text, nullable=False, default="")
+    source = Column(String(100), nullable=False)
+    published_at = Column(DateTime, nullable=False)
+    fetched_at = Column(DateTime, nullable=False, default=datetime.now)
+    updated_at = Column(DateTime, nullable=False, default=datetime.now)
+    # Representative article of this article's near-duplicate cluster
+    duplicate_of = Column(Integer, nullable=True)
+    # MinHash signature of title and summary
+    minhash = Column(LargeBinary, nullable=True)
+
+    __table_args__ = (
+        Index("ix_articles_url_hash", "url_hash", unique=True),
+        Index("ix_articles_published_at", "published_at"),
+        Index("ix_articles_source_published_at", "source", "published_at"),
+        Index("ix_articles_duplicate_of", "duplicate_of"),
+    )
+
+class ArticleBand(Base):
+    """LSH bucket of one band of an article's MinHash signature"""
+    __tablename__ = "article_bands"
+
+    key = Column(BigInteger, primary_key=True, autoincrement=False)
+    article_id = Column(Integer, primary_key=True, autoincrement=False)
+
+class ArticleSummary(Base):
+    """LLM summary of an article, keyed by a hash of its URL and content"""
+    __tablename__ = "article_summaries"
+
+    content_hash = Column(String(64), primary_key=True)
+    url = Column(Text, nullable=False)
+    summary = Column(Text, nullable=False)
+    created_at = Column(DateTime, nullable=False, default=datetime.now)
+
+class SourceWatermark(Base):
+    """Newest publish time ingested from a news source"""
+    __tablename__ = "source_watermarks"
+
+    source = Column(String(100), primary_key=True)
+    published_at = Column(DateTime, nullable=False)
+    updated_at = Column(DateTime, nullable=False, default=datetime.now)
+
+# SQLite FTS5 index over article titles and summaries. It stores no text of
+# its own (external content) and is kept in sync with articles by triggers,
+# so every ingestion batch is searchable as soon as it is committed.
+# Created by init_db and migration 0002; it is not part of the metadata.
+ARTICLES_FTS_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5(
+        title, summary, content='articles', content_rowid='id', tokenize='porter unicode61'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS articles_fts_insert AFTER INSERT ON articles BEGIN
+        INSERT INTO articles_fts(rowid, title, summary) VALUES (new.id, new.title, new.summary);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS articles_fts_delete AFTER DELETE ON articles BEGIN
+        INSERT INTO articles_fts(articles_fts, rowid, title, summary)
+        VALUES ('delete', old.id, old.title, old.summary);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS articles_fts_update AFTER UPDATE OF title, summary ON articles BEGIN
+        INSERT INTO articles_fts(articles_fts, rowid, title, summary)
+        VALUES ('delete', old.id, old.title, old.summary);
+        INSERT INTO articles_fts(rowid, title, summary) VALUES (new.id, new.title, new.summary);
+    END
+    """
+]
\ No newline at end of file
@@ -0,0 +1,42 @@
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+import os
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./wealth_management.db")
+
+engine = create_engine(
+    DATABASE_URL,
+    connect_args={"check_same_thread": False} if DATABASE_URL.startswith("sqlite") else {},
+    pool_pre_ping=True
+)
+
+if engine.dialect.name == "sqlite":
+    @event.listens_for(engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        """Let readers proceed while an ingestion batch is being written"""
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.close()
+
+SessionLocal = sessionmaker(bind=engine, expire_on_commit=False)
+
+def init_db() -> None:
+    """Create any missing tables; production databases are migrated with Alembic"""
+    from .models import Base, ARTICLES_FTS_DDL
+    Base.metadata.create_all(bind=engine)
+
+    if engine.dialect.name == "sqlite":
+        with engine.begin() as connection:
+            indexed = connection.exec_driver_sql(
+                "SELECT 1 FROM sqlite_master WHERE name = 'articles_fts'"
+            ).first()
+            for statement in ARTICLES_FTS_DDL:
+                connection.exec_driver_sql(statement)
+            if indexed is None:
+                # Index any articles stored before the search index existed
+                connection.exec_driver_sql("INSERT INTO articles_fts(articles_fts) VALUES ('rebuild')")
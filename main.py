@@ -1,11 +1,36 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+import asyncio
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 from app.api.main import router as api_router
+from app.db.session import init_db
+from app.services.crew_executor import shutdown_crew_executor
+from app.services.job_store import job_store
+from app.services.metrics import MetricsMiddleware, render_metrics
+from app.services.news_scheduler import news_scheduler
+from app.tools.http_client import http_client
+from app.tools.html_parser import shutdown_parser_executor
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start and stop shared application resources"""
+    init_db()
+    http_client.start()
+    news_scheduler.start()
+    yield
+    await news_scheduler.stop()
+    await job_store.shutdown()
+    # Running crews may still be using the HTTP client from worker threads,
+    # so keep the event loop free while they finish
+    await asyncio.to_thread(shutdown_crew_executor)
+    await http_client.close()
+    shutdown_parser_executor()
 
 app = FastAPI(
     title="Wealth Management API",
     description="API for wealth management, financial chat, and news services",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Configure CORS
@@ -17,9 +42,18 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Time every request by route template
+app.add_middleware(MetricsMiddleware)
+
 # Include the main API router
 app.include_router(api_router, prefix="/api")
 
 @app.get("/")
 async def root():
-    return {"message": "Welcome to the Wealth Management API"} 
\ No newline at end of file
+    return {"message": "Welcome to the Wealth Management API"}
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus metrics: request, crew, LLM and scraper timings, token counts and cache stats"""
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
\ No newline at end of file
@@ -0,0 +1,36 @@
+"""Create the articles table
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0001'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    op.create_table(
+        'articles',
+        sa.Column('id', sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column('url_hash', sa.String(length=64), nullable=False),
+        sa.Column('url', sa.Text(), nullable=False),
+        sa.Column('title', sa.Text(), nullable=False),
+        sa.Column('summary', sa.Text(), nullable=False),
+        sa.Column('source', sa.String(length=100), nullable=False),
+        sa.Column('published_at', sa.DateTime(), nullable=False),
+        sa.Column('fetched_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False)
+    )
+    op.create_index('ix_articles_url_hash', 'articles', ['url_hash'], unique=True)
+    op.create_index('ix_articles_published_at', 'articles', ['published_at'])
+    op.create_index('ix_articles_source_published_at', 'articles', ['source', 'published_at'])
+
+def downgrade() -> None:
+    op.drop_index('ix_articles_source_published_at', table_name='articles')
+    op.drop_index('ix_articles_published_at', table_name='articles')
+    op.drop_index('ix_articles_url_hash', table_name='articles')
+    op.drop_table('articles')
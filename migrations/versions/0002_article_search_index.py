@@ -0,0 +1,51 @@
+"""Add the FTS5 full-text index over articles
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18
+"""
+from alembic import op
+
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+
+    op.execute("""
+        CREATE VIRTUAL TABLE articles_fts USING fts5(
+            title, summary, content='articles', content_rowid='id', tokenize='porter unicode61'
+        )
+    """)
+    op.execute("""
+        CREATE TRIGGER articles_fts_insert AFTER INSERT ON articles BEGIN
+            INSERT INTO articles_fts(rowid, title, summary) VALUES (new.id, new.title, new.summary);
+        END
+    """)
+    op.execute("""
+        CREATE TRIGGER articles_fts_delete AFTER DELETE ON articles BEGIN
+            INSERT INTO articles_fts(articles_fts, rowid, title, summary)
+            VALUES ('delete', old.id, old.title, old.summary);
+        END
+    """)
+    op.execute("""
+        CREATE TRIGGER articles_fts_update AFTER UPDATE OF title, summary ON articles BEGIN
+            INSERT INTO articles_fts(articles_fts, rowid, title, summary)
+            VALUES ('delete', old.id, old.title, old.summary);
+            INSERT INTO articles_fts(rowid, title, summary) VALUES (new.id, new.title, new.summary);
+        END
+    """)
+    # Index the articles stored before this migration
+    op.execute("INSERT INTO articles_fts(articles_fts) VALUES ('rebuild')")
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+
+    op.execute("DROP TRIGGER IF EXISTS articles_fts_update")
+    op.execute("DROP TRIGGER IF EXISTS articles_fts_delete")
+    op.execute("DROP TRIGGER IF EXISTS articles_fts_insert")
+    op.execute("DROP TABLE IF EXISTS articles_fts")
@@ -0,0 +1,30 @@
+"""Link near-duplicate articles through MinHash LSH buckets
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    # Plain ADD COLUMN, not a batch table copy, so the FTS triggers survive
+    op.add_column('articles', sa.Column('duplicate_of', sa.Integer(), nullable=True))
+    op.add_column('articles', sa.Column('minhash', sa.LargeBinary(), nullable=True))
+    op.create_index('ix_articles_duplicate_of', 'articles', ['duplicate_of'])
+    op.create_table(
+        'article_bands',
+        sa.Column('key', sa.BigInteger(), primary_key=True, autoincrement=False),
+        sa.Column('article_id', sa.Integer(), primary_key=True, autoincrement=False)
+    )
+
+def downgrade() -> None:
+    op.drop_table('article_bands')
+    op.drop_index('ix_articles_duplicate_of', table_name='articles')
+    op.drop_column('articles', 'minhash')
+    op.drop_column('articles', 'duplicate_of')
@@ -0,0 +1,24 @@
+"""Track the newest publish time ingested from each news source
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0004'
+down_revision = '0003'
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    op.create_table(
+        'source_watermarks',
+        sa.Column('source', sa.String(length=100), primary_key=True),
+        sa.Column('published_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False)
+    )
+
+def downgrade() -> None:
+    op.drop_table('source_watermarks')
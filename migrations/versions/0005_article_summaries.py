@@ -0,0 +1,25 @@
+"""Cache LLM article summaries by content hash
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0005'
+down_revision = '0004'
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    op.create_table(
+        'article_summaries',
+        sa.Column('content_hash', sa.String(length=64), primary_key=True),
+        sa.Column('url', sa.Text(), nullable=False),
+        sa.Column('summary', sa.Text(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False)
+    )
+
+def downgrade() -> None:
+    op.drop_table('article_summaries')
@@ -1,12 +1,21 @@
 from pydantic import BaseModel, Field
 from typing import List, Dict, Optional, Union, Any
 from datetime import datetime
+from enum import Enum
 
 class Goal(BaseModel):
     type: str
     target_amount: float
     timeline: int
 
+class GoalProjection(BaseModel):
+    """Monte Carlo feasibility of a single goal"""
+    type: str
+    target_amount: float
+    timeline: int
+    success_probability: float
+    percentiles: Dict[str, float]
+
 class NewsArticleSummary(BaseModel):
     published_at: datetime
     summary: str 
@@ -18,11 +27,24 @@ class NewsArticle(BaseModel):
     url: str
     publishedAt: str
     source: str
+    # URLs of near-duplicate copies of this story from other sources
+    alternate_urls: List[str] = Field(default_factory=list)
 
 class NewsArticleCollection(BaseModel):
     articles: List[NewsArticle]
     fetch_timestamp: datetime = Field(default_factory=datetime.now)
 
+class NewsSummaryCollection(BaseModel):
+    articles: List[NewsArticleSummary]
+    fetch_timestamp: datetime = Field(default_factory=datetime.now)
+
+class NewsSearchResponse(BaseModel):
+    query: str
+    page: int
+    page_size: int
+    has_more: bool
+    articles: List[NewsArticle]
+
 class UserProfile(BaseModel):
     age: int
     income: float
@@ -41,6 +63,21 @@ class RiskAnalysis(BaseModel):
     key_factors: List[str]
     recommendations: List[str]
 
+class RiskBatchResponse(BaseModel):
+    """Response model for batch risk scoring"""
+    count: int
+    elapsed_ms: float
+    profiles_per_second: float
+    results: List[RiskAnalysis]
+
+class GoalSimulationResponse(BaseModel):
+    """Response model for goal feasibility simulation"""
+    asset_allocation: Dict[str, float]
+    paths: int
+    expected_return: float
+    volatility: float
+    goals: List[GoalProjection]
+
 class InvestmentRecommendation(BaseModel):
     asset_allocation: Dict[str, float]
     specific_recommendations: List[Dict[str, Any]]
@@ -51,14 +88,45 @@ class MarketAnalysis(BaseModel):
     key_insights: List[str]
     impact_analysis: List[str]
 
+class MarketDigest(BaseModel):
+    """Market analysis of one news snapshot, shared by every advice request"""
+    version: int
+    news_hash: str
+    analysis: MarketAnalysis
+    articles: List[NewsArticle] = Field(default_factory=list)
+    generated_at: datetime = Field(default_factory=datetime.now)
+
 class WealthManagementResponse(BaseModel):
     risk_analysis: RiskAnalysis
     market_analysis: MarketAnalysis
     recommendations: InvestmentRecommendation
+    goal_projections: List[GoalProjection] = Field(default_factory=list)
     timestamp: datetime = Field(default_factory=datetime.now)
 
 class ChatResponse(BaseModel):
     """Response model for financial chat service"""
     answer: str
     sources: List[str] = Field(default_factory=list)
-    timestamp: datetime = Field(default_factory=datetime.now) 
\ No newline at end of file
+    timestamp: datetime = Field(default_factory=datetime.now) 
+
+class JobStatus(str, Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+class JobSubmission(BaseModel):
+    """Response model returned when a background job is submitted"""
+    job_id: str
+    status: JobStatus
+    status_url: str
+
+class JobStatusResponse(BaseModel):
+    """Response model for polling a background job"""
+    job_id: str
+    kind: str
+    status: JobStatus
+    created_at: datetime
+    finished_at: Optional[datetime] = None
+    result: Optional[Union[WealthManagementResponse, ChatResponse]] = None
+    error: Optional[str] = None
\ No newline at end of file
@@ -0,0 +1,3 @@
+"""
+Maintenance and benchmark scripts, run as modules, e.g. python -m app.scripts.bench_parser
+"""
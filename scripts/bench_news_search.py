@@ -0,0 +1,121 @@
+"""
+Benchmark news archive search on a large synthetic archive.
+
+Builds (once) a SQLite database of synthetic articles whose words follow
+a Zipf distribution, so queries range from words in most articles to
+rare ones, then times ArticleStore.search for a mix of queries. Run from
+the directory containing the `app` package:
+
+    python -m app.scripts.bench_news_search [--articles N] [--db PATH]
+"""
+from datetime import datetime, timedelta
+from typing import Dict, List
+import argparse
+import os
+import random
+import statistics
+import time
+import numpy as np
+from sqlalchemy import create_engine, func, insert, select, text
+from sqlalchemy.orm import sessionmaker
+from ..db.models import ARTICLES_FTS_DDL, Article, Base
+from ..services.article_store import ArticleStore
+
+VOCABULARY_SIZE = 20_000
+TITLE_WORDS = 10
+SUMMARY_WORDS = 40
+INSERT_CHUNK = 20_000
+
+# Queries by how common their words are, as ranks in the Zipf vocabulary
+QUERIES = {
+    'very common word': [1],
+    'common word': [20],
+    'mid-frequency word': [500],
+    'rare word': [15_000],
+    'two common words': [2, 5],
+    'common and rare words': [3, 8_000]
+}
+
+def word(rank: int) -> str:
+    """Synthetic word for a vocabulary rank; letters only, so FTS5 tokenizes it whole"""
+    letters = []
+    rank += 1
+    while rank:
+        rank, digit = divmod(rank - 1, 26)
+        letters.append(chr(ord('a') + digit))
+    return 'w' + ''.join(reversed(letters))
+
+def build(db_path: str, articles: int) -> None:
+    engine = create_engine(f"sqlite:///{db_path}")
+    Base.metadata.create_all(engine)
+    with engine.begin() as connection:
+        for statement in ARTICLES_FTS_DDL:
+            connection.execute(text(statement))
+        stored = connection.scalar(select(func.count()).select_from(Article))
+    if stored >= articles:
+        return
+
+    print(f"Building {articles} articles in {db_path} ...")
+    vocabulary = np.array([word(rank) for rank in range(VOCABULARY_SIZE)])
+    weights = 1 / np.arange(1, VOCABULARY_SIZE + 1)
+    weights /= weights.sum()
+    rng = np.random.default_rng(12)
+    start = datetime(2024, 1, 1)
+    for first in range(stored, articles, INSERT_CHUNK):
+        count = min(INSERT_CHUNK, articles - first)
+        words = vocabulary[rng.choice(VOCABULARY_SIZE, size=(count, TITLE_WORDS + SUMMARY_WORDS), p=weights)]
+        rows = []
+        for offset, article_words in enumerate(words):
+            number = first + offset
+            published_at = start + timedelta(minutes=number)
+            rows.append({
+                'url_hash': f"{number:064x}",
+                'url': f"https://news.example/{number}",
+                'title': ' '.join(article_words[:TITLE_WORDS]),
+                'summary': ' '.join(article_words[TITLE_WORDS:]),
+                'source': 'Synthetic',
+                'published_at': published_at,
+                'fetched_at': published_at,
+                'updated_at': published_at
+            })
+        with engine.begin() as connection:
+            connection.execute(insert(Article), rows)
+        print(f"  {first + count} articles")
+
+def timings_ms(store: ArticleStore, query: str, page: int, runs: int) -> List[float]:
+    store.search(query, page=page)
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        store.search(query, page=page)
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--articles', type=int, default=1_000_000)
+    parser.add_argument('--db', default=os.path.join(os.getcwd(), 'news_search_bench.db'))
+    parser.add_argument('--runs', type=int, default=30)
+    args = parser.parse_args()
+
+    build(args.db, args.articles)
+    engine = create_engine(f"sqlite:///{args.db}")
+    store = ArticleStore(sessionmaker(bind=engine, expire_on_commit=False))
+    with engine.connect() as connection:
+        total = connection.scalar(select(func.count()).select_from(Article))
+
+    print(f"{total} articles")
+    print(f"{'query':<24}{'matches':>10}{'page':>6}{'p50 ms':>9}{'p95 ms':>9}")
+    for label, ranks in QUERIES.items():
+        query = ' '.join(word(rank) for rank in ranks)
+        with engine.connect() as connection:
+            matches = connection.scalar(
+                text("SELECT count(*) FROM articles_fts WHERE articles_fts MATCH :query"), {'query': query}
+            )
+        for page in (1, 5, 100):
+            timings = sorted(timings_ms(store, query, page, args.runs))
+            p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+            print(f"{label:<24}{matches:>10}{page:>6}{statistics.median(timings):>9.2f}{p95:>9.2f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+"""
+Benchmark the HTML parsing used by the scrapers and the search tool.
+
+Parses the fixture pages in tests/fixtures/html with each available
+BeautifulSoup backend, checks that every backend extracts the same
+output, and prints the median time per page. Run from the directory
+containing the `app` package:
+
+    python -m app.scripts.bench_parser [--runs N]
+"""
+from typing import Any, Callable, Dict, List, Tuple
+import argparse
+import os
+import statistics
+import time
+from ..tools import html_parser
+from ..tools.html_parser import extract_main_text, parse_listing, parse_search_result_links
+from ..tools.news_pipeline import load_news_sources
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'tests', 'fixtures', 'html')
+
+BACKENDS = ['html.parser', 'lxml']
+
+def _cases() -> List[Tuple[str, Callable[[str], Any]]]:
+    """Fixture files with the parse each one is used for"""
+    sources: Dict[str, Dict[str, Any]] = {source.name: source.model_dump() for source in load_news_sources()}
+    return [
+        ('moneycontrol_listing.html', lambda html: parse_listing(html, sources['Moneycontrol'])),
+        ('economictimes_listing.html', lambda html: parse_listing(html, sources['Economic Times'])),
+        ('duckduckgo_results.html', lambda html: parse_search_result_links(html, 10)),
+        ('article_page.html', extract_main_text)
+    ]
+
+def _available(backend: str) -> bool:
+    if backend != 'lxml':
+        return True
+    try:
+        import lxml  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+def _median_ms(parse: Callable[[str], Any], html: str, runs: int) -> float:
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        parse(html)
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings) * 1000
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--runs', type=int, default=20, help='timed runs per page and backend')
+    args = parser.parse_args()
+
+    backends = [backend for backend in BACKENDS if _available(backend)]
+    configured = html_parser.HTML_PARSER
+    print(f"{'fixture':<28}{'items':>6}" + ''.join(f"{backend + ' ms':>16}" for backend in backends))
+    try:
+        for name, parse in _cases():
+            with open(os.path.join(FIXTURES_DIR, name), encoding='utf-8') as f:
+                html = f.read()
+
+            outputs, timings = [], []
+            for backend in backends:
+                html_parser.HTML_PARSER = backend
+                outputs.append(parse(html))
+                timings.append(_median_ms(parse, html, args.runs))
+            if any(output != outputs[0] for output in outputs[1:]):
+                raise SystemExit(f"{name}: backends extracted different output")
+
+            items = len(outputs[0]) if isinstance(outputs[0], list) else len(outputs[0].split('\n'))
+            print(f"{name:<28}{items:>6}" + ''.join(f"{timing:>16.2f}" for timing in timings))
+    finally:
+        html_parser.HTML_PARSER = configured
+
+if __name__ == '__main__':
+    main()
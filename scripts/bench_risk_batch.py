@@ -0,0 +1,62 @@
+"""
+Benchmark batch risk scoring throughput.
+
+Generates random profiles, then times loading the JSON payload and
+scoring it, as POST /api/wealth/risk/batch does. Run from the directory
+containing the `app` package:
+
+    python -m app.scripts.bench_risk_batch [--profiles N] [--ndjson]
+"""
+from typing import Any, Dict, List
+import argparse
+import json
+import random
+import time
+from ..services.risk_scoring import TOLERANCE_LEVELS, load_profiles, score_risk_frame
+
+INVESTMENT_TYPES = ['equity', 'mutual_funds', 'fixed_deposit', 'bonds', 'gold', 'real_estate']
+
+def random_profiles(count: int, seed: int = 7) -> List[Dict[str, Any]]:
+    rng = random.Random(seed)
+    return [
+        {
+            'age': rng.randint(18, 80),
+            'income': rng.randint(1, 500) * 1_00_000,
+            'dependents': rng.randint(0, 5),
+            'investment_horizon': rng.randint(1, 40),
+            'risk_tolerance': rng.choice(list(TOLERANCE_LEVELS)),
+            'existing_investments': [
+                {'type': rng.choice(INVESTMENT_TYPES), 'amount': rng.randint(1, 100) * 10_000}
+                for _ in range(rng.randint(0, 4))
+            ],
+            'goals': []
+        }
+        for _ in range(count)
+    ]
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--profiles', type=int, default=100_000, help='profiles per batch')
+    parser.add_argument('--ndjson', action='store_true', help='send newline-delimited JSON instead of an array')
+    args = parser.parse_args()
+
+    profiles = random_profiles(args.profiles)
+    if args.ndjson:
+        payload = '\n'.join(json.dumps(profile) for profile in profiles).encode('utf-8')
+    else:
+        payload = json.dumps(profiles).encode('utf-8')
+
+    started = time.perf_counter()
+    frame = load_profiles(payload, ndjson=args.ndjson)
+    loaded = time.perf_counter()
+    results = score_risk_frame(frame)
+    scored = time.perf_counter()
+
+    total = scored - started
+    print(f"profiles:  {len(results)} ({len(payload) / 1024 / 1024:.1f} MB {'NDJSON' if args.ndjson else 'JSON'})")
+    print(f"load:      {(loaded - started) * 1000:.0f} ms")
+    print(f"score:     {(scored - loaded) * 1000:.0f} ms")
+    print(f"total:     {total * 1000:.0f} ms, {len(results) / total:,.0f} profiles/s")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+"""
+Capture the parser fixture pages from the live sites.
+
+Downloads the first listing page of Moneycontrol and Economic Times, a
+DuckDuckGo results page and the first article on the Moneycontrol
+listing into tests/fixtures/html, and records in manifest.json where
+and when each page was captured and what the parsers extract from it.
+Fixtures with a null `captured_at` were written by hand after the
+sites' markup. Review the printed counts before committing the pages.
+Run from the directory containing the `app` package:
+
+    python -m app.scripts.capture_fixtures [--query QUERY]
+"""
+from datetime import datetime
+from typing import Any, Dict, Optional
+import argparse
+import asyncio
+import json
+import os
+from urllib.parse import urljoin
+from ..tools.html_parser import extract_main_text, parse_listing, parse_search_result_links
+from ..tools.http_client import HttpClient
+from ..tools.news_pipeline import load_news_sources
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'tests', 'fixtures', 'html')
+MANIFEST_PATH = os.path.join(FIXTURES_DIR, 'manifest.json')
+
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.5"
+}
+
+async def _download(client: HttpClient, url: str) -> str:
+    async with client.get(url, headers=HEADERS) as response:
+        if response.status != 200:
+            raise SystemExit(f"{url}: status {response.status}")
+        return await response.text()
+
+def _save(manifest: Dict[str, Any], name: str, url: str, html: str, **expected: Any) -> None:
+    with open(os.path.join(FIXTURES_DIR, name), 'w', encoding='utf-8') as f:
+        f.write(html)
+    manifest[name] = {'url': url, 'captured_at': datetime.now().isoformat(timespec='seconds'), **expected}
+    print(f"{name:<28}{url}\n{'':<28}{expected}")
+
+async def capture(query: str) -> None:
+    sources = {source.name: source for source in load_news_sources()}
+    with open(MANIFEST_PATH, encoding='utf-8') as f:
+        manifest = json.load(f)
+
+    client = HttpClient()
+    client.start()
+    try:
+        first_article: Optional[Dict[str, str]] = None
+        listing_url = sources['Moneycontrol'].url
+        for name, source in (('moneycontrol_listing.html', 'Moneycontrol'), ('economictimes_listing.html', 'Economic Times')):
+            url = sources[source].url
+            html = await _download(client, url)
+            articles = parse_listing(html, sources[source].model_dump())
+            if not articles:
+                raise SystemExit(f"{url}: no articles parsed; the selectors in data/news_sources.json need updating")
+            first_article = first_article or articles[0]
+            _save(manifest, name, url, html, items=len(articles))
+
+        url = f"https://duckduckgo.com/html/?q={query} India financial markets&kl=en"
+        html = await _download(client, url)
+        _save(manifest, 'duckduckgo_results.html', url, html, items=len(parse_search_result_links(html, 1000)))
+
+        url = urljoin(listing_url, first_article['link'])
+        html = await _download(client, url)
+        title = ' '.join(first_article['title'].split())
+        contains = [title] if title in extract_main_text(html) else []
+        if not contains:
+            print(f"Warning: the listing title was not found in the extracted text of {url}")
+        _save(manifest, 'article_page.html', url, html, contains=contains, excludes=['Copyright'])
+    finally:
+        await client.close()
+
+    with open(MANIFEST_PATH, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+        f.write('\n')
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--query', default='nifty outlook', help='search query for the DuckDuckGo results page')
+    args = parser.parse_args()
+    asyncio.run(capture(args.query))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Tuple
+import json
+import os
+import numpy as np
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+# Expected returns and covariance matrix of the asset classes
+MARKET_ASSUMPTIONS_PATH = os.getenv(
+    "MARKET_ASSUMPTIONS_PATH",
+    os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data', 'market_assumptions.json')
+)
+
+# Risk scores are rounded to this bucket width before optimizing
+RISK_BUCKET_SIZE = int(os.getenv("ALLOCATION_RISK_BUCKET_SIZE", "5"))
+
+# Horizons beyond this many years are optimized as this horizon
+MAX_HORIZON_YEARS = 30
+
+# Risk aversion at risk score 0 and 100; it falls with the cube of the
+# score's distance from 0 so moderate scores still hold meaningful equity
+MAX_RISK_AVERSION = 20.0
+MIN_RISK_AVERSION = 1.8
+
+# Horizons shorter than this raise risk aversion, up to 3x at one year
+SHORT_HORIZON_YEARS = 10
+
+class MarketAssumptions(NamedTuple):
+    assets: List[str]
+    expected_returns: np.ndarray
+    covariance: np.ndarray
+
+@lru_cache(maxsize=1)
+def load_market_assumptions(path: str = MARKET_ASSUMPTIONS_PATH) -> MarketAssumptions:
+    """Load asset classes, expected annual returns and their covariance matrix"""
+    with open(path) as f:
+        data = json.load(f)
+
+    assets = list(data['assets'])
+    expected_returns = np.array(data['expected_returns'], dtype=float)
+    covariance = np.array(data['covariance'], dtype=float)
+    if expected_returns.shape != (len(assets),) or covariance.shape != (len(assets), len(assets)):
+        raise ValueError(f"Market assumptions in {path} do not match the {len(assets)} assets")
+    return MarketAssumptions(assets, expected_returns, covariance)
+
+def risk_aversion(risk_score: float, horizon: int) -> float:
+    """Risk aversion for a risk score (0-100) and investment horizon in years"""
+    aversion = MIN_RISK_AVERSION + (MAX_RISK_AVERSION - MIN_RISK_AVERSION) * (1 - risk_score / 100) ** 3
+    if horizon < SHORT_HORIZON_YEARS:
+        aversion *= 1 + 2 * (SHORT_HORIZON_YEARS - max(horizon, 1)) / (SHORT_HORIZON_YEARS - 1)
+    return aversion
+
+def _mean_variance_weights(
+    expected_returns: np.ndarray,
+    covariance: np.ndarray,
+    aversion: float
+) -> np.ndarray:
+    """
+    Long-only weights maximizing w.mu - aversion / 2 * w'Cw with weights summing to one.
+
+    Solves the equality-constrained problem in closed form, dropping the
+    most negative asset and re-solving until every weight is non-negative.
+    """
+    active = list(range(len(expected_returns)))
+    while True:
+        index = np.array(active)
+        inverse = np.linalg.inv(covariance[np.ix_(index, index)])
+        ones = np.ones(len(index))
+        returns = expected_returns[index]
+        # Lagrange multiplier of the budget constraint
+        multiplier = (ones @ inverse @ returns - aversion) / (ones @ inverse @ ones)
+        weights = inverse @ (returns - multiplier * ones) / aversion
+        if weights.min() >= 0 or len(active) == 1:
+            break
+        active.pop(int(np.argmin(weights)))
+
+    result = np.zeros(len(expected_returns))
+    result[index] = np.maximum(weights, 0)
+    return result / result.sum()
+
+@lru_cache(maxsize=None)
+def _optimal_allocation(risk_bucket: int, horizon: int) -> Tuple[Tuple[str, float], ...]:
+    assumptions = load_market_assumptions()
+    weights = _mean_variance_weights(
+        assumptions.expected_returns,
+        assumptions.covariance,
+        risk_aversion(risk_bucket, horizon)
+    )
+    return tuple(
+        (asset, round(float(weight) * 100, 1))
+        for asset, weight in zip(assumptions.assets, weights)
+    )
+
+def optimize_allocation(risk_score: float, horizon: int) -> Dict[str, float]:
+    """
+    Efficient asset allocation, in percent, for a risk score and horizon.
+
+    Results are memoized per (risk bucket, horizon) grid point.
+    """
+    risk_bucket = int(round(min(max(risk_score, 0), 100) / RISK_BUCKET_SIZE) * RISK_BUCKET_SIZE)
+    horizon = int(min(max(horizon, 1), MAX_HORIZON_YEARS))
+    return dict(_optimal_allocation(risk_bucket, horizon))
@@ -0,0 +1,405 @@
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from urllib.parse import urlsplit, urlunsplit
+import hashlib
+import os
+import re
+import numpy as np
+from sqlalchemy import and_, func, or_, select, text, update
+from sqlalchemy.orm import Session, sessionmaker
+from ..db.models import Article, ArticleBand, SourceWatermark
+from ..db.session import SessionLocal
+from ..models.schemas import NewsArticle
+from .near_duplicates import NEAR_DUPLICATE_THRESHOLD, article_text, band_keys, minhash_signature, similarity
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+def normalize_url(url: str) -> str:
+    """Canonical form of an article URL: lowercase scheme and host, no fragment or trailing slash"""
+    parts = urlsplit(url.strip())
+    path = parts.path.rstrip('/') or '/'
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, parts.query, ''))
+
+def url_hash(url: str) -> str:
+    """SHA-256 of the normalized URL, used to deduplicate articles"""
+    return hashlib.sha256(normalize_url(url).encode('utf-8')).hexdigest()
+
+def parse_published_at(value: str) -> datetime:
+    """Parse an ISO publish time as naive local time, falling back to now"""
+    try:
+        published_at = datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+    except ValueError:
+        return datetime.now()
+    if published_at.tzinfo is not None:
+        published_at = published_at.astimezone().replace(tzinfo=None)
+    return published_at
+
+# Title matches count this many times as much as summary matches
+TITLE_WEIGHT = 2.0
+
+# BM25 term-frequency saturation and length normalization
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Newest matches ranked by relevance. Queries with fewer matches are ranked
+# in full; for words common enough to match more, ranking stays bounded
+# however large the archive grows, and older matches follow newest first
+NEWS_SEARCH_WINDOW = int(os.getenv("NEWS_SEARCH_WINDOW", "300"))
+
+# Newest matches that are not near-duplicates of another article, with
+# each matched term in the title and summary marked. FTS5 walks the index
+# newest first and stops at the limit, so this costs the same however
+# many articles match
+WINDOW_SQL = text("""
+    SELECT articles_fts.rowid,
+           highlight(articles_fts, 0, char(1), ''),
+           highlight(articles_fts, 1, char(1), '')
+    FROM articles_fts
+    JOIN articles ON articles.id = articles_fts.rowid
+    WHERE articles_fts MATCH :query AND articles.duplicate_of IS NULL
+    ORDER BY articles_fts.rowid DESC
+    LIMIT :limit
+""")
+
+# Matches older than the ranked window, newest first
+OLDER_SQL = text("""
+    SELECT articles_fts.rowid
+    FROM articles_fts
+    JOIN articles ON articles.id = articles_fts.rowid
+    WHERE articles_fts MATCH :query AND articles.duplicate_of IS NULL AND articles_fts.rowid < :before
+    ORDER BY articles_fts.rowid DESC
+    LIMIT :limit OFFSET :offset
+""")
+MATCH_MARK = '\x01'
+
+WORD = re.compile(r'\w+')
+
+def search_terms(query: str) -> List[str]:
+    """Words of a free-text search query"""
+    return WORD.findall(query.lower())
+
+def _bm25_rank(candidates: List[Tuple[int, str, str]]) -> List[int]:
+    """
+    Order candidate article ids by BM25 over title and summary, best first.
+
+    Term frequencies are counted from the highlight marks. Every candidate
+    matches all the query terms, so IDF is the same for each and is left
+    out, and lengths are normalized against the candidates' average.
+    FTS5's own bm25() is not used because it computes IDF by scanning
+    every match of each term, which grows with the archive.
+    """
+    scores = np.zeros(len(candidates))
+    for column, weight in [(1, TITLE_WEIGHT), (2, 1.0)]:
+        # Words counted by the spaces between them, which is much cheaper than
+        # tokenizing and close enough for length normalization
+        lengths = np.array([row[column].count(' ') + 1 for row in candidates], dtype=float)
+        frequencies = np.array([row[column].count(MATCH_MARK) for row in candidates], dtype=float)
+        norms = BM25_K1 * (1 - BM25_B + BM25_B * lengths / lengths.mean())
+        scores += weight * frequencies * (BM25_K1 + 1) / (frequencies + norms)
+
+    # Best first; newer articles win ties
+    row_ids = np.array([row[0] for row in candidates])
+    return row_ids[np.lexsort((-row_ids, -scores))].tolist()
+
+# Bound parameters per IN (...) lookup of LSH bucket keys
+BAND_LOOKUP_CHUNK = 500
+
+def _to_news_article(article: Article, alternate_urls: Optional[List[str]] = None) -> NewsArticle:
+    return NewsArticle(
+        title=article.title,
+        summary=article.summary,
+        url=article.url,
+        publishedAt=article.published_at.isoformat(),
+        source=article.source,
+        alternate_urls=alternate_urls or []
+    )
+
+def _to_news_articles(session: Session, articles: List[Article]) -> List[NewsArticle]:
+    """Convert articles, listing the URLs of each one's near-duplicates"""
+    alternates: Dict[int, List[str]] = defaultdict(list)
+    if articles:
+        duplicates = session.execute(
+            select(Article.duplicate_of, Article.url)
+            .where(Article.duplicate_of.in_([article.id for article in articles]))
+            .order_by(Article.id)
+        )
+        for duplicate_of, url in duplicates:
+            alternates[duplicate_of].append(url)
+    return [_to_news_article(article, alternates.get(article.id)) for article in articles]
+
+class ArticleStore:
+    """
+    Persistent store of scraped news articles.
+
+    Articles are keyed by the hash of their normalized URL, so the same
+    story scraped again is updated in place rather than duplicated. The
+    first publish and fetch times seen for an article are kept. A new
+    article whose text nearly matches a stored one, such as the same
+    agency story syndicated by another site, is linked to it through
+    `duplicate_of` and listed as one of its alternate URLs instead of
+    as a separate result. Methods are blocking; call them from async
+    code with asyncio.to_thread.
+    """
+
+    def __init__(self, session_factory: sessionmaker = SessionLocal):
+        self._session_factory = session_factory
+
+    def upsert_articles(self, articles: List[NewsArticle]) -> int:
+        """Insert or update a batch of articles in one statement, returning the number stored"""
+        now = datetime.now()
+        rows: Dict[str, Dict] = {}
+        for article in articles:
+            if not article.url or not article.title:
+                continue
+            key = url_hash(article.url)
+            rows[key] = {
+                'url_hash': key,
+                'url': article.url,
+                'title': article.title,
+                'summary': article.summary or '',
+                'source': article.source,
+                'published_at': parse_published_at(article.publishedAt),
+                'fetched_at': now,
+                'updated_at': now,
+                'minhash': None
+            }
+        if not rows:
+            return 0
+
+        with self._session_factory() as session:
+            stored = set(session.scalars(select(Article.url_hash).where(Article.url_hash.in_(list(rows)))))
+            signatures = {}
+            for key, row in rows.items():
+                if key in stored:
+                    continue
+                # Articles with nothing to compare are never linked as duplicates
+                signature = minhash_signature(article_text(row['title'], row['summary']))
+                if signature is not None:
+                    signatures[key] = signature
+                    row['minhash'] = signature.tobytes()
+
+            self._bulk_upsert(session, list(rows.values()))
+            if signatures:
+                self._link_near_duplicates(session, signatures)
+            session.commit()
+        return len(rows)
+
+    def _link_near_duplicates(self, session: Session, signatures: Dict[str, np.ndarray]) -> None:
+        """
+        Link newly inserted articles to stored near-duplicates and index their signatures.
+
+        Only the representative of each cluster is indexed, and candidates
+        are the representatives sharing an LSH band with the new article,
+        so a handful of signatures are compared however large the archive
+        or a cluster grows. The new article is a duplicate of the most
+        similar candidate if their estimated similarity reaches
+        NEAR_DUPLICATE_THRESHOLD; otherwise it starts a cluster of its own.
+        """
+        ids = dict(session.execute(
+            select(Article.url_hash, Article.id).where(Article.url_hash.in_(list(signatures)))
+        ).all())
+        keys = {article_id: band_keys(signatures[key]) for key, article_id in ids.items()}
+        all_keys = list({band for bands in keys.values() for band in bands})
+
+        buckets: Dict[int, Set[int]] = defaultdict(set)
+        for start in range(0, len(all_keys), BAND_LOOKUP_CHUNK):
+            chunk = all_keys[start:start + BAND_LOOKUP_CHUNK]
+            for band, article_id in session.execute(
+                select(ArticleBand.key, ArticleBand.article_id).where(ArticleBand.key.in_(chunk))
+            ):
+                buckets[band].add(article_id)
+
+        candidate_ids = {article_id for bucket in buckets.values() for article_id in bucket}
+        stored_signatures: Dict[int, np.ndarray] = {}
+        if candidate_ids:
+            for article_id, minhash in session.execute(
+                select(Article.id, Article.minhash).where(Article.id.in_(candidate_ids))
+            ):
+                if minhash:
+                    stored_signatures[article_id] = np.frombuffer(minhash, dtype=np.uint32)
+
+        links, representatives = [], []
+        for key, article_id in sorted(ids.items(), key=lambda item: item[1]):
+            signature = signatures[key]
+            candidates = {candidate for band in keys[article_id] for candidate in buckets.get(band, ())}
+            # Most similar candidate, the oldest on a tie
+            match = max(
+                ((similarity(signature, stored_signatures[candidate]), -candidate)
+                 for candidate in candidates if candidate in stored_signatures),
+                default=None
+            )
+            if match is not None and match[0] >= NEAR_DUPLICATE_THRESHOLD:
+                links.append({'id': article_id, 'duplicate_of': -match[1]})
+                continue
+            # Later articles in this batch can match this one
+            representatives.append(article_id)
+            stored_signatures[article_id] = signature
+            for band in keys[article_id]:
+                buckets[band].add(article_id)
+
+        if links:
+            session.execute(update(Article), links)
+        band_rows = [
+            {'key': band, 'article_id': article_id}
+            for article_id in representatives
+            for band in set(keys[article_id])
+        ]
+        if band_rows:
+            session.execute(ArticleBand.__table__.insert(), band_rows)
+
+    def _bulk_upsert(self, session: Session, rows: List[Dict]) -> None:
+        dialect = session.get_bind().dialect.name
+        if dialect == 'sqlite':
+            from sqlalchemy.dialects.sqlite import insert
+        elif dialect == 'postgresql':
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            # No native upsert; merge row by row on the unique URL hash
+            existing = {
+                article.url_hash: article
+                for article in session.scalars(
+                    select(Article).where(Article.url_hash.in_([row['url_hash'] for row in rows]))
+                )
+            }
+            for row in rows:
+                article = existing.get(row['url_hash'])
+                if article is None:
+                    session.add(Article(**row))
+                else:
+                    article.title = row['title']
+                    article.summary = row['summary'] or article.summary
+                    article.updated_at = row['updated_at']
+            return
+
+        statement = insert(Article).values(rows)
+        statement = statement.on_conflict_do_update(
+            index_elements=[Article.url_hash],
+            set_={
+                'title': statement.excluded.title,
+                # Keep the stored summary if this scrape did not find one
+                'summary': func.coalesce(func.nullif(statement.excluded.summary, ''), Article.summary),
+                'updated_at': statement.excluded.updated_at
+            }
+        )
+        session.execute(statement)
+
+    def recent_articles(
+        self,
+        limit: int = 20,
+        source: Optional[str] = None,
+        since: Optional[datetime] = None
+    ) -> List[NewsArticle]:
+        """Most recently published articles, newest first"""
+        query = (
+            select(Article)
+            .where(Article.duplicate_of.is_(None))
+            .order_by(Article.published_at.desc(), Article.id.desc())
+            .limit(limit)
+        )
+        if source is not None:
+            query = query.where(Article.source == source)
+        if since is not None:
+            query = query.where(Article.published_at >= since)
+
+        with self._session_factory() as session:
+            return _to_news_articles(session, list(session.scalars(query)))
+
+    def search(self, query: str, page: int = 1, page_size: int = 20) -> Tuple[List[NewsArticle], bool]:
+        """
+        Articles matching every word of `query`, best match first.
+
+        On SQLite, matches are found through the FTS5 index. The newest
+        NEWS_SEARCH_WINDOW matches are ranked by BM25, with title matches
+        weighted above summary matches; when a query has more matches
+        than that, the older ones follow the ranked results, newest
+        first, so every match can still be paged to. Other databases fall
+        back to a substring match, newest first. Near-duplicates are left
+        out, and listed as alternate URLs of the article they duplicate.
+        Returns one page of results and whether more pages follow.
+        """
+        terms = search_terms(query)
+        if not terms:
+            return [], False
+
+        offset = (page - 1) * page_size
+        with self._session_factory() as session:
+            if session.get_bind().dialect.name != 'sqlite':
+                statement = (
+                    select(Article)
+                    .where(Article.duplicate_of.is_(None))
+                    .where(and_(*(
+                        or_(Article.title.ilike(f'%{term}%'), Article.summary.ilike(f'%{term}%'))
+                        for term in terms
+                    )))
+                    .order_by(Article.published_at.desc())
+                    .limit(page_size + 1)
+                    .offset(offset)
+                )
+                articles = list(session.scalars(statement))
+                return _to_news_articles(session, articles[:page_size]), len(articles) > page_size
+
+            # Quote each word so user input is never parsed as FTS5 syntax
+            match = ' '.join(f'"{term}"' for term in terms)
+            candidates = session.execute(WINDOW_SQL, {'query': match, 'limit': NEWS_SEARCH_WINDOW + 1}).all()
+            window = candidates[:NEWS_SEARCH_WINDOW]
+            page_ids = _bm25_rank(window)[offset:offset + page_size] if window else []
+            has_more = len(candidates) > offset + page_size
+
+            # Past the ranked window, page through the older matches
+            if len(candidates) > len(window) and offset + page_size > len(window):
+                wanted = page_size - len(page_ids)
+                older = list(session.scalars(OLDER_SQL, {
+                    'query': match,
+                    'before': window[-1][0],
+                    'limit': wanted + 1,
+                    'offset': max(offset - len(window), 0)
+                }))
+                page_ids += older[:wanted]
+                has_more = len(older) > wanted
+
+            found = {
+                article.id: article
+                for article in session.scalars(select(Article).where(Article.id.in_(page_ids)))
+            }
+            articles = _to_news_articles(session, [found[article_id] for article_id in page_ids if article_id in found])
+        return articles, has_more
+
+    def known_urls(self, urls: Iterable[str]) -> Set[str]:
+        """The given URLs that are already stored"""
+        hashes = {url_hash(url): url for url in urls if url}
+        if not hashes:
+            return set()
+        with self._session_factory() as session:
+            stored = session.scalars(select(Article.url_hash).where(Article.url_hash.in_(list(hashes))))
+            return {hashes[key] for key in stored}
+
+    def watermark(self, source: str) -> Optional[datetime]:
+        """Newest publish time ingested from a source, if any"""
+        with self._session_factory() as session:
+            return session.scalar(select(SourceWatermark.published_at).where(SourceWatermark.source == source))
+
+    def advance_watermarks(self, published: Dict[str, datetime]) -> None:
+        """Move each source's watermark forward to the given publish time, never back"""
+        if not published:
+            return
+        now = datetime.now()
+        with self._session_factory() as session:
+            for source, published_at in published.items():
+                watermark = session.get(SourceWatermark, source)
+                if watermark is None:
+                    session.add(SourceWatermark(source=source, published_at=published_at, updated_at=now))
+                elif published_at > watermark.published_at:
+                    watermark.published_at = published_at
+                    watermark.updated_at = now
+            session.commit()
+
+    def count(self) -> int:
+        """Number of stored articles"""
+        with self._session_factory() as session:
+            return session.scalar(select(func.count()).select_from(Article))
+
+# Shared article store for the application
+article_store = ArticleStore()
@@ -0,0 +1,273 @@
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+import hashlib
+import json
+import os
+import threading
+import time
+import uuid
+
+class TTLCache:
+    """
+    Size-bounded LRU cache whose entries expire after a fixed TTL.
+
+    Safe to share between the event loop and worker threads. Keeps hit,
+    miss and eviction counters for monitoring.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value, or None if it is missing or expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        """Store a value for `ttl_seconds` (default: the cache's TTL), evicting the least recently used entries if full"""
+        if ttl_seconds is None:
+            ttl_seconds = self.ttl_seconds
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and the current size"""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": self.hits / lookups if lookups else 0.0
+        }
+
+class DiskCache:
+    """
+    Size-bounded cache of byte values stored as files in a directory.
+
+    Evicts the least recently used files once their total size exceeds
+    `max_bytes`. Recency survives restarts through file modification
+    times. Safe to share between threads; calls block on file I/O, so
+    use asyncio.to_thread from async code.
+    """
+
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._entries: Optional["OrderedDict[str, int]"] = None
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _name(self, key: str) -> str:
+        return hashlib.sha256(key.encode('utf-8')).hexdigest()
+
+    def _load(self) -> "OrderedDict[str, int]":
+        """Index files already on disk, oldest first; call with the lock held"""
+        if self._entries is None:
+            os.makedirs(self.directory, exist_ok=True)
+            files = sorted(
+                (entry for entry in os.scandir(self.directory)
+                 if entry.is_file() and not entry.name.endswith('.tmp')),
+                key=lambda entry: entry.stat().st_mtime
+            )
+            self._entries = OrderedDict((entry.name, entry.stat().st_size) for entry in files)
+            self._size = sum(self._entries.values())
+        return self._entries
+
+    def _forget(self, name: str) -> None:
+        """Drop a file from the index; call with the lock held"""
+        self._size -= self._entries.pop(name, 0)
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Return the cached bytes, or None if they are missing"""
+        name = self._name(key)
+        with self._lock:
+            entries = self._load()
+            if name not in entries:
+                self.misses += 1
+                return None
+            entries.move_to_end(name)
+
+        path = os.path.join(self.directory, name)
+        try:
+            with open(path, 'rb') as f:
+                value = f.read()
+            os.utime(path)
+        except FileNotFoundError:
+            with self._lock:
+                self._forget(name)
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.hits += 1
+        return value
+
+    def set(self, key: str, value: bytes) -> None:
+        """Store bytes, evicting the least recently used files if over the size limit"""
+        if len(value) > self.max_bytes:
+            return
+
+        name = self._name(key)
+        path = os.path.join(self.directory, name)
+        with self._lock:
+            self._load()
+
+        # Write to a temporary file first so readers never see a partial value
+        temp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        with open(temp_path, 'wb') as f:
+            f.write(value)
+        os.replace(temp_path, path)
+
+        with self._lock:
+            self._forget(name)
+            self._entries[name] = len(value)
+            self._size += len(value)
+            while self._size > self.max_bytes and self._entries:
+                oldest, _ = next(iter(self._entries.items()))
+                self._forget(oldest)
+                self.evictions += 1
+                try:
+                    os.remove(os.path.join(self.directory, oldest))
+                except FileNotFoundError:
+                    pass
+
+    def delete(self, key: str) -> None:
+        name = self._name(key)
+        with self._lock:
+            self._load()
+            self._forget(name)
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except FileNotFoundError:
+                pass
+
+    def clear(self) -> None:
+        with self._lock:
+            for name in list(self._load()):
+                self._forget(name)
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                except FileNotFoundError:
+                    pass
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._load())
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and the current size"""
+        with self._lock:
+            entries = len(self._load())
+        lookups = self.hits + self.misses
+        return {
+            "entries": entries,
+            "size_bytes": self._size,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": self.hits / lookups if lookups else 0.0
+        }
+
+class TieredCache:
+    """
+    TTL cache of JSON-serializable values: an in-memory LRU spilling to a DiskCache.
+
+    Reads check memory first, then disk, promoting disk hits back into
+    memory for the rest of their lifetime. Entries expire after
+    `ttl_seconds` on both levels; disk entries keep their wall-clock
+    expiry, so they stay valid across restarts. Calls may block on file
+    I/O, so use asyncio.to_thread from async code.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float, disk: DiskCache):
+        self.ttl_seconds = ttl_seconds
+        self.memory = TTLCache(max_entries=max_entries, ttl_seconds=ttl_seconds)
+        self.disk = disk
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _count(self, hit: bool) -> None:
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value, or None if it is missing or expired"""
+        value = self.memory.get(key)
+        if value is not None:
+            self._count(hit=True)
+            return value
+
+        data = self.disk.get(key)
+        if data is not None:
+            expires_at, value = json.loads(data)
+            remaining = expires_at - time.time()
+            if remaining > 0:
+                self.memory.set(key, value, ttl_seconds=remaining)
+                self._count(hit=True)
+                return value
+            self.disk.delete(key)
+
+        self._count(hit=False)
+        return None
+
+    def set(self, key: str, value: Any) -> None:
+        """Store a value on both levels"""
+        self.memory.set(key, value)
+        self.disk.set(key, json.dumps([time.time() + self.ttl_seconds, value]).encode('utf-8'))
+
+    def clear(self) -> None:
+        self.memory.clear()
+        self.disk.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return overall hit/miss counters and the stats of each level"""
+        lookups = self.hits + self.misses
+        return {
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "memory": self.memory.stats(),
+            "disk": self.disk.stats()
+        }
\ No newline at end of file
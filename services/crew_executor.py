@@ -0,0 +1,123 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+import asyncio
+import json
+import os
+import time
+from dotenv import load_dotenv
+from .metrics import CREW_KICKOFF_SECONDS, observe_crew_task
+
+# Load environment variables
+load_dotenv()
+
+# Maximum number of crew kickoffs allowed to run at the same time
+CREW_MAX_WORKERS = int(os.getenv("CREW_MAX_WORKERS", "4"))
+
+_executor: Optional[ThreadPoolExecutor] = None
+
+# Sentinel pushed onto a stream queue once the kickoff has finished
+_DONE = object()
+
+def get_crew_executor() -> ThreadPoolExecutor:
+    """Return the shared worker pool used for blocking crew kickoffs"""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=CREW_MAX_WORKERS,
+            thread_name_prefix="crew-worker"
+        )
+    return _executor
+
+def shutdown_crew_executor() -> None:
+    """Shut down the crew worker pool, waiting for running kickoffs to finish"""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=True)
+        _executor = None
+
+def _kickoff(crew, inputs: Dict[str, Any], task_callback: Optional[Callable[[Any], None]]) -> Any:
+    """
+    Run a copy of the crew so concurrent kickoffs never share task state.
+
+    Records the kickoff's duration and each task's duration: tasks run
+    one after another, so a task took the time since the previous one
+    finished. Token usage is exported per LLM instance by the metrics
+    collector instead.
+    """
+    crew = crew.copy()
+    started = time.perf_counter()
+    last_finished = started
+
+    def on_task_complete(output: Any) -> None:
+        nonlocal last_finished
+        finished = time.perf_counter()
+        observe_crew_task(crew.name, output, finished - last_finished)
+        last_finished = finished
+        if task_callback is not None:
+            task_callback(output)
+
+    crew.task_callback = on_task_complete
+    status = "error"
+    try:
+        result = crew.kickoff(inputs=inputs)
+        status = "success"
+    finally:
+        CREW_KICKOFF_SECONDS.labels(crew.name, status).observe(time.perf_counter() - started)
+    return result
+
+async def run_crew(
+    crew,
+    inputs: Dict[str, Any],
+    task_callback: Optional[Callable[[Any], None]] = None
+) -> Any:
+    """
+    Run a crew kickoff on the crew worker pool without blocking the event loop.
+
+    At most CREW_MAX_WORKERS kickoffs execute at once; further calls wait
+    for a free worker. `task_callback` is called from the worker thread
+    with each task's output as it finishes.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_crew_executor(), _kickoff, crew, inputs, task_callback)
+
+async def stream_crew(crew, inputs: Dict[str, Any]) -> AsyncIterator[Tuple[str, Any]]:
+    """
+    Run a crew kickoff and yield its progress as it happens.
+
+    Yields ("task", task_output) as each task finishes, then
+    ("result", crew_output) once the whole crew is done.
+    """
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+
+    def on_task_complete(output: Any) -> None:
+        loop.call_soon_threadsafe(queue.put_nowait, output)
+
+    kickoff = asyncio.ensure_future(run_crew(crew, inputs, task_callback=on_task_complete))
+    kickoff.add_done_callback(lambda _: queue.put_nowait(_DONE))
+
+    while True:
+        output = await queue.get()
+        if output is _DONE:
+            break
+        yield "task", output
+
+    yield "result", kickoff.result()
+
+def task_event(events: List[str], task_index: int) -> str:
+    """Streaming event name for a crew task, or "task" for tasks past the named ones"""
+    return events[task_index] if task_index < len(events) else "task"
+
+def parse_crew_json(output: Any) -> Any:
+    """Parse the JSON an agent returned, falling back to the raw text"""
+    content = getattr(output, 'raw', None) or str(output)
+    content = content.strip()
+
+    # Remove the markdown code block if present
+    if content.startswith('```'):
+        content = content.split('\n', 1)[-1].rsplit('```', 1)[0]
+
+    try:
+        return json.loads(content)
+    except json.JSONDecodeError:
+        return {"raw": content}
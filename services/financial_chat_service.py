@@ -1,12 +1,17 @@
 from crewai import Agent, Task, Crew, Process, LLM
-from typing import List, Dict, Any
+from typing import List, Dict, Any, AsyncIterator, Tuple
 import os
 from dotenv import load_dotenv
 from ..models.schemas import ChatResponse
 from datetime import datetime
 import json
-import asyncio
-from ..tools.search_query import CustomSearchTool
+from ..tools.search_query import CustomSearchTool, get_search_cache_stats
+from .crew_executor import run_crew, stream_crew, parse_crew_json, task_event
+from .cache import TTLCache
+from .single_flight import SingleFlight
+from .article_store import article_store
+from .metrics import stats_collector
+from .text_normalization import fold_text
 from crewai.tools import tool
 
 # Load environment variables
@@ -18,6 +23,42 @@ llm = LLM(
     api_key=os.getenv("GEMINI_API_KEY")
 )
 
+# Response cache for repeated questions, keyed on the normalized query
+CHAT_CACHE_TTL_SECONDS = int(os.getenv("CHAT_CACHE_TTL_SECONDS", "900"))
+CHAT_CACHE_MAX_ENTRIES = int(os.getenv("CHAT_CACHE_MAX_ENTRIES", "1000"))
+chat_response_cache = TTLCache(
+    max_entries=CHAT_CACHE_MAX_ENTRIES,
+    ttl_seconds=CHAT_CACHE_TTL_SECONDS
+)
+
+# Coalesces identical chat questions that arrive while one is in flight
+chat_flight = SingleFlight("financial_chat")
+
+stats_collector.register_cache("chat_response", chat_response_cache.stats)
+stats_collector.register_single_flight(chat_flight.name, chat_flight.stats)
+stats_collector.register_llm("financial_chat", llm)
+
+# Words that do not change the meaning of a financial question.
+# Interrogatives and modals do ("how should I" vs "who should"), so they stay
+QUERY_STOPWORDS = {
+    'a', 'an', 'the', 'is', 'are', 'was', 'were', 'be', 'do', 'does', 'did',
+    'i', 'me', 'my', 'we', 'our', 'you', 'your', 'it', 'its', 'of', 'to',
+    'for', 'in', 'on', 'at', 'by', 'with', 'about', 'and', 'or', 'please',
+    'tell', 'some', 'any'
+}
+
+def normalize_query(query: str) -> str:
+    """
+    Fold case, whitespace, punctuation and stopwords out of a query.
+
+    Words are letters and digits in any script, so non-English questions
+    keep their meaning. A query with no words falls back to its
+    whitespace-folded text.
+    """
+    words = fold_text(query).split()
+    meaningful = [word for word in words if word not in QUERY_STOPWORDS]
+    return ' '.join(meaningful or words) or ' '.join(query.lower().split())
+
 # Define the financial research tool
 @tool("financial_research")
 def financial_research_tool(query: str) -> str:
@@ -33,8 +74,7 @@ def financial_research_tool(query: str) -> str:
         results = search_tool._run(
             query=query,
             limit=5,  # Get top 5 results
-            lang="en",
-            timeout=60000
+            lang="en"
         )
         
         # Process and format the results
@@ -67,6 +107,23 @@ def financial_research_tool(query: str) -> str:
             }
         })
 
+# Number of archived articles the news search tool returns
+NEWS_SEARCH_TOOL_LIMIT = 8
+
+@tool("news_archive_search")
+def news_archive_search_tool(query: str) -> str:
+    """
+    Search previously ingested Indian financial news by keywords such as a
+    company, ticker or sector. Returns a JSON string with the most relevant
+    articles' titles, summaries, sources, URLs and publish times.
+    """
+    try:
+        articles, _ = article_store.search(query, page_size=NEWS_SEARCH_TOOL_LIMIT)
+        return json.dumps({"articles": [article.dict() for article in articles]})
+    except Exception as e:
+        print(f"Error searching news archive: {str(e)}")
+        return json.dumps({"articles": []})
+
 # Create agents
 researcher = Agent(
     role='Indian Financial Market Researcher',
@@ -75,7 +132,7 @@ researcher = Agent(
                 with deep knowledge of SEBI regulations, Indian market dynamics, and 
                 local financial terminology. You use various tools to collect and 
                 verify financial information relevant to Indian investors.""",
-    tools=[financial_research_tool],
+    tools=[financial_research_tool, news_archive_search_tool],
     verbose=True,
     llm=llm
 )
@@ -99,7 +156,8 @@ research_task = Task(
         Query: {query}
         
         Requirements:
-        1. Use the financial research tool to find relevant Indian market information
+        1. Use the financial research tool to find relevant Indian market information,
+           and the news archive search tool for recent news on the companies or sectors involved
         2. Gather data from Indian financial sources
         3. Verify the accuracy of information against Indian market data
         4. Organize findings by topic, considering Indian market context
@@ -147,56 +205,76 @@ advice_task = Task(
 
 # Create crew
 chat_crew = Crew(
+    name="financial_chat",
     agents=[researcher, advisor],
     tasks=[research_task, advice_task],
     verbose=1,
     process=Process.sequential
 )
 
-async def get_financial_advice(query: str) -> ChatResponse:
-    """Get personalized financial advice using AI agents and research"""
+# Streaming event names for the chat crew tasks, in execution order
+CHAT_TASK_EVENTS = ['research', 'advice']
+
+def _parse_chat_result(result: Any) -> ChatResponse:
+    """Convert the chat crew output to a ChatResponse"""
+    # Extract the content from CrewOutput
+    if hasattr(result, 'content'):
+        result_content = result.content
+    else:
+        result_content = str(result)
+    
+    # Parse the JSON content
     try:
-        # Create a new event loop for this call
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
+        # Remove the markdown code block if present
+        if result_content.startswith('```json'):
+            result_content = result_content[7:-3]  # Remove ```json and trailing ```
         
-        # Run the crew with the input query
-        result = chat_crew.kickoff(
-            inputs={
-                'query': query
-            }
-        )
+        response_data = json.loads(result_content)
+        advice_data = response_data.get('advice', {})
         
-        # Extract the content from CrewOutput
-        if hasattr(result, 'content'):
-            result_content = result.content
-        else:
-            result_content = str(result)
+        # Extract sources from the advice data
+        sources = advice_data.get('sources', [])
         
-        # Parse the JSON content
-        try:
-            # Remove the markdown code block if present
-            if result_content.startswith('```json'):
-                result_content = result_content[7:-3]  # Remove ```json and trailing ```
-            
-            response_data = json.loads(result_content)
-            advice_data = response_data.get('advice', {})
-            
-            # Extract sources from the advice data
-            sources = advice_data.get('sources', [])
-            
-            return ChatResponse(
-                answer=advice_data.get('analysis', '') + '\n\n' + 
-                      '\n'.join(f"- {rec}" for rec in advice_data.get('recommendations', [])),
-                sources=sources,
-                timestamp=datetime.now()
-            )
-        except json.JSONDecodeError:
-            return ChatResponse(
-                answer=result_content,
-                sources=[],
-                timestamp=datetime.now()
-            )
+        return ChatResponse(
+            answer=advice_data.get('analysis', '') + '\n\n' + 
+                  '\n'.join(f"- {rec}" for rec in advice_data.get('recommendations', [])),
+            sources=sources,
+            timestamp=datetime.now()
+        )
+    except json.JSONDecodeError:
+        return ChatResponse(
+            answer=result_content,
+            sources=[],
+            timestamp=datetime.now()
+        )
+
+async def _run_chat_crew(query: str, cache_key: str) -> ChatResponse:
+    """Run the chat crew for a query and cache the parsed response"""
+    # Run the crew with the input query on the crew worker pool
+    result = await run_crew(
+        chat_crew,
+        inputs={
+            'query': query
+        }
+    )
+    response = _parse_chat_result(result)
+    if cache_key:
+        chat_response_cache.set(cache_key, response)
+    return response
+
+async def get_financial_advice(query: str) -> ChatResponse:
+    """Get personalized financial advice using AI agents and research"""
+    cache_key = normalize_query(query)
+    cached = chat_response_cache.get(cache_key) if cache_key else None
+    if cached is not None:
+        return cached
+
+    try:
+        # Blank questions are never cached or shared
+        if not cache_key:
+            return await _run_chat_crew(query, cache_key)
+        # Identical questions already in flight share a single crew run
+        return await chat_flight.do(cache_key, lambda: _run_chat_crew(query, cache_key))
     except Exception as e:
         print(f"Error processing financial advice: {str(e)}")
         return ChatResponse(
@@ -204,5 +282,40 @@ async def get_financial_advice(query: str) -> ChatResponse:
             sources=[],
             timestamp=datetime.now()
         )
-    finally:
-        loop.close() 
\ No newline at end of file
+
+async def stream_financial_advice(query: str) -> AsyncIterator[Tuple[str, Any]]:
+    """
+    Stream financial advice as (event, data) pairs.
+
+    Yields each crew task's findings as soon as the task finishes, followed
+    by a final ("result", ChatResponse) pair. Cached answers are returned
+    as the result straight away.
+    """
+    cache_key = normalize_query(query)
+    cached = chat_response_cache.get(cache_key) if cache_key else None
+    if cached is not None:
+        yield "result", cached
+        return
+
+    task_index = 0
+    async for kind, output in stream_crew(chat_crew, inputs={'query': query}):
+        if kind == "task":
+            yield task_event(CHAT_TASK_EVENTS, task_index), parse_crew_json(output)
+            task_index += 1
+        else:
+            response = _parse_chat_result(output)
+            if cache_key:
+                chat_response_cache.set(cache_key, response)
+            yield "result", response
+
+def get_chat_cache_stats() -> Dict[str, Any]:
+    """Return hit/miss statistics for the chat response cache"""
+    return chat_response_cache.stats()
+
+def get_research_cache_stats() -> Dict[str, Any]:
+    """Return hit/miss statistics for the research tool's search and page caches"""
+    return get_search_cache_stats()
+
+def get_chat_coalescing_stats() -> Dict[str, Any]:
+    """Return how many chat requests shared an in-flight crew run"""
+    return chat_flight.stats()
@@ -0,0 +1,173 @@
+from typing import Any, Dict, List, Optional
+import os
+import numpy as np
+from dotenv import load_dotenv
+from pydantic import ValidationError
+from ..models.schemas import UserProfile, Goal, GoalProjection, GoalSimulationResponse
+from .risk_scoring import investment_amount, score_risk
+from .allocation_optimizer import load_market_assumptions, optimize_allocation
+
+# Load environment variables
+load_dotenv()
+
+# Number of simulated market paths per request
+GOAL_SIM_PATHS = int(os.getenv("GOAL_SIM_PATHS", "10000"))
+
+# Share of annual income assumed to be invested each year
+GOAL_SIM_SAVINGS_RATE = float(os.getenv("GOAL_SIM_SAVINGS_RATE", "0.2"))
+
+# Longest goal timeline (years) that will be simulated
+MAX_TIMELINE_YEARS = 100
+
+# Path-years simulated at once; paths are simulated in chunks of this
+# size so memory stays bounded however many paths are requested
+GOAL_SIM_CHUNK_CELLS = int(os.getenv("GOAL_SIM_CHUNK_CELLS", "1000000"))
+
+# Most goal outcomes (goals times paths) kept for one simulation
+GOAL_SIM_MAX_OUTCOMES = int(os.getenv("GOAL_SIM_MAX_OUTCOMES", "5000000"))
+
+# Fewest paths worth reporting goal projections from
+GOAL_SIM_MIN_PATHS = 100
+
+# Percentiles reported for each goal's projected corpus
+PERCENTILES = [10, 25, 50, 75, 90]
+
+def parse_goals(goals: List[Dict[str, Any]]) -> List[Goal]:
+    """Parse the profile's goals, skipping entries that are not valid Goals"""
+    parsed = []
+    for goal in goals:
+        try:
+            parsed.append(Goal(**goal))
+        except (ValidationError, TypeError):
+            print(f"Skipping invalid goal: {goal}")
+    return parsed
+
+def default_allocation(profile: UserProfile) -> Dict[str, float]:
+    """Efficient allocation for the profile's risk score and horizon"""
+    return optimize_allocation(score_risk(profile).risk_score, profile.investment_horizon)
+
+def _portfolio_weights(asset_allocation: Dict[str, float], assets: List[str]) -> np.ndarray:
+    """Normalize an allocation to weights over the known assets, ignoring unknown ones"""
+    weights = np.array([max(float(asset_allocation.get(asset, 0.0)), 0.0) for asset in assets])
+    if weights.sum() <= 0:
+        raise ValueError(f"Asset allocation must include at least one of: {', '.join(assets)}")
+    return weights / weights.sum()
+
+def _shares(values: np.ndarray) -> np.ndarray:
+    """Normalize values to shares that sum to one"""
+    total = values.sum()
+    if total <= 0:
+        return np.full(len(values), 1 / len(values))
+    return values / total
+
+def simulate_goals(
+    profile: UserProfile,
+    asset_allocation: Optional[Dict[str, float]] = None,
+    paths: int = GOAL_SIM_PATHS,
+    annual_contribution: Optional[float] = None,
+    seed: Optional[int] = None
+) -> GoalSimulationResponse:
+    """
+    Monte Carlo feasibility of each goal in the profile.
+
+    Simulates `paths` yearly return paths for the portfolio up to the
+    longest goal timeline, in chunks of paths, with the allocation
+    rebalanced every year and a fixed contribution added at each year
+    end. The existing corpus is shared between goals by present value of
+    their targets, and yearly contributions by the level saving each goal
+    needs, so near-term goals get a larger share. A goal succeeds on a
+    path if its share reaches the target by its timeline.
+    """
+    assumptions = load_market_assumptions()
+    asset_allocation = asset_allocation or default_allocation(profile)
+    weights = _portfolio_weights(asset_allocation, assumptions.assets)
+    mean = float(weights @ assumptions.expected_returns)
+    volatility = float(np.sqrt(weights @ assumptions.covariance @ weights))
+
+    goals = parse_goals(profile.goals)
+    response = GoalSimulationResponse(
+        asset_allocation=asset_allocation,
+        paths=paths,
+        expected_return=round(mean * 100, 2),
+        volatility=round(volatility * 100, 2),
+        goals=[]
+    )
+    if not goals:
+        return response
+    if len(goals) * paths > GOAL_SIM_MAX_OUTCOMES:
+        raise ValueError(f"Too many goals to simulate over {paths} paths; at most {GOAL_SIM_MAX_OUTCOMES // paths} allowed")
+
+    amounts = [investment_amount(investment) for investment in profile.existing_investments]
+    initial_corpus = sum(amount for amount in amounts if amount is not None)
+    if annual_contribution is None:
+        annual_contribution = profile.income * GOAL_SIM_SAVINGS_RATE
+
+    timelines = np.clip([goal.timeline for goal in goals], 1, MAX_TIMELINE_YEARS)
+    years = int(timelines.max())
+
+    # Split the corpus by each goal's present value and contributions by the
+    # level yearly saving each goal needs, both at the expected return
+    targets = np.array([goal.target_amount for goal in goals])
+    present_values = targets / (1 + mean) ** timelines
+    required_savings = targets * mean / ((1 + mean) ** timelines - 1) if mean > 0 else targets / timelines
+    corpus_shares = _shares(present_values)
+    contribution_shares = _shares(required_savings)
+
+    # Each goal's outcome on every path, filled one chunk of paths at a time;
+    # drawing the chunks in turn from one generator gives the same returns
+    # as drawing them all at once
+    rng = np.random.default_rng(seed)
+    outcomes_by_goal = np.empty((len(goals), paths))
+    chunk_paths = max(1, GOAL_SIM_CHUNK_CELLS // years)
+    for start in range(0, paths, chunk_paths):
+        stop = min(start + chunk_paths, paths)
+
+        # Yearly portfolio returns for every path; with yearly rebalancing the
+        # portfolio return is normal with the blended mean and variance
+        returns = np.maximum(rng.normal(mean, volatility, size=(stop - start, years)), -0.99)
+
+        # Value after each year of 1 invested today, and of 1 contributed at the
+        # end of every year: W_t = W_{t-1} * (1 + r_t) + 1 solves to
+        # G_t * sum_{s<=t} 1 / G_s with G_t the cumulative growth factor
+        growth = np.cumprod(1 + returns, axis=1)
+        contribution_value = growth * np.cumsum(1 / growth, axis=1)
+
+        for index, (timeline, corpus_share, contribution_share) in enumerate(
+            zip(timelines, corpus_shares, contribution_shares)
+        ):
+            outcomes_by_goal[index, start:stop] = (
+                initial_corpus * corpus_share * growth[:, timeline - 1]
+                + annual_contribution * contribution_share * contribution_value[:, timeline - 1]
+            )
+
+    for goal, outcomes in zip(goals, outcomes_by_goal):
+        response.goals.append(GoalProjection(
+            type=goal.type,
+            target_amount=goal.target_amount,
+            timeline=goal.timeline,
+            success_probability=round(float(np.mean(outcomes >= goal.target_amount)), 4),
+            percentiles={
+                f"p{percentile}": round(float(value), 2)
+                for percentile, value in zip(PERCENTILES, np.percentile(outcomes, PERCENTILES))
+            }
+        ))
+    return response
+
+def project_goals(profile: UserProfile, asset_allocation: Dict[str, float]) -> List[GoalProjection]:
+    """
+    Goal projections to include with advice.
+
+    Uses fewer paths per goal when the profile has too many goals for
+    GOAL_SIM_PATHS under GOAL_SIM_MAX_OUTCOMES, and skips the projections
+    rather than failing the advice if they still cannot be simulated.
+    """
+    goal_count = max(len(parse_goals(profile.goals)), 1)
+    paths = min(GOAL_SIM_PATHS, GOAL_SIM_MAX_OUTCOMES // goal_count)
+    if paths < GOAL_SIM_MIN_PATHS:
+        print(f"Skipping goal projections: {goal_count} goals is too many to simulate")
+        return []
+    try:
+        return simulate_goals(profile, asset_allocation, paths=paths).goals
+    except ValueError as e:
+        print(f"Error simulating goals: {str(e)}")
+        return []
@@ -0,0 +1,107 @@
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Optional
+import asyncio
+import os
+import uuid
+from dotenv import load_dotenv
+from ..models.schemas import JobStatus
+
+# Load environment variables
+load_dotenv()
+
+# Maximum number of jobs kept in memory and how long finished jobs are retained
+JOB_STORE_MAX_JOBS = int(os.getenv("JOB_STORE_MAX_JOBS", "1000"))
+JOB_TTL = timedelta(seconds=int(os.getenv("JOB_TTL_SECONDS", "3600")))
+
+class JobStoreFullError(Exception):
+    """Raised when the job store has no room for a new job"""
+
+class Job:
+    """A single background job and its outcome"""
+
+    def __init__(self, kind: str):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.status = JobStatus.PENDING
+        self.result: Any = None
+        self.error: Optional[str] = None
+        self.created_at = datetime.now()
+        self.finished_at: Optional[datetime] = None
+        self.task: Optional[asyncio.Task] = None
+
+    @property
+    def done(self) -> bool:
+        return self.status in (JobStatus.COMPLETED, JobStatus.FAILED)
+
+    def expired(self, now: datetime) -> bool:
+        return self.done and now - self.finished_at > JOB_TTL
+
+class JobStore:
+    """
+    Bounded in-process job store.
+
+    Finished jobs are evicted once they are older than JOB_TTL, or oldest
+    first when the store is full. Jobs that are still running are never
+    evicted; if the store is full of them, new submissions are rejected.
+    """
+
+    def __init__(self, max_jobs: int = JOB_STORE_MAX_JOBS):
+        self.max_jobs = max_jobs
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+
+    def _evict(self) -> None:
+        now = datetime.now()
+        for job_id in [job_id for job_id, job in self._jobs.items() if job.expired(now)]:
+            del self._jobs[job_id]
+
+        if len(self._jobs) < self.max_jobs:
+            return
+        for job_id, job in list(self._jobs.items()):
+            if job.done:
+                del self._jobs[job_id]
+                if len(self._jobs) < self.max_jobs:
+                    return
+        raise JobStoreFullError("Too many jobs in progress, please retry later")
+
+    def submit(self, kind: str, work: Callable[[], Awaitable[Any]]) -> Job:
+        """Register a job and start running it in the background"""
+        self._evict()
+        job = Job(kind)
+        self._jobs[job.id] = job
+        job.task = asyncio.create_task(self._run(job, work))
+        return job
+
+    async def _run(self, job: Job, work: Callable[[], Awaitable[Any]]) -> None:
+        job.status = JobStatus.RUNNING
+        try:
+            job.result = await work()
+            job.status = JobStatus.COMPLETED
+        except asyncio.CancelledError:
+            job.error = "Job was cancelled"
+            job.status = JobStatus.FAILED
+            raise
+        except Exception as e:
+            print(f"Error running job {job.id}: {str(e)}")
+            job.error = str(e)
+            job.status = JobStatus.FAILED
+        finally:
+            job.finished_at = datetime.now()
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """Look up a job, returning None if it is unknown or has expired"""
+        job = self._jobs.get(job_id)
+        if job is not None and job.expired(datetime.now()):
+            del self._jobs[job_id]
+            return None
+        return job
+
+    async def shutdown(self) -> None:
+        """Cancel jobs that are still running"""
+        tasks = [job.task for job in self._jobs.values() if job.task and not job.task.done()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+# Shared job store for the application
+job_store = JobStore()
@@ -0,0 +1,169 @@
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+import asyncio
+import hashlib
+import json
+import os
+from crewai import LLM
+from dotenv import load_dotenv
+from ..models.schemas import MarketAnalysis, MarketDigest, NewsArticleCollection
+from .crew_executor import parse_crew_json
+from .metrics import LLM_CALL_SECONDS, stats_collector
+from .news_service import load_recent_news
+
+# Load environment variables
+load_dotenv()
+
+MARKET_DIGEST_PROMPT = """
+Analyze the following Indian financial market news and identify key trends
+and insights that could impact investment decisions.
+
+News Data:
+{market_news}
+
+Focus on:
+1. Market-moving news
+2. Sector-specific developments
+3. Economic indicators
+4. Policy changes
+5. Market sentiment
+
+Return only a JSON object with the following structure:
+{{
+    "market_analysis": {{
+        "market_trends": ["Bullish market sentiment", "Tech sector growth"],
+        "key_insights": ["Interest rates expected to rise", "Strong corporate earnings"],
+        "impact_analysis": ["Positive for growth stocks", "Negative for bonds"]
+    }}
+}}
+"""
+
+# How long after a failed build the same news is not analyzed again, and a
+# cold start serves the empty digest instead of retrying
+MARKET_DIGEST_RETRY = timedelta(seconds=int(os.getenv("MARKET_DIGEST_RETRY_SECONDS", "60")))
+
+# Served until the first digest is built, or if there is no news to analyze
+EMPTY_DIGEST = MarketDigest(
+    version=0,
+    news_hash='',
+    analysis=MarketAnalysis(market_trends=[], key_insights=[], impact_analysis=[])
+)
+
+# Initialize LLM
+llm = LLM(
+    model='gemini/gemini-2.0-flash',
+    api_key=os.getenv("GEMINI_API_KEY")
+)
+
+def news_hash(news: NewsArticleCollection) -> str:
+    """SHA-256 of the articles' URLs and content, identifying a news snapshot"""
+    canonical = json.dumps(
+        [[article.url, article.title, article.summary] for article in news.articles],
+        separators=(',', ':')
+    )
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+class MarketDigestBuilder:
+    """
+    Keeps the market analysis digest of the latest news.
+
+    The analysis depends only on the news, so it is built once per news
+    refresh by a single LLM call and shared by every advice request. Each
+    new digest gets the next version number; a refresh whose news is
+    unchanged keeps the current digest, and a failed build keeps serving
+    the previous one. After a failure the build is not retried for the
+    same news, or on a cold start, until MARKET_DIGEST_RETRY has passed.
+    """
+
+    def __init__(self, llm: LLM = llm):
+        self.llm = llm
+        self._digest: Optional[MarketDigest] = None
+        self._lock = asyncio.Lock()
+        self.builds = 0
+        self.failures = 0
+        self.last_failure: Optional[datetime] = None
+        self._failed_hash: Optional[str] = None
+
+    @property
+    def backing_off(self) -> bool:
+        return self.last_failure is not None and datetime.now() - self.last_failure < MARKET_DIGEST_RETRY
+
+    def _record_failure(self, key: Optional[str] = None) -> None:
+        self.failures += 1
+        self.last_failure = datetime.now()
+        self._failed_hash = key
+
+    @property
+    def current(self) -> Optional[MarketDigest]:
+        return self._digest
+
+    def _analyze(self, news: NewsArticleCollection) -> MarketAnalysis:
+        """Analyze the news with one LLM call"""
+        articles = [
+            {
+                "title": article.title,
+                "summary": article.summary,
+                "source": article.source,
+                "publishedAt": article.publishedAt
+            }
+            for article in news.articles
+        ]
+        with LLM_CALL_SECONDS.labels("market_digest").time():
+            response = self.llm.call(MARKET_DIGEST_PROMPT.format(market_news=json.dumps(articles)))
+        result = parse_crew_json(response)
+        if not isinstance(result, dict):
+            raise ValueError("LLM did not return a JSON object")
+        return MarketAnalysis(**result.get('market_analysis', result))
+
+    async def refresh(self, news: NewsArticleCollection) -> Optional[MarketDigest]:
+        """Build the digest of `news`, unless the current digest already covers it"""
+        if not news.articles:
+            return self._digest
+
+        key = news_hash(news)
+        async with self._lock:
+            if self._digest is not None and self._digest.news_hash == key:
+                return self._digest
+            if self._failed_hash == key and self.backing_off:
+                return self._digest
+            try:
+                analysis = await asyncio.to_thread(self._analyze, news)
+            except Exception as e:
+                print(f"Error building market digest: {str(e)}")
+                self._record_failure(key)
+                return self._digest
+
+            self._digest = MarketDigest(
+                version=self._digest.version + 1 if self._digest else 1,
+                news_hash=key,
+                analysis=analysis,
+                articles=news.articles
+            )
+            self.builds += 1
+            self.last_failure = None
+            self._failed_hash = None
+            print(f"Market digest v{self._digest.version} built from {len(news.articles)} articles")
+            return self._digest
+
+    async def get(self) -> MarketDigest:
+        """Return the current digest, building one from stored news on a cold start"""
+        if self._digest is None and not self.backing_off:
+            try:
+                await self.refresh(await load_recent_news())
+            except Exception as e:
+                print(f"Error loading news for market digest: {str(e)}")
+                self._record_failure()
+        return self._digest or EMPTY_DIGEST
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the current version and build counters"""
+        return {
+            "version": self._digest.version if self._digest else 0,
+            "generated_at": self._digest.generated_at.isoformat() if self._digest else None,
+            "builds": self.builds,
+            "failures": self.failures
+        }
+
+# Shared market digest for the application
+market_digest = MarketDigestBuilder()
+stats_collector.register_llm("market_digest", market_digest.llm)
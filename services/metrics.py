@@ -0,0 +1,203 @@
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+import time
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Histogram, REGISTRY, generate_latest
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+from prometheus_client.registry import Collector
+
+# Buckets for LLM-bound work, which takes seconds to minutes
+LLM_BUCKETS = (0.5, 1, 2.5, 5, 10, 20, 30, 60, 120, 300, float("inf"))
+
+HTTP_REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template",
+    ["method", "route", "status"]
+)
+
+CREW_KICKOFF_SECONDS = Histogram(
+    "crew_kickoff_duration_seconds",
+    "Duration of a whole crew kickoff",
+    ["crew", "status"],
+    buckets=LLM_BUCKETS
+)
+
+CREW_TASK_SECONDS = Histogram(
+    "crew_task_duration_seconds",
+    "Duration of each crew task, including its agent's LLM and tool calls",
+    ["crew", "task", "agent"],
+    buckets=LLM_BUCKETS
+)
+
+LLM_CALL_SECONDS = Histogram(
+    "llm_call_duration_seconds",
+    "Duration of direct LLM calls outside crews",
+    ["component"],
+    buckets=LLM_BUCKETS
+)
+
+SCRAPER_FETCH_SECONDS = Histogram(
+    "scraper_fetch_duration_seconds",
+    "Time to fetch one listing page",
+    ["source"]
+)
+
+SCRAPER_PARSE_SECONDS = Histogram(
+    "scraper_parse_duration_seconds",
+    "Time to parse one listing page",
+    ["source"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, float("inf"))
+)
+
+SCRAPER_PAGES = Counter(
+    "scraper_pages_total",
+    "Listing pages requested, by outcome",
+    ["source", "outcome"]
+)
+
+# Token usage fields reported as the `type` label. Tokens are only read
+# from each LLM instance's lifetime usage: crewai's per-kickoff usage is
+# that same lifetime total, shared by every crew using the instance
+TOKEN_TYPES = ['prompt_tokens', 'completion_tokens', 'cached_prompt_tokens']
+
+def observe_crew_task(crew: str, output: Any, seconds: float) -> None:
+    """Record how long a crew task took, labelled by task and agent"""
+    task = getattr(output, 'name', None) or (getattr(output, 'description', '') or '')[:40].strip() or 'unknown'
+    CREW_TASK_SECONDS.labels(crew, task, str(getattr(output, 'agent', '') or 'unknown')).observe(seconds)
+
+class StatsCollector(Collector):
+    """
+    Exposes the stats the caches, coalescers and LLMs already keep.
+
+    Nothing is recorded on the request path: registered stats functions
+    are only read when /metrics is scraped.
+    """
+
+    def __init__(self):
+        self._caches: List[Tuple[str, Callable[[], Dict[str, Any]]]] = []
+        self._flights: List[Tuple[str, Callable[[], Dict[str, Any]]]] = []
+        self._llms: List[Tuple[str, Any]] = []
+
+    def register_cache(self, name: str, stats: Callable[[], Dict[str, Any]]) -> None:
+        """Expose a cache's hit, miss and size counters; nested 'memory' and 'disk' stats become their own caches"""
+        self._caches.append((name, stats))
+
+    def register_single_flight(self, name: str, stats: Callable[[], Dict[str, Any]]) -> None:
+        self._flights.append((name, stats))
+
+    def register_llm(self, name: str, llm: Any) -> None:
+        """Expose an LLM instance's lifetime token usage"""
+        self._llms.append((name, llm))
+
+    def _cache_levels(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        for name, stats in self._caches:
+            try:
+                values = stats()
+            except Exception as e:
+                print(f"Error collecting cache stats: {str(e)}")
+                continue
+            yield name, values
+            for level in ('memory', 'disk'):
+                if isinstance(values.get(level), dict):
+                    yield f"{name}_{level}", values[level]
+
+    def collect(self):
+        hits = CounterMetricFamily("cache_hits", "Cache hits", labels=["cache"])
+        misses = CounterMetricFamily("cache_misses", "Cache misses", labels=["cache"])
+        evictions = CounterMetricFamily("cache_evictions", "Cache evictions", labels=["cache"])
+        ratio = GaugeMetricFamily("cache_hit_ratio", "Cache hits per lookup since start", labels=["cache"])
+        entries = GaugeMetricFamily("cache_entries", "Entries currently cached", labels=["cache"])
+        for name, values in self._cache_levels():
+            if 'hits' in values:
+                hits.add_metric([name], values['hits'])
+                misses.add_metric([name], values.get('misses', 0))
+                lookups = values['hits'] + values.get('misses', 0)
+                ratio.add_metric([name], values['hits'] / lookups if lookups else 0.0)
+            if 'evictions' in values:
+                evictions.add_metric([name], values['evictions'])
+            size = values.get('size', values.get('entries'))
+            if size is not None:
+                entries.add_metric([name], size)
+        yield from (hits, misses, evictions, ratio, entries)
+
+        executions = CounterMetricFamily("single_flight_executions", "Runs started", labels=["name"])
+        coalesced = CounterMetricFamily("single_flight_coalesced", "Calls that joined a run in flight", labels=["name"])
+        in_flight = GaugeMetricFamily("single_flight_in_flight", "Runs in flight", labels=["name"])
+        for name, stats in self._flights:
+            values = stats()
+            executions.add_metric([name], values['executions'])
+            coalesced.add_metric([name], values['coalesced'])
+            in_flight.add_metric([name], values['in_flight'])
+        yield from (executions, coalesced, in_flight)
+
+        tokens = CounterMetricFamily("llm_tokens", "LLM tokens used through each LLM instance", labels=["llm", "type"])
+        requests = CounterMetricFamily("llm_requests", "Successful LLM requests through each LLM instance", labels=["llm"])
+        for name, llm in self._llms:
+            try:
+                usage = llm.get_token_usage_summary()
+            except Exception:
+                continue
+            for token_type in TOKEN_TYPES:
+                tokens.add_metric([name, token_type.replace('_tokens', '')], getattr(usage, token_type, 0) or 0)
+            requests.add_metric([name], usage.successful_requests or 0)
+        yield from (tokens, requests)
+
+# Shared collector of cache, coalescing and LLM stats
+stats_collector = StatsCollector()
+REGISTRY.register(stats_collector)
+
+def render_metrics() -> Tuple[bytes, str]:
+    """Current metrics in the Prometheus text format, with its content type"""
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
+
+def route_template(scope) -> str:
+    """
+    Template of the route a request matched, such as /api/jobs/{job_id}.
+
+    Routes of included routers only know their path below the router's
+    prefix, so the prefix is taken from the request path: it is whatever
+    precedes the part the route's own pattern matches.
+    """
+    route = scope.get("route")
+    path = getattr(route, "path", None)
+    if path is None:
+        return "unmatched"
+    request_path = scope.get("path", "")
+    pattern = getattr(route, "path_regex", None)
+    if pattern is not None:
+        for index, char in enumerate(request_path):
+            if char == "/" and pattern.match(request_path[index:]):
+                return request_path[:index] + path
+    return path
+
+class MetricsMiddleware:
+    """
+    ASGI middleware timing every HTTP request.
+
+    Requests are labelled by route template, such as /api/jobs/{job_id},
+    rather than by raw path, so label cardinality stays bounded. Requests
+    matching no route are labelled "unmatched".
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status: Dict[str, Optional[int]] = {"code": None}
+
+        async def send_with_status(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            HTTP_REQUEST_SECONDS.labels(
+                scope["method"],
+                route_template(scope),
+                str(status["code"] or 500)
+            ).observe(time.perf_counter() - started)
@@ -0,0 +1,75 @@
+from typing import List, Optional
+import hashlib
+import os
+import numpy as np
+from dotenv import load_dotenv
+from .text_normalization import fold_text
+
+# Load environment variables
+load_dotenv()
+
+# MinHash signature length, split into LSH bands of BAND_ROWS values each.
+# 32 bands of 4 rows make articles with Jaccard similarity around 0.4 or
+# more likely to share a band
+NUM_PERMUTATIONS = 128
+BAND_ROWS = 4
+NUM_BANDS = NUM_PERMUTATIONS // BAND_ROWS
+
+# Estimated Jaccard similarity of character shingles at which two articles
+# count as the same story
+NEAR_DUPLICATE_THRESHOLD = float(os.getenv("NEAR_DUPLICATE_THRESHOLD", "0.5"))
+
+# Characters per shingle
+SHINGLE_SIZE = 4
+
+# Fixed seed: signatures are stored, so the hash family must never change
+_rng = np.random.default_rng(20240601)
+_MULTIPLIERS = _rng.integers(1, 2 ** 63, size=NUM_PERMUTATIONS, dtype=np.uint64) | np.uint64(1)
+_INCREMENTS = _rng.integers(0, 2 ** 63, size=NUM_PERMUTATIONS, dtype=np.uint64)
+_SHIFT = np.uint64(32)
+
+def shingles(normalized: str) -> np.ndarray:
+    """Distinct 4-byte shingles of the folded text's UTF-8 encoding, packed into integers"""
+    data = np.frombuffer(normalized.encode('utf-8'), dtype=np.uint8).astype(np.uint64)
+    if len(data) < SHINGLE_SIZE:
+        data = np.pad(data, (0, SHINGLE_SIZE - len(data)))
+    packed = np.zeros(len(data) - SHINGLE_SIZE + 1, dtype=np.uint64)
+    for offset in range(SHINGLE_SIZE):
+        packed = (packed << np.uint64(8)) | data[offset:len(packed) + offset]
+    return np.unique(packed)
+
+def minhash_signature(text: str) -> Optional[np.ndarray]:
+    """
+    MinHash signature of the text's shingles, or None if the text has no
+    letters or digits to compare.
+
+    Each of the NUM_PERMUTATIONS hash functions is multiply-shift hashing,
+    (a * x + b) mod 2^64 keeping the top 32 bits, computed for every
+    shingle at once.
+    """
+    # ASCII text folds as it always has, so stored signatures stay comparable
+    normalized = fold_text(text)
+    if not normalized:
+        return None
+    values = shingles(normalized)
+    hashed = (_MULTIPLIERS[:, None] * values[None, :] + _INCREMENTS[:, None]) >> _SHIFT
+    return hashed.min(axis=1).astype(np.uint32)
+
+def band_keys(signature: np.ndarray) -> List[int]:
+    """One signed 64-bit LSH bucket key per band of the signature"""
+    keys = []
+    for band in range(NUM_BANDS):
+        digest = hashlib.blake2b(
+            band.to_bytes(2, 'little') + signature[band * BAND_ROWS:(band + 1) * BAND_ROWS].tobytes(),
+            digest_size=8
+        ).digest()
+        keys.append(int.from_bytes(digest, 'little', signed=True))
+    return keys
+
+def similarity(signature: np.ndarray, other: np.ndarray) -> float:
+    """Estimated Jaccard similarity of the texts behind two signatures"""
+    return float(np.mean(signature == other))
+
+def article_text(title: str, summary: str) -> str:
+    """Text of an article that near-duplicate detection compares"""
+    return f"{title} {summary}"
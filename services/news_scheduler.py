@@ -0,0 +1,147 @@
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, List, Optional
+import asyncio
+import os
+from dotenv import load_dotenv
+from ..models.schemas import NewsArticleCollection
+from .market_digest import market_digest
+from .news_service import ingest_news, load_recent_news
+
+# Load environment variables
+load_dotenv()
+
+# How often sources are refreshed in the background
+NEWS_REFRESH_INTERVAL = timedelta(seconds=int(os.getenv("NEWS_REFRESH_INTERVAL_SECONDS", "600")))
+
+# Wait before retrying after a failed refresh; doubles with each failure in a
+# row, up to the refresh interval
+NEWS_REFRESH_RETRY = timedelta(seconds=int(os.getenv("NEWS_REFRESH_RETRY_SECONDS", "30")))
+
+# How long a request waits for the very first refresh before returning no articles
+NEWS_COLD_START_TIMEOUT = float(os.getenv("NEWS_COLD_START_TIMEOUT_SECONDS", "15"))
+
+class NewsScheduler:
+    """
+    Refreshes news in the background and serves it from memory.
+
+    Refreshes run on a fixed interval once started. Readers always get the
+    latest snapshot straight away; a stale snapshot is served while a
+    refresh runs in the background. At most one refresh runs at a time.
+    Before the first refresh finishes, readers are served whatever `load`
+    returns, such as articles persisted by an earlier run. After each
+    refresh, listeners are called with the new snapshot so data derived
+    from the news is rebuilt once per refresh rather than per request.
+    A failed refresh is not retried by readers until a backoff has passed.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[], Awaitable[NewsArticleCollection]],
+        interval: timedelta = NEWS_REFRESH_INTERVAL,
+        load: Optional[Callable[[], Awaitable[NewsArticleCollection]]] = None,
+        listeners: Optional[List[Callable[[NewsArticleCollection], Awaitable[Any]]]] = None
+    ):
+        self._fetch = fetch
+        self._load = load
+        self._listeners = list(listeners or [])
+        self.interval = interval
+        self.last_refresh: Optional[datetime] = None
+        self.last_failure: Optional[datetime] = None
+        self.consecutive_failures = 0
+        self._snapshot: Optional[NewsArticleCollection] = None
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._loop_task: Optional[asyncio.Task] = None
+
+    def add_listener(self, listener: Callable[[NewsArticleCollection], Awaitable[Any]]) -> None:
+        """Call `listener` with the news snapshot after every refresh"""
+        self._listeners.append(listener)
+
+    def start(self) -> None:
+        """Start the periodic background refresh"""
+        if self._loop_task is None:
+            self._loop_task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the background refresh and wait for it to finish"""
+        tasks = [task for task in (self._loop_task, self._refresh_task) if task and not task.done()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._loop_task = None
+        self._refresh_task = None
+
+    async def _run(self) -> None:
+        while True:
+            await self.refresh()
+            await asyncio.sleep(self.interval.total_seconds())
+
+    def trigger_refresh(self) -> asyncio.Task:
+        """Start a refresh unless one is already running, returning the running refresh"""
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(self._do_refresh())
+        return self._refresh_task
+
+    async def refresh(self) -> None:
+        """Refresh now, or wait for the refresh already in progress"""
+        await asyncio.shield(self.trigger_refresh())
+
+    async def _do_refresh(self) -> None:
+        try:
+            collection = await self._fetch()
+        except Exception as e:
+            print(f"Error refreshing news: {str(e)}")
+            self.last_failure = datetime.now()
+            self.consecutive_failures += 1
+            return
+
+        self.last_failure = None
+        self.consecutive_failures = 0
+        # Keep serving the last good snapshot if every source came back empty
+        if collection.articles or self._snapshot is None:
+            self._snapshot = collection
+        self.last_refresh = datetime.now()
+        print(f"News refreshed at {self.last_refresh}: {len(collection.articles)} articles")
+
+        for listener in self._listeners:
+            try:
+                await listener(self._snapshot)
+            except Exception as e:
+                print(f"Error in news refresh listener: {str(e)}")
+
+    @property
+    def retry_delay(self) -> timedelta:
+        """How long to wait after the last failed refresh before trying again"""
+        if not self.consecutive_failures:
+            return timedelta(0)
+        return min(NEWS_REFRESH_RETRY * 2 ** min(self.consecutive_failures - 1, 16), self.interval)
+
+    @property
+    def backing_off(self) -> bool:
+        return self.last_failure is not None and datetime.now() - self.last_failure < self.retry_delay
+
+    @property
+    def is_stale(self) -> bool:
+        if self.backing_off:
+            return False
+        return self.last_refresh is None or datetime.now() - self.last_refresh > self.interval
+
+    async def get_latest(self) -> NewsArticleCollection:
+        """Return the latest news snapshot, revalidating it in the background if stale"""
+        if self._snapshot is None and self._load is not None:
+            try:
+                loaded = await self._load()
+                if loaded.articles and self._snapshot is None:
+                    self._snapshot = loaded
+            except Exception as e:
+                print(f"Error loading stored news: {str(e)}")
+
+        if self._snapshot is None and not self.backing_off:
+            # Nothing to serve yet; wait briefly for the first refresh
+            await asyncio.wait({self.trigger_refresh()}, timeout=NEWS_COLD_START_TIMEOUT)
+        elif self.is_stale:
+            self.trigger_refresh()
+
+        return self._snapshot or NewsArticleCollection(articles=[])
+
+# Shared news scheduler for the application
+news_scheduler = NewsScheduler(ingest_news, load=load_recent_news, listeners=[market_digest.refresh])
@@ -0,0 +1,191 @@
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+import asyncio
+import hashlib
+import os
+from crewai import LLM
+from dotenv import load_dotenv
+from sqlalchemy import select
+from sqlalchemy.orm import sessionmaker
+from ..db.models import ArticleSummary
+from ..db.session import SessionLocal
+from ..models.schemas import NewsArticle, NewsArticleSummary
+from .article_store import normalize_url, parse_published_at
+from .crew_executor import parse_crew_json
+from .metrics import LLM_CALL_SECONDS, stats_collector
+from .single_flight import SingleFlight
+
+# Load environment variables
+load_dotenv()
+
+# Estimated article tokens sent to the LLM in one prompt
+NEWS_SUMMARY_TOKEN_BUDGET = int(os.getenv("NEWS_SUMMARY_TOKEN_BUDGET", "4000"))
+
+# Most articles summarized in one prompt, however short they are
+NEWS_SUMMARY_MAX_BATCH = int(os.getenv("NEWS_SUMMARY_MAX_BATCH", "20"))
+
+# Characters per token, for estimating prompt size without a tokenizer
+CHARS_PER_TOKEN = 4
+
+SUMMARY_PROMPT = """
+Summarize each of the following Indian financial news articles in 2-3
+sentences that capture the key points for investors. Use only the facts
+in the article.
+
+Return only a JSON array with one object per article, in any order:
+[{{"id": <article id>, "summary": "<summary>"}}]
+
+{articles}
+"""
+
+# Initialize LLM
+llm = LLM(
+    model='gemini/gemini-2.0-flash',
+    api_key=os.getenv("GEMINI_API_KEY")
+)
+
+def summary_key(article: NewsArticle) -> str:
+    """SHA-256 of an article's normalized URL and content; changes whenever the content does"""
+    content = '\n'.join([normalize_url(article.url), article.title, article.summary])
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+def estimate_tokens(article: NewsArticle) -> int:
+    return (len(article.title) + len(article.summary)) // CHARS_PER_TOKEN + 1
+
+def batch_articles(articles: List[NewsArticle]) -> List[List[NewsArticle]]:
+    """Split articles into prompts of at most NEWS_SUMMARY_TOKEN_BUDGET estimated tokens"""
+    batches: List[List[NewsArticle]] = []
+    batch: List[NewsArticle] = []
+    tokens = 0
+    for article in articles:
+        article_tokens = estimate_tokens(article)
+        if batch and (tokens + article_tokens > NEWS_SUMMARY_TOKEN_BUDGET or len(batch) >= NEWS_SUMMARY_MAX_BATCH):
+            batches.append(batch)
+            batch, tokens = [], 0
+        batch.append(article)
+        tokens += article_tokens
+    if batch:
+        batches.append(batch)
+    return batches
+
+def _to_summary(article: NewsArticle, summary: str) -> NewsArticleSummary:
+    return NewsArticleSummary(
+        published_at=parse_published_at(article.publishedAt),
+        summary=summary,
+        source_url=article.url
+    )
+
+class ArticleSummarizer:
+    """
+    Summarizes news articles with the LLM, once per version of each article.
+
+    Summaries are stored keyed by a hash of the article's URL and content,
+    so an article is only sent to the LLM when it is new or its content
+    changed. Articles without a stored summary are packed several to a
+    prompt up to a token budget, and the prompts run concurrently.
+    Identical prompts already in flight are shared between callers.
+    """
+
+    def __init__(self, llm: LLM = llm, session_factory: sessionmaker = SessionLocal):
+        self.llm = llm
+        self._session_factory = session_factory
+        self._flight = SingleFlight("news_summaries")
+        self.hits = 0
+        self.misses = 0
+        self.llm_calls = 0
+        self.failures = 0
+
+    def _load(self, keys: List[str]) -> Dict[str, str]:
+        with self._session_factory() as session:
+            return dict(session.execute(
+                select(ArticleSummary.content_hash, ArticleSummary.summary)
+                .where(ArticleSummary.content_hash.in_(keys))
+            ).all())
+
+    def _save(self, rows: List[Tuple[str, str, str]]) -> None:
+        now = datetime.now()
+        with self._session_factory() as session:
+            for key, url, summary in rows:
+                session.merge(ArticleSummary(content_hash=key, url=url, summary=summary, created_at=now))
+            session.commit()
+
+    def _summarize_batch(self, batch: List[NewsArticle]) -> Dict[str, str]:
+        """Summarize one batch with a single LLM call, returning summaries by key"""
+        keys = [summary_key(article) for article in batch]
+        prompt = SUMMARY_PROMPT.format(articles='\n\n'.join(
+            f"[{index}] {article.title}\nSource: {article.source}\n{article.summary}"
+            for index, article in enumerate(batch)
+        ))
+        self.llm_calls += 1
+        with LLM_CALL_SECONDS.labels("news_summaries").time():
+            response = self.llm.call(prompt)
+        result = parse_crew_json(response)
+        if not isinstance(result, list):
+            raise ValueError("LLM did not return a JSON array of summaries")
+
+        summaries: Dict[str, str] = {}
+        for item in result:
+            try:
+                index = int(item['id'])
+                summary = str(item['summary']).strip()
+            except (KeyError, TypeError, ValueError):
+                continue
+            if 0 <= index < len(batch) and summary:
+                summaries[keys[index]] = summary
+
+        self._save([(key, article.url, summaries[key]) for key, article in zip(keys, batch) if key in summaries])
+        return summaries
+
+    async def _summarize_missing(self, batch: List[NewsArticle]) -> Dict[str, str]:
+        key = tuple(summary_key(article) for article in batch)
+        try:
+            return await self._flight.do(key, lambda: asyncio.to_thread(self._summarize_batch, batch))
+        except Exception as e:
+            print(f"Error summarizing news: {str(e)}")
+            self.failures += 1
+            return {}
+
+    async def summarize(self, articles: List[NewsArticle]) -> List[NewsArticleSummary]:
+        """
+        Summaries of the articles, in order.
+
+        Stored summaries are returned straight away; only the rest go to the
+        LLM. An article the LLM could not summarize keeps its scraped summary,
+        and is retried on the next call.
+        """
+        keys = [summary_key(article) for article in articles]
+        summaries = await asyncio.to_thread(self._load, list(set(keys))) if keys else {}
+
+        missing: Dict[str, NewsArticle] = {}
+        for key, article in zip(keys, articles):
+            if key not in summaries:
+                missing.setdefault(key, article)
+        self.hits += len(articles) - len(missing)
+        self.misses += len(missing)
+
+        if missing:
+            results = await asyncio.gather(*(
+                self._summarize_missing(batch) for batch in batch_articles(list(missing.values()))
+            ))
+            for result in results:
+                summaries.update(result)
+
+        return [_to_summary(article, summaries.get(key, article.summary)) for key, article in zip(keys, articles)]
+
+    def stats(self) -> Dict[str, Any]:
+        """Return summary cache and LLM call counters"""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "llm_calls": self.llm_calls,
+            "failures": self.failures,
+            "coalescing": self._flight.stats()
+        }
+
+# Shared article summarizer for the application
+article_summarizer = ArticleSummarizer()
+stats_collector.register_cache("news_summaries", article_summarizer.stats)
+stats_collector.register_single_flight(article_summarizer._flight.name, article_summarizer._flight.stats)
+stats_collector.register_llm("news_summaries", article_summarizer.llm)
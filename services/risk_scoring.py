@@ -0,0 +1,320 @@
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from functools import lru_cache
+import json
+import numpy as np
+import pandas as pd
+from ..models.schemas import UserProfile, RiskAnalysis
+
+# Weight of each factor in the 0-100 risk score
+FACTOR_WEIGHTS = {
+    'age': 20.0,
+    'income': 15.0,
+    'dependents': 15.0,
+    'horizon': 20.0,
+    'portfolio': 10.0,
+    'tolerance': 20.0
+}
+
+FACTOR_NAMES = list(FACTOR_WEIGHTS)
+WEIGHT_VECTOR = np.array([FACTOR_WEIGHTS[name] for name in FACTOR_NAMES])
+PORTFOLIO = FACTOR_NAMES.index('portfolio')
+
+# Profile fields the batch scorer needs
+REQUIRED_COLUMNS = ['age', 'income', 'dependents', 'investment_horizon', 'risk_tolerance']
+NUMERIC_COLUMNS = ['age', 'income', 'dependents', 'investment_horizon']
+
+# Upper bounds of the risk category bands
+CONSERVATIVE_MAX = 30.0
+MODERATE_MAX = 70.0
+
+# Annual income (INR) mapped to the bottom and top of the income factor
+INCOME_FLOOR = 3_00_000
+INCOME_CEILING = 3_00_00_000
+
+# Stated risk tolerance mapped to the tolerance factor
+TOLERANCE_LEVELS = {
+    'very low': 0.0,
+    'low': 0.0,
+    'conservative': 0.0,
+    'medium': 0.5,
+    'moderate': 0.5,
+    'balanced': 0.5,
+    'high': 1.0,
+    'very high': 1.0,
+    'aggressive': 1.0
+}
+
+# Keywords identifying growth (equity-like) holdings in existing_investments
+EQUITY_KEYWORDS = (
+    'equity', 'stock', 'share', 'mutual fund', 'index', 'etf', 'elss',
+    'smallcap', 'small cap', 'midcap', 'mid cap', 'crypto'
+)
+
+def tolerance_factor(risk_tolerance: str) -> float:
+    """Map a stated risk tolerance to 0 (low) .. 1 (high)"""
+    return TOLERANCE_LEVELS.get(risk_tolerance.strip().lower(), 0.5)
+
+def investment_amount(investment: Dict[str, Any]) -> Optional[float]:
+    """Amount held in an existing investment, or None if it is not given"""
+    amount = investment.get('amount', investment.get('value'))
+    try:
+        return float(amount)
+    except (TypeError, ValueError):
+        return None
+
+def equity_share(existing_investments: List[Dict[str, Any]]) -> float:
+    """Share of existing investments held in equity-like instruments"""
+    equity_amount = 0.0
+    total_amount = 0.0
+    for investment in existing_investments:
+        kind = ' '.join(
+            str(investment.get(field, ''))
+            for field in ('type', 'asset_class', 'category', 'instrument', 'name')
+        ).lower()
+        amount = investment_amount(investment)
+        if amount is None:
+            amount = 1.0
+
+        total_amount += amount
+        if any(keyword in kind for keyword in EQUITY_KEYWORDS):
+            equity_amount += amount
+
+    if total_amount <= 0:
+        return 0.5
+    return equity_amount / total_amount
+
+def _factor_matrix(
+    age: np.ndarray,
+    income: np.ndarray,
+    dependents: np.ndarray,
+    horizon: np.ndarray,
+    portfolio: np.ndarray,
+    tolerance: np.ndarray
+) -> np.ndarray:
+    """Each profile's factor values (0 to 1), one column per factor in FACTOR_NAMES"""
+    income = np.maximum(income, 1.0)
+    return np.column_stack([
+        np.clip((60 - age) / 40, 0.0, 1.0),
+        np.clip(np.log10(income / INCOME_FLOOR) / np.log10(INCOME_CEILING / INCOME_FLOOR), 0.0, 1.0),
+        np.clip(1 - dependents / 4, 0.0, 1.0),
+        np.clip(horizon / 20, 0.0, 1.0),
+        portfolio,
+        tolerance
+    ])
+
+# How each factor is described in key_factors
+FACTOR_LABELS = {
+    'age': "Age ({age} years)",
+    'income': "Income stability (annual income {income:,.0f})",
+    'dependents': "Dependents ({dependents})",
+    'horizon': "Investment horizon ({horizon} years)",
+    'portfolio': "Current portfolio ({equity_percent:.0f}% in equity)",
+    'tolerance': "Stated risk tolerance ({risk_tolerance})"
+}
+
+def _describe_factors(
+    age: int,
+    income: float,
+    dependents: int,
+    horizon: int,
+    risk_tolerance: str,
+    factors: List[float],
+    ranked: List[int]
+) -> List[str]:
+    """Describe the factors that move the score furthest from neutral"""
+    effects = []
+    for index in ranked:
+        label = FACTOR_LABELS[FACTOR_NAMES[index]].format(
+            age=age,
+            income=income,
+            dependents=dependents,
+            horizon=horizon,
+            equity_percent=factors[PORTFOLIO] * 100,
+            risk_tolerance=risk_tolerance
+        )
+        if factors[index] > 0.5:
+            effects.append(f"{label}: raises risk capacity")
+        elif factors[index] < 0.5:
+            effects.append(f"{label}: lowers risk capacity")
+        else:
+            effects.append(f"{label}: neutral for risk capacity")
+    return effects
+
+@lru_cache(maxsize=None)
+def _recommendations(
+    category: str,
+    has_dependents: bool,
+    short_horizon: bool,
+    equity_heavy: bool
+) -> Tuple[str, ...]:
+    """Rule-based risk management recommendations"""
+    recommendations = {
+        'Conservative': [
+            "Prioritise capital protection through debt funds, PPF and fixed deposits",
+            "Limit equity exposure to large-cap or index funds"
+        ],
+        'Moderate': [
+            "Diversify across equity, debt and gold",
+            "Use SIPs to average out market volatility"
+        ],
+        'Aggressive': [
+            "Keep a diversified core of index funds alongside higher-risk equity",
+            "Rebalance annually to stop equity drifting beyond target"
+        ]
+    }[category]
+
+    if has_dependents:
+        recommendations.append("Maintain adequate term life and health insurance cover for dependents")
+    if short_horizon:
+        recommendations.append("Keep money needed within 3 years in liquid or short-duration debt funds")
+    if equity_heavy and category != 'Aggressive':
+        recommendations.append("Existing portfolio is equity-heavy for this risk profile; shift some to debt")
+    recommendations.append("Build an emergency fund covering at least six months of expenses")
+    recommendations.append("Use tax-efficient instruments such as ELSS, PPF and NPS under Section 80C/80CCD")
+    return tuple(recommendations)
+
+def _score(
+    age: np.ndarray,
+    income: np.ndarray,
+    dependents: np.ndarray,
+    horizon: np.ndarray,
+    existing_investments: Sequence[List[Dict[str, Any]]],
+    risk_tolerance: Sequence[str]
+) -> List[RiskAnalysis]:
+    """Score many profiles at once, given one array per profile field"""
+    portfolio = np.fromiter(
+        (equity_share(investments) for investments in existing_investments),
+        dtype=float,
+        count=len(existing_investments)
+    )
+    tolerance = np.fromiter(
+        (tolerance_factor(str(value)) for value in risk_tolerance),
+        dtype=float,
+        count=len(risk_tolerance)
+    )
+
+    factors = _factor_matrix(age, income, dependents, horizon, portfolio, tolerance)
+    scores = np.round(factors @ WEIGHT_VECTOR, 1)
+    categories = np.select(
+        [scores <= CONSERVATIVE_MAX, scores <= MODERATE_MAX],
+        ['Conservative', 'Moderate'],
+        'Aggressive'
+    )
+    # Rank factors by how far they move each score away from neutral
+    ranked = np.argsort(-WEIGHT_VECTOR * np.abs(factors - 0.5), axis=1, kind='stable')[:, :4]
+
+    # Plain lists are much faster than NumPy scalars in the per-profile loop
+    rows = zip(
+        age.tolist(), income.tolist(), dependents.tolist(), horizon.tolist(), risk_tolerance,
+        factors.tolist(), ranked.tolist(), scores.tolist(), categories.tolist()
+    )
+    return [
+        RiskAnalysis(
+            risk_score=score,
+            risk_category=category,
+            key_factors=_describe_factors(
+                int(row_age), row_income, int(row_dependents), int(row_horizon),
+                str(row_tolerance), row_factors, row_ranked
+            ),
+            recommendations=list(_recommendations(
+                category, row_dependents > 0, row_horizon < 3, row_factors[PORTFOLIO] > 0.8
+            ))
+        )
+        for (
+            row_age, row_income, row_dependents, row_horizon, row_tolerance,
+            row_factors, row_ranked, score, category
+        ) in rows
+    ]
+
+def score_risk(profile: UserProfile) -> RiskAnalysis:
+    """
+    Compute a reproducible 0-100 risk score for a user profile.
+
+    Younger age, higher income, fewer dependents, a longer horizon, an
+    equity-heavy existing portfolio and a higher stated tolerance all
+    raise the score.
+    """
+    return _score(
+        np.array([profile.age], dtype=float),
+        np.array([profile.income], dtype=float),
+        np.array([profile.dependents], dtype=float),
+        np.array([profile.investment_horizon], dtype=float),
+        [profile.existing_investments],
+        [profile.risk_tolerance]
+    )[0]
+
+def _format_rows(rows: np.ndarray, limit: int = 10) -> str:
+    """Comma-separated row indexes, truncated after `limit`"""
+    shown = ', '.join(str(row) for row in rows[:limit])
+    return shown if len(rows) <= limit else f"{shown} and {len(rows) - limit} more"
+
+def score_risk_frame(profiles: pd.DataFrame) -> List[RiskAnalysis]:
+    """
+    Score a DataFrame of profiles with one row per UserProfile.
+
+    Requires the age, income, dependents, investment_horizon and
+    risk_tolerance columns; existing_investments is optional. Raises
+    ValueError naming the rows (0-based) whose required fields are
+    missing, negative or of the wrong type.
+    """
+    missing = [column for column in REQUIRED_COLUMNS if column not in profiles.columns]
+    if missing:
+        raise ValueError(f"Missing profile fields: {', '.join(missing)}")
+
+    # Scoring a missing value would silently yield a NaN score, so reject those rows
+    numeric = {column: pd.to_numeric(profiles[column], errors='coerce') for column in NUMERIC_COLUMNS}
+    problems = [
+        f"{column} missing or not a number in rows {_format_rows(np.flatnonzero(invalid))}"
+        for column, invalid in (
+            (column, ~np.isfinite(values.to_numpy(dtype=float))) for column, values in numeric.items()
+        )
+        if invalid.any()
+    ]
+    problems.extend(
+        f"{column} negative in rows {_format_rows(np.flatnonzero(negative))}"
+        for column, negative in (
+            (column, (values < 0).to_numpy()) for column, values in numeric.items()
+        )
+        if negative.any()
+    )
+    bad_tolerance = ~profiles['risk_tolerance'].map(lambda value: isinstance(value, str)).to_numpy(dtype=bool)
+    if bad_tolerance.any():
+        problems.append(f"risk_tolerance missing or not a string in rows {_format_rows(np.flatnonzero(bad_tolerance))}")
+    if problems:
+        raise ValueError('; '.join(problems))
+
+    if 'existing_investments' in profiles.columns:
+        existing_investments = [
+            investments if isinstance(investments, list) else []
+            for investments in profiles['existing_investments']
+        ]
+    else:
+        existing_investments = [[] for _ in range(len(profiles))]
+
+    return _score(
+        numeric['age'].to_numpy(dtype=float),
+        numeric['income'].to_numpy(dtype=float),
+        numeric['dependents'].to_numpy(dtype=float),
+        numeric['investment_horizon'].to_numpy(dtype=float),
+        existing_investments,
+        profiles['risk_tolerance'].astype(str).tolist()
+    )
+
+def load_profiles(payload: bytes, ndjson: bool = False) -> pd.DataFrame:
+    """
+    Load profiles from a JSON array or newline-delimited JSON into a DataFrame.
+
+    Raises ValueError if the payload is not valid JSON or any profile is
+    not a JSON object.
+    """
+    if ndjson:
+        records = [json.loads(line) for line in payload.splitlines() if line.strip()]
+    else:
+        records = json.loads(payload)
+        if not isinstance(records, list):
+            raise ValueError("Expected a JSON array of profiles")
+
+    not_objects = np.flatnonzero([not isinstance(record, dict) for record in records])
+    if len(not_objects):
+        raise ValueError(f"Profiles must be JSON objects; rows {_format_rows(not_objects)} are not")
+    return pd.DataFrame.from_records(records, columns=None if records else REQUIRED_COLUMNS)
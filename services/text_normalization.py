@@ -0,0 +1,19 @@
+import re
+import unicodedata
+
+# Unicode categories that separate words: punctuation, symbols, separators
+# and control characters. Letters, digits and combining marks (such as
+# Devanagari vowel signs, which \w does not match) belong to words
+SEPARATOR_CATEGORIES = ('P', 'S', 'Z', 'C')
+
+_ASCII_SEPARATOR = re.compile(r'[^a-z0-9]+')
+
+def fold_text(text: str) -> str:
+    """Lowercased words of the text, in any script, separated by single spaces"""
+    text = text.lower()
+    if text.isascii():
+        return _ASCII_SEPARATOR.sub(' ', text).strip()
+    return ' '.join(''.join(
+        ' ' if unicodedata.category(char)[0] in SEPARATOR_CATEGORIES else char
+        for char in text
+    ).split())
@@ -1,22 +1,27 @@
 from crewai import Agent, Task, Crew, Process, LLM
-from crewai.tools import tool
-from typing import Dict, List, Any
+from typing import Dict, List, Any, AsyncIterator, Tuple
+import asyncio
 import os
 import json
-import asyncio
+import hashlib
 from datetime import datetime
 from ..models.schemas import (
     UserProfile, 
     RiskAnalysis, 
     InvestmentRecommendation,
     WealthManagementResponse,
-    NewsArticleCollection,
-    MarketAnalysis
+    MarketDigest,
+    GoalProjection
 )
-from ..tools.news_fetcher import fetch_indian_financial_news
 from dotenv import load_dotenv
 import google.generativeai as genai
-from app.services.news_service import fetch_financial_news
+from .market_digest import market_digest
+from .crew_executor import run_crew, stream_crew, parse_crew_json, task_event
+from .single_flight import SingleFlight
+from .risk_scoring import score_risk
+from .goal_simulator import project_goals
+from .allocation_optimizer import optimize_allocation
+from .metrics import stats_collector
 
 # Load environment variables
 load_dotenv()
@@ -31,59 +36,7 @@ llm = LLM(
     api_key=os.environ["GEMINI_API_KEY"]
 )
 
-# Define the news fetching tool
-@tool("Fetch Financial News")
-def fetch_financial_news() -> str:
-    """Fetches the latest Indian financial market news from cached data"""
-    try:
-        # Get the market news from the task context
-        task_context = analyze_news_task.context
-        market_news = json.loads(task_context.get('market_news', '{"articles": []}'))
-        
-        # Take up to 20 most recent articles
-        articles = market_news.get('articles', [])[:20]
-        
-        # Format the news data into a JSON string
-        formatted_news = json.dumps({
-            "articles": [
-                {
-                    "title": article.get("title", ""),
-                    "summary": article.get("summary", ""),
-                    "url": article.get("url", ""),
-                    "publishedAt": article.get("publishedAt", datetime.now().isoformat()),
-                    "source": article.get("source", "")
-                }
-                for article in articles
-            ]
-        })
-        
-        return formatted_news
-    except Exception as e:
-        print(f"Error processing cached news data: {str(e)}")
-        return json.dumps({"articles": []})
-
 # Create agents
-risk_analyzer = Agent(
-    role='Risk Analysis Expert',
-    goal='Analyze user risk profile and provide comprehensive risk assessment',
-    backstory="""You are an experienced risk analyst with deep understanding of 
-                Indian financial markets. You evaluate user profiles to determine 
-                appropriate risk levels and investment capacity.""",
-    verbose=True,
-    llm=llm
-)
-
-news_fetcher = Agent(
-    role='Financial News Analyst',
-    goal='Analyze market news and identify relevant trends for investment decisions',
-    backstory="""You are a financial news analyst specializing in Indian markets.
-                You understand how market news impacts different investment strategies
-                and can identify key trends that should influence investment decisions.""",
-    tools=[fetch_financial_news],
-    verbose=True,
-    llm=llm
-)
-
 investment_advisor = Agent(
     role='Investment Advisor',
     goal='Provide personalized investment recommendations based on risk analysis and market conditions',
@@ -95,92 +48,32 @@ investment_advisor = Agent(
 )
 
 # Create tasks
-risk_analysis_task = Task(
+recommend_investments_task = Task(
     description="""
-        Analyze the investor's risk profile comprehensively.
+        Explain and implement the precomputed asset allocation for this investor,
+        using the risk analysis and market news analysis.
+        
+        Market Analysis of the latest news:
+        {market_analysis}
         
         User Profile:
         {user_data}
         
-        Required Analysis:
-        1. Calculate a risk score (0-100) considering:
-           - Age factor: Younger investors can take more risks
-           - Income stability: Higher stable income enables more risk
-           - Dependencies: More dependents reduce risk capacity
-           - Investment horizon: Longer horizon allows more risk
-           - Current portfolio: Assess existing risk exposure
-           - Stated preferences: Consider user's risk tolerance
-        
-        2. Determine risk category:
-           - Conservative (0-30)
-           - Moderate (31-70)
-           - Aggressive (71-100)
+        Risk Analysis (computed by the risk scoring engine):
+        {risk_analysis}
         
-        3. Identify key risk factors and their impact
+        Asset Allocation in percent (computed by the allocation optimizer, do not change it):
+        {asset_allocation}
         
-        4. Provide risk management recommendations
-        
-        Return a JSON object with the following structure:
-        {{
-            "risk_analysis": {{
-                "risk_score": 65.0,
-                "risk_category": "Moderate",
-                "key_factors": ["Age", "Income Stability", "Investment Horizon"],
-                "recommendations": ["Diversify portfolio", "Consider tax-efficient investments"]
-            }}
-        }}
-    """,
-    expected_output="JSON formatted risk analysis with score, category, factors, and recommendations",
-    agent=risk_analyzer
-)
-
-analyze_news_task = Task(
-    description="""
-        Analyze the provided market news and identify key trends and insights
-        that could impact investment decisions.
-        
-        News Data:
-        {market_news}
-        
-        Focus on:
-        1. Market-moving news
-        2. Sector-specific developments
-        3. Economic indicators
-        4. Policy changes
-        5. Market sentiment
-        
-        Return a JSON object with the following structure:
-        {{
-            "market_analysis": {{
-                "market_trends": ["Bullish market sentiment", "Tech sector growth"],
-                "key_insights": ["Interest rates expected to rise", "Strong corporate earnings"],
-                "impact_analysis": ["Positive for growth stocks", "Negative for bonds"]
-            }}
-        }}
-    """,
-    expected_output="JSON formatted market analysis with trends, insights, and impact analysis",
-    agent=news_fetcher
-)
-
-recommend_investments_task = Task(
-    description="""
-        Based on the risk analysis and market news analysis, provide personalized
-        investment recommendations. Consider:
-        - Risk analysis results
+        Recommend specific instruments within each asset class so that their
+        allocations add up to that asset class's share. Consider:
         - Market trends and insights
         - User's financial goals
         - Tax saving requirements
-        - Asset allocation strategy
         
         Return a JSON object with the following structure:
         {{
             "recommendations": {{
-                "asset_allocation": {{
-                    "equity": 60,
-                    "debt": 30,
-                    "gold": 5,
-                    "real_estate": 5
-                }},
                 "specific_recommendations": [
                     {{
                         "type": "equity",
@@ -199,18 +92,23 @@ recommend_investments_task = Task(
         }}
     """,
     expected_output="Detailed investment recommendations with asset allocation and specific suggestions",
-    agent=investment_advisor,
-    context=[risk_analysis_task, analyze_news_task]
+    agent=investment_advisor
 )
 
 # Create crew
 wealth_crew = Crew(
-    agents=[risk_analyzer, news_fetcher, investment_advisor],
-    tasks=[risk_analysis_task, analyze_news_task, recommend_investments_task],
+    name="wealth",
+    agents=[investment_advisor],
+    tasks=[recommend_investments_task],
     verbose=1,
     process=Process.sequential
 )
 
+# Coalesces identical wealth advice requests that arrive while one is in flight
+wealth_flight = SingleFlight("wealth_advice")
+stats_collector.register_single_flight(wealth_flight.name, wealth_flight.stats)
+stats_collector.register_llm("wealth", llm)
+
 def _convert_datetime_to_str(obj: Any) -> Any:
     """Recursively convert datetime objects to ISO format strings"""
     if isinstance(obj, datetime):
@@ -221,98 +119,164 @@ def _convert_datetime_to_str(obj: Any) -> Any:
         return [_convert_datetime_to_str(item) for item in obj]
     return obj
 
-async def get_wealth_management_advice(
+# Streaming event names for the wealth crew tasks, in execution order
+WEALTH_TASK_EVENTS = ['recommendations']
+
+def _build_crew_inputs(
     user_profile: UserProfile,
-    market_news: NewsArticleCollection
-) -> WealthManagementResponse:
-    """Get personalized wealth management advice using AI agents"""
-    try:
-        # Convert market news to dict and ensure all datetime objects are strings
-        market_news_dict = _convert_datetime_to_str(market_news.dict())
-        user_data_dict = _convert_datetime_to_str(user_profile.dict())
+    digest: MarketDigest,
+    risk_analysis: RiskAnalysis,
+    asset_allocation: Dict[str, float]
+) -> Dict[str, str]:
+    """Build the wealth crew inputs from the user profile, market digest and local analysis"""
+    user_data_dict = _convert_datetime_to_str(user_profile.dict())
 
-        # Create a new event loop for this call
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
+    return {
+        'user_data': json.dumps(user_data_dict),
+        'market_analysis': json.dumps(digest.analysis.dict()),
+        'risk_analysis': json.dumps(risk_analysis.dict()),
+        'asset_allocation': json.dumps(asset_allocation)
+    }
 
-        # Run the crew with the input parameters
-        result = wealth_crew.kickoff(
-            inputs={
-                'user_data': json.dumps(user_data_dict),
-                'market_news': json.dumps(market_news_dict)
-            }
-        )
+def _request_key(user_profile: UserProfile, digest: MarketDigest) -> str:
+    """Canonical hash of the user profile and the market digest it is advised against"""
+    canonical = json.dumps(
+        {
+            'user_data': _convert_datetime_to_str(user_profile.dict()),
+            'digest_version': digest.version,
+            'news_hash': digest.news_hash
+        },
+        sort_keys=True,
+        separators=(',', ':')
+    )
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
 
-        # Extract the content from CrewOutput
-        if hasattr(result, 'content'):
-            result_content = result.content
+def _parse_wealth_result(
+    result: Any,
+    digest: MarketDigest,
+    risk_analysis: RiskAnalysis,
+    asset_allocation: Dict[str, float],
+    goal_projections: List[GoalProjection]
+) -> WealthManagementResponse:
+    """Convert the wealth crew output to a WealthManagementResponse"""
+    # Extract the content from CrewOutput
+    if hasattr(result, 'content'):
+        result_content = result.content
+    else:
+        result_content = str(result)
+
+    # Parse the JSON content
+    try:
+        recommendations_data = json.loads(result_content)
+    except json.JSONDecodeError:
+        # If parsing fails, try to extract JSON from the string
+        import re
+        json_match = re.search(r'\{.*\}', result_content, re.DOTALL)
+        if json_match:
+            recommendations_data = json.loads(json_match.group())
         else:
-            result_content = str(result)
+            raise ValueError("Could not parse JSON from response")
 
-        # Parse the JSON content
-        try:
-            recommendations_data = json.loads(result_content)
-        except json.JSONDecodeError:
-            # If parsing fails, try to extract JSON from the string
-            import re
-            json_match = re.search(r'\{.*\}', result_content, re.DOTALL)
-            if json_match:
-                recommendations_data = json.loads(json_match.group())
-            else:
-                raise ValueError("Could not parse JSON from response")
+    # Ensure we have the required structure with default values
+    recommendations_data = recommendations_data.get('recommendations', {})
+    if not recommendations_data:
+        recommendations_data = {
+            "specific_recommendations": [
+                {
+                    "type": "equity",
+                    "instrument": "Default Fund",
+                    "allocation": 50,
+                    "reasoning": "Default reasoning"
+                }
+            ]
+        }
 
-        # Ensure we have the required structure with default values
-        risk_analysis_data = recommendations_data.get('risk_analysis', {})
-        if not risk_analysis_data:
-            risk_analysis_data = {
-                "risk_score": 50.0,
-                "risk_category": "Moderate",
-                "key_factors": ["Default risk factor"],
-                "recommendations": ["Default recommendation"]
-            }
+    return WealthManagementResponse(
+        risk_analysis=risk_analysis,
+        market_analysis=digest.analysis,
+        recommendations=InvestmentRecommendation(
+            asset_allocation=asset_allocation,
+            specific_recommendations=recommendations_data.get('specific_recommendations', []),
+            market_news=digest.articles
+        ),
+        goal_projections=goal_projections
+    )
 
-        market_analysis_data = recommendations_data.get('market_analysis', {})
-        if not market_analysis_data:
-            market_analysis_data = {
-                "market_trends": ["Default trend"],
-                "key_insights": ["Default insight"],
-                "impact_analysis": ["Default impact"]
-            }
+async def _run_wealth_crew(
+    user_profile: UserProfile,
+    digest: MarketDigest
+) -> WealthManagementResponse:
+    """Score the profile and allocate locally, then run the wealth crew and parse its output"""
+    risk_analysis = score_risk(user_profile)
+    asset_allocation = optimize_allocation(risk_analysis.risk_score, user_profile.investment_horizon)
 
-        recommendations_data = recommendations_data.get('recommendations', {})
-        if not recommendations_data:
-            recommendations_data = {
-                "asset_allocation": {
-                    "equity": 50,
-                    "debt": 30,
-                    "gold": 10,
-                    "real_estate": 10
-                },
-                "specific_recommendations": [
-                    {
-                        "type": "equity",
-                        "instrument": "Default Fund",
-                        "allocation": 50,
-                        "reasoning": "Default reasoning"
-                    }
-                ]
-            }
+    # Run the crew on the crew worker pool while the goals are simulated in a worker thread
+    result, goal_projections = await asyncio.gather(
+        run_crew(
+            wealth_crew,
+            inputs=_build_crew_inputs(user_profile, digest, risk_analysis, asset_allocation)
+        ),
+        asyncio.to_thread(project_goals, user_profile, asset_allocation)
+    )
+    return _parse_wealth_result(result, digest, risk_analysis, asset_allocation, goal_projections)
+
+async def get_wealth_management_advice(user_profile: UserProfile) -> WealthManagementResponse:
+    """
+    Get personalized wealth management advice using AI agents.
+
+    The market analysis comes from the shared digest of the latest news,
+    so only the recommendations are generated per request.
+    """
+    try:
+        digest = await market_digest.get()
 
-        # Create the response without market news
-        return WealthManagementResponse(
-            risk_analysis=RiskAnalysis(**risk_analysis_data),
-            market_analysis=MarketAnalysis(**market_analysis_data),
-            recommendations=InvestmentRecommendation(
-                asset_allocation=recommendations_data.get('asset_allocation', {}),
-                specific_recommendations=recommendations_data.get('specific_recommendations', []),
-                market_news=[]  # Empty list instead of market_news.articles
-            )
+        # Identical profiles already in flight against the same digest share a single crew run
+        return await wealth_flight.do(
+            _request_key(user_profile, digest),
+            lambda: _run_wealth_crew(user_profile, digest)
         )
     except Exception as e:
         print(f"Error processing wealth management advice: {str(e)}")
         raise
+
+async def stream_wealth_management_advice(user_profile: UserProfile) -> AsyncIterator[Tuple[str, Any]]:
+    """
+    Stream wealth management advice as (event, data) pairs.
+
+    Yields the locally computed risk analysis and the shared market
+    analysis straight away, then the recommendations once the crew task
+    finishes, followed by a final ("result", WealthManagementResponse) pair.
+    Every event carries its value as is, never wrapped in another object.
+    The goals are simulated in a worker thread while the crew runs.
+    """
+    risk_analysis = score_risk(user_profile)
+    asset_allocation = optimize_allocation(risk_analysis.risk_score, user_profile.investment_horizon)
+    goal_projections = asyncio.ensure_future(asyncio.to_thread(project_goals, user_profile, asset_allocation))
+    try:
+        yield "risk_analysis", risk_analysis
+
+        digest = await market_digest.get()
+        yield "market_analysis", digest.analysis
+
+        task_index = 0
+        inputs = _build_crew_inputs(user_profile, digest, risk_analysis, asset_allocation)
+        async for kind, output in stream_crew(wealth_crew, inputs=inputs):
+            if kind == "task":
+                data = parse_crew_json(output)
+                if isinstance(data, dict) and 'recommendations' in data:
+                    data = data['recommendations']
+                yield task_event(WEALTH_TASK_EVENTS, task_index), data
+                task_index += 1
+            else:
+                yield "result", _parse_wealth_result(
+                    output, digest, risk_analysis, asset_allocation, await goal_projections
+                )
     finally:
-        loop.close()
+        goal_projections.cancel()
+
+def get_wealth_coalescing_stats() -> Dict[str, Any]:
+    """Return how many wealth advice requests shared an in-flight crew run"""
+    return wealth_flight.stats()
 
 def get_wealth_advice(
     age: int,
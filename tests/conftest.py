@@ -0,0 +1,35 @@
+import importlib.util
+import os
+import sys
+import tempfile
+import pytest
+
+# Keep tests off real services and the development database
+os.environ.setdefault("GEMINI_API_KEY", "test")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'test.db')}")
+
+# The repository root is the `app` package; import it under that name
+# wherever it is checked out
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if "app" not in sys.modules:
+    spec = importlib.util.spec_from_file_location(
+        "app", os.path.join(ROOT, "__init__.py"), submodule_search_locations=[ROOT]
+    )
+    package = importlib.util.module_from_spec(spec)
+    sys.modules["app"] = package
+    spec.loader.exec_module(package)
+
+@pytest.fixture
+def store(tmp_path):
+    """An ArticleStore on an empty database of its own"""
+    from sqlalchemy import create_engine, text
+    from sqlalchemy.orm import sessionmaker
+    from app.db.models import ARTICLES_FTS_DDL, Base
+    from app.services.article_store import ArticleStore
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'news.db'}")
+    Base.metadata.create_all(engine)
+    with engine.begin() as connection:
+        for statement in ARTICLES_FTS_DDL:
+            connection.execute(text(statement))
+    return ArticleStore(sessionmaker(bind=engine, expire_on_commit=False))
@@ -0,0 +1,66 @@
+import itertools
+import numpy as np
+import pytest
+from app.services.allocation_optimizer import (
+    _mean_variance_weights, load_market_assumptions, optimize_allocation, risk_aversion
+)
+
+def simplex_grid(assets: int, steps: int) -> np.ndarray:
+    """Every long-only weight vector in increments of 1 / steps"""
+    heads = np.array([
+        combination for combination in itertools.product(range(steps + 1), repeat=assets - 1)
+        if sum(combination) <= steps
+    ])
+    return np.column_stack([heads, steps - heads.sum(axis=1)]) / steps
+
+def objective(weights, expected_returns, covariance, aversion):
+    weights = np.atleast_2d(weights)
+    return weights @ expected_returns - aversion / 2 * np.einsum('ij,jk,ik->i', weights, covariance, weights)
+
+@pytest.mark.parametrize("risk_score", [0, 25, 50, 75, 100])
+@pytest.mark.parametrize("horizon", [1, 5, 30])
+def test_beats_brute_force_on_market_assumptions(risk_score, horizon):
+    assumptions = load_market_assumptions()
+    aversion = risk_aversion(risk_score, horizon)
+    grid = simplex_grid(len(assumptions.assets), 100)
+
+    weights = _mean_variance_weights(assumptions.expected_returns, assumptions.covariance, aversion)
+    best = objective(grid, assumptions.expected_returns, assumptions.covariance, aversion).max()
+    assert objective(weights, assumptions.expected_returns, assumptions.covariance, aversion)[0] >= best - 1e-12
+
+def test_beats_brute_force_on_random_markets():
+    rng = np.random.default_rng(0)
+    grid = simplex_grid(4, 40)
+    for _ in range(100):
+        expected_returns = rng.uniform(0.02, 0.15, 4)
+        factors = rng.normal(0, 0.1, (4, 4))
+        covariance = factors @ factors.T + np.eye(4) * 1e-3
+        aversion = rng.uniform(1, 20)
+
+        weights = _mean_variance_weights(expected_returns, covariance, aversion)
+        best = objective(grid, expected_returns, covariance, aversion).max()
+        assert objective(weights, expected_returns, covariance, aversion)[0] >= best - 1e-12
+
+@pytest.mark.parametrize("risk_score", range(0, 101, 5))
+@pytest.mark.parametrize("horizon", [1, 3, 10, 30])
+def test_weights_sum_to_one_within_bounds(risk_score, horizon):
+    assumptions = load_market_assumptions()
+    weights = _mean_variance_weights(
+        assumptions.expected_returns, assumptions.covariance, risk_aversion(risk_score, horizon)
+    )
+    assert weights.sum() == pytest.approx(1)
+    assert ((weights >= 0) & (weights <= 1)).all()
+
+    allocation = optimize_allocation(risk_score, horizon)
+    assert list(allocation) == assumptions.assets
+    assert all(0 <= percent <= 100 for percent in allocation.values())
+    # Each percentage is rounded to 0.1, so the total may be off by the rounding
+    assert sum(allocation.values()) == pytest.approx(100, abs=0.1 * len(allocation))
+
+def test_out_of_range_inputs_are_clamped():
+    assert optimize_allocation(-10, 0) == optimize_allocation(0, 1)
+    assert optimize_allocation(150, 100) == optimize_allocation(100, 30)
+
+def test_higher_risk_scores_hold_more_equity():
+    equity = [optimize_allocation(risk_score, 20)["equity"] for risk_score in range(0, 101, 5)]
+    assert equity == sorted(equity)
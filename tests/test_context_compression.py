@@ -0,0 +1,73 @@
+from app.tools.context_compression import (
+    CHARS_PER_TOKEN, PASSAGE_SEPARATOR, PASSAGE_WORDS, bm25_scores, chunk_passages, compress_results
+)
+
+def words(prefix, count):
+    return ' '.join(f"{prefix}{index}" for index in range(count))
+
+def test_chunk_passages_packs_whole_lines():
+    text = f"{words('a', 3)}\n{words('b', 4)}\n\n{words('c', 5)}"
+    assert chunk_passages(text, words=8) == [f"{words('a', 3)} {words('b', 4)}", words('c', 5)]
+
+def test_chunk_passages_splits_long_lines():
+    text = f"{words('a', 2)}\n{words('b', 7)}\n{words('c', 1)}"
+    b = words('b', 7).split()
+    assert chunk_passages(text, words=3) == [
+        words('a', 2), ' '.join(b[:3]), ' '.join(b[3:6]), f"{b[6]} {words('c', 1)}"
+    ]
+    assert chunk_passages("   \n\n") == []
+
+def test_bm25_prefers_passages_with_rarer_query_terms():
+    scores = bm25_scores("rupee outlook", [
+        "market outlook for the week",
+        "rupee outlook weakens against the dollar",
+        "gold prices steady"
+    ])
+    assert scores[1] > scores[0] > scores[2] == 0
+
+def test_compress_results_respects_the_budget():
+    # One passage per line, all the same length and equally relevant
+    lines = [f"sensex {page}{line} " + words('w', PASSAGE_WORDS - 2) for page in range(3) for line in range(4)]
+    results = [
+        {"url": f"https://news.example/{page}", "content": '\n'.join(lines[page * 4:page * 4 + 4])}
+        for page in range(3)
+    ]
+    passage_chars = len(lines[0])
+    budget = int(passage_chars * 2.5 / CHARS_PER_TOKEN)
+
+    compressed = compress_results("sensex", results, token_budget=budget)
+    kept = sum(result["content"].count("sensex") for result in compressed)
+    assert kept == 2
+    assert kept * passage_chars <= budget * CHARS_PER_TOKEN
+
+def test_irrelevant_pages_are_dropped():
+    results = [
+        {"url": "https://a.example", "content": "The Sensex rose as banks rallied."},
+        {"url": "https://b.example", "content": "A recipe for mango chutney."},
+        {"url": "https://c.example", "error": "Error fetching page. Status code: 404"},
+        {"url": "https://d.example", "content": "Sensex and Nifty closed higher."}
+    ]
+    compressed = compress_results("sensex today", results)
+    assert [result["url"] for result in compressed] == ["https://a.example", "https://c.example", "https://d.example"]
+    assert compressed[1] == results[2]
+
+def test_kept_passages_stay_in_page_order():
+    content = '\n'.join([
+        "sensex opening " + words('x', 40),
+        words('filler', 80),
+        "sensex closing " + words('y', 40)
+    ])
+    compressed = compress_results("sensex", [{"url": "https://a.example", "content": content}])
+    assert compressed[0]["content"].startswith("sensex opening")
+    assert PASSAGE_SEPARATOR + "sensex closing" in compressed[0]["content"]
+    assert "filler0" not in compressed[0]["content"]
+
+def test_falls_back_to_leading_passages_when_nothing_matches():
+    results = [
+        {"url": "https://a.example", "content": "Gold prices eased."},
+        {"url": "https://b.example", "content": "Mango chutney recipe."}
+    ]
+    assert compress_results("sensex", results) == results
+    assert compress_results("sensex", [{"url": "https://a.example", "content": ""}]) == [
+        {"url": "https://a.example", "content": ""}
+    ]
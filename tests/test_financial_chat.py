@@ -0,0 +1,72 @@
+import json
+import pytest
+from app.services import financial_chat_service
+from app.services.financial_chat_service import get_financial_advice, normalize_query
+
+class CountingCrew:
+    """Stands in for the chat crew, counting kickoffs"""
+
+    name = "counting_chat"
+
+    def __init__(self):
+        self.kickoffs = 0
+
+    def copy(self):
+        return self
+
+    def kickoff(self, inputs):
+        self.kickoffs += 1
+        return json.dumps({"advice": {"analysis": f"Answer to {inputs['query']}", "recommendations": []}})
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+@pytest.fixture
+def crew(monkeypatch):
+    crew = CountingCrew()
+    monkeypatch.setattr(financial_chat_service, "chat_crew", crew)
+    financial_chat_service.chat_response_cache.clear()
+    yield crew
+    financial_chat_service.chat_response_cache.clear()
+
+@pytest.mark.parametrize("first, second", [
+    ("What is a SIP?", "what is a sip"),
+    ("Tell me about   index funds!", "index funds"),
+    ("म्यूचुअल फंड क्या है?", "म्यूचुअल  फंड क्या है")
+])
+def test_equivalent_queries_normalize_alike(first, second):
+    assert normalize_query(first) == normalize_query(second)
+
+@pytest.mark.parametrize("first, second", [
+    ("एसआईपी क्या है", "म्यूचुअल फंड"),
+    ("How should I invest?", "Who should invest?"),
+    ("What is a SIP?", "What is an ETF?")
+])
+def test_different_queries_normalize_apart(first, second):
+    assert normalize_query(first) != normalize_query(second)
+
+def test_non_latin_query_keeps_its_words():
+    assert normalize_query("एसआईपी क्या है") == "एसआईपी क्या है"
+
+def test_query_without_words_falls_back_to_folded_text():
+    assert normalize_query("  ???  ") == "???"
+
+@pytest.mark.anyio
+async def test_repeated_question_is_served_from_cache(crew):
+    first = await get_financial_advice("What is a SIP?")
+    second = await get_financial_advice("what is a sip")
+    assert crew.kickoffs == 1
+    assert second == first
+
+@pytest.mark.anyio
+async def test_different_questions_miss_cache(crew):
+    await get_financial_advice("एसआईपी क्या है")
+    await get_financial_advice("म्यूचुअल फंड")
+    assert crew.kickoffs == 2
+
+@pytest.mark.anyio
+async def test_blank_question_is_not_cached(crew):
+    await get_financial_advice("   ")
+    await get_financial_advice("")
+    assert crew.kickoffs == 2
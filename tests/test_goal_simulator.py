@@ -0,0 +1,67 @@
+import pytest
+from app.models.schemas import UserProfile
+from app.services import goal_simulator
+from app.services.goal_simulator import PERCENTILES, project_goals, simulate_goals
+
+ALLOCATION = {"equity": 60, "debt": 40}
+
+def profile(goal_count=2):
+    return UserProfile(
+        age=30,
+        income=1200000,
+        dependents=1,
+        investment_horizon=15,
+        existing_investments=[{"type": "equity", "amount": 500000}],
+        risk_tolerance="moderate",
+        goals=[
+            {"type": f"goal{index}", "target_amount": 1000000 * (index + 1), "timeline": 5 + index}
+            for index in range(goal_count)
+        ]
+    )
+
+def test_seeded_runs_are_deterministic():
+    first = simulate_goals(profile(), ALLOCATION, paths=2000, seed=7)
+    second = simulate_goals(profile(), ALLOCATION, paths=2000, seed=7)
+    assert first == second
+    assert first != simulate_goals(profile(), ALLOCATION, paths=2000, seed=8)
+
+def test_chunking_does_not_change_results(monkeypatch):
+    whole = simulate_goals(profile(), ALLOCATION, paths=2000, seed=7)
+    monkeypatch.setattr(goal_simulator, "GOAL_SIM_CHUNK_CELLS", 100)
+    assert simulate_goals(profile(), ALLOCATION, paths=2000, seed=7) == whole
+
+def test_output_shape():
+    response = simulate_goals(profile(3), ALLOCATION, paths=1000, seed=1)
+    assert response.paths == 1000
+    assert [goal.type for goal in response.goals] == ["goal0", "goal1", "goal2"]
+    for goal in response.goals:
+        assert 0 <= goal.success_probability <= 1
+        assert list(goal.percentiles) == [f"p{percentile}" for percentile in PERCENTILES]
+        values = list(goal.percentiles.values())
+        assert values == sorted(values)
+
+def test_no_goals():
+    response = simulate_goals(profile(0), ALLOCATION, paths=1000, seed=1)
+    assert response.goals == []
+
+def test_rejects_more_outcomes_than_the_cap(monkeypatch):
+    monkeypatch.setattr(goal_simulator, "GOAL_SIM_MAX_OUTCOMES", 5000)
+    with pytest.raises(ValueError, match="at most 2 allowed"):
+        simulate_goals(profile(3), ALLOCATION, paths=2000)
+
+def test_advice_projections_use_fewer_paths_under_the_cap(monkeypatch):
+    monkeypatch.setattr(goal_simulator, "GOAL_SIM_MAX_OUTCOMES", 3000)
+    calls = []
+    original = goal_simulator.simulate_goals
+    def counting(user_profile, asset_allocation, paths):
+        calls.append(paths)
+        return original(user_profile, asset_allocation, paths=paths)
+    monkeypatch.setattr(goal_simulator, "simulate_goals", counting)
+
+    projections = project_goals(profile(3), ALLOCATION)
+    assert calls == [1000]
+    assert len(projections) == 3
+
+def test_advice_projections_skipped_past_the_cap(monkeypatch):
+    monkeypatch.setattr(goal_simulator, "GOAL_SIM_MAX_OUTCOMES", 250)
+    assert project_goals(profile(3), ALLOCATION) == []
@@ -0,0 +1,66 @@
+import json
+import os
+import pytest
+from app.tools import html_parser
+from app.tools.html_parser import extract_main_text, parse_listing, parse_search_result_links
+from app.tools.news_pipeline import load_news_sources
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures", "html")
+
+# Where each fixture page came from and what the parsers extract from it
+with open(os.path.join(FIXTURES_DIR, "manifest.json"), encoding="utf-8") as f:
+    MANIFEST = json.load(f)
+
+def read_fixture(name):
+    with open(os.path.join(FIXTURES_DIR, name), encoding="utf-8") as f:
+        return f.read()
+
+@pytest.fixture(params=["html.parser", "lxml"])
+def backend(request, monkeypatch):
+    if request.param == "lxml":
+        pytest.importorskip("lxml")
+    monkeypatch.setattr(html_parser, "HTML_PARSER", request.param)
+    return request.param
+
+@pytest.fixture
+def sources():
+    return {source.name: source for source in load_news_sources()}
+
+@pytest.mark.parametrize("name, fixture", [
+    ("Moneycontrol", "moneycontrol_listing.html"),
+    ("Economic Times", "economictimes_listing.html")
+])
+def test_parse_listing(backend, sources, name, fixture):
+    source = sources[name]
+    articles = parse_listing(read_fixture(fixture), source.model_dump())
+    assert len(articles) == MANIFEST[fixture]["items"]
+    for article in articles:
+        assert article["title"] and article["summary"]
+        assert "/news/" in article["link"] or "/articleshow/" in article["link"]
+        assert source.published_time(article["published"]) is not None
+
+def test_parse_search_result_links(backend):
+    links = parse_search_result_links(read_fixture("duckduckgo_results.html"), 10)
+    assert len(links) == min(10, MANIFEST["duckduckgo_results.html"]["items"])
+    assert all(link.startswith("https://") for link in links)
+
+def test_extract_main_text_drops_page_chrome(backend):
+    text = extract_main_text(read_fixture("article_page.html"))
+    expected = MANIFEST["article_page.html"]
+    for phrase in expected["contains"]:
+        assert phrase in text
+    for phrase in expected["excludes"]:
+        assert phrase not in text
+
+def test_backends_agree(sources):
+    pytest.importorskip("lxml")
+    html = read_fixture("moneycontrol_listing.html")
+    source = sources["Moneycontrol"].model_dump()
+    outputs = []
+    for backend in ("html.parser", "lxml"):
+        html_parser.HTML_PARSER, previous = backend, html_parser.HTML_PARSER
+        try:
+            outputs.append(parse_listing(html, source))
+        finally:
+            html_parser.HTML_PARSER = previous
+    assert outputs[0] == outputs[1]
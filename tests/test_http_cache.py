@@ -0,0 +1,90 @@
+from contextlib import asynccontextmanager
+import pytest
+from app.services.cache import DiskCache
+from app.tools.http_cache import HttpCache
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+URL = "https://news.example/markets"
+
+class FakeResponse:
+    def __init__(self, status, body=None, headers=None):
+        self.status = status
+        self.body = body
+        self.headers = headers or {}
+
+    async def text(self):
+        return self.body
+
+class FakeClient:
+    """Serves queued responses and records the headers of each request"""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.requests = []
+
+    @asynccontextmanager
+    async def get(self, url, headers=None):
+        self.requests.append(headers)
+        yield self.responses.pop(0)
+
+@pytest.fixture
+def disk(tmp_path):
+    return DiskCache(str(tmp_path), 1024 * 1024)
+
+@pytest.mark.anyio
+async def test_not_modified_reuses_the_cached_body(disk):
+    client = FakeClient(
+        FakeResponse(200, "<html>v1</html>", {"ETag": '"v1"', "Last-Modified": "Sat, 17 Oct 2026 10:00:00 GMT"}),
+        FakeResponse(304)
+    )
+    cache = HttpCache(disk, client)
+
+    first = await cache.get(URL)
+    second = await cache.get(URL)
+
+    assert (first.status, first.text, first.changed) == (200, "<html>v1</html>", True)
+    assert (second.status, second.text, second.changed) == (304, "<html>v1</html>", False)
+    assert cache.stats()["downloaded"] == 1
+    assert cache.stats()["not_modified"] == 1
+
+@pytest.mark.anyio
+async def test_sends_stored_validators(disk):
+    client = FakeClient(
+        FakeResponse(200, "v1", {"ETag": '"v1"', "Last-Modified": "Sat, 17 Oct 2026 10:00:00 GMT"}),
+        FakeResponse(200, "v2", {"ETag": '"v2"'}),
+        FakeResponse(304)
+    )
+    cache = HttpCache(disk, client)
+
+    await cache.get(URL, headers={"User-Agent": "test"})
+    await cache.get(URL)
+    third = await cache.get(URL)
+
+    assert client.requests[0] == {"User-Agent": "test"}
+    assert client.requests[1] == {
+        "If-None-Match": '"v1"',
+        "If-Modified-Since": "Sat, 17 Oct 2026 10:00:00 GMT"
+    }
+    # The second response replaced the validators, dropping Last-Modified
+    assert client.requests[2] == {"If-None-Match": '"v2"'}
+    assert third.text == "v2"
+
+@pytest.mark.anyio
+async def test_identical_body_without_validators_is_unchanged(disk):
+    client = FakeClient(FakeResponse(200, "same"), FakeResponse(200, "same"), FakeResponse(200, "new"))
+    cache = HttpCache(disk, client)
+
+    assert (await cache.get(URL)).changed
+    assert not (await cache.get(URL)).changed
+    assert (await cache.get(URL)).changed
+    assert client.requests == [{}, {}, {}]
+    assert cache.stats()["unchanged"] == 1
+
+@pytest.mark.anyio
+async def test_no_body_without_a_cached_copy_or_on_errors(disk):
+    cache = HttpCache(disk, FakeClient(FakeResponse(304), FakeResponse(500)))
+    assert await cache.get(URL) == (304, None, False)
+    assert await cache.get(URL) == (500, None, False)
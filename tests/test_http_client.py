@@ -0,0 +1,98 @@
+import asyncio
+import pytest
+from aiohttp import web
+from app.tools import http_client as http_client_module
+from app.tools.http_client import HostRateLimiter, HttpClient, TokenBucket
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def monotonic(self):
+        return self.now
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(http_client_module, "time", clock)
+    return clock
+
+def test_bucket_allows_a_burst_then_paces_at_the_rate(clock):
+    bucket = TokenBucket(rate=10, capacity=2)
+    delays = [bucket.reserve() for _ in range(5)]
+    assert delays == pytest.approx([0, 0, 0.1, 0.2, 0.3])
+
+def test_bucket_refills_over_time_up_to_capacity(clock):
+    bucket = TokenBucket(rate=10, capacity=2)
+    for _ in range(2):
+        bucket.reserve()
+
+    clock.now += 0.1
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == pytest.approx(0.1)
+
+    clock.now += 60
+    delays = [bucket.reserve() for _ in range(3)]
+    assert delays == pytest.approx([0, 0, 0.1])
+
+def test_rate_limits_each_host_separately(clock):
+    limiter = HostRateLimiter(rate=1, burst=1)
+    assert limiter.bucket("https://a.example/x") is limiter.bucket("https://A.example/y")
+    assert limiter.bucket("https://a.example/x").reserve() == 0
+    assert limiter.bucket("https://b.example/x").reserve() == 0
+    assert limiter.bucket("https://a.example/z").reserve() == pytest.approx(1)
+
+@pytest.fixture
+async def server():
+    peers = []
+
+    async def handler(request):
+        peers.append(request.transport.get_extra_info("peername"))
+        return web.Response(text="ok")
+
+    app = web.Application()
+    app.router.add_get("/", handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    yield f"http://127.0.0.1:{port}/", peers
+    await runner.cleanup()
+
+@pytest.mark.anyio
+async def test_requests_reuse_pooled_connections(server):
+    url, peers = server
+    client = HttpClient(HostRateLimiter(rate=1000, burst=1000))
+    client.start()
+    session = client.session
+    try:
+        for _ in range(3):
+            async with client.get(url) as response:
+                assert await response.text() == "ok"
+        assert client.session is session
+    finally:
+        await client.close()
+
+    # Every request went over the same kept-alive connection
+    assert len(peers) == 3
+    assert len(set(peers)) == 1
+
+@pytest.mark.anyio
+async def test_requests_wait_for_the_host_rate_limit(server):
+    url, _ = server
+    client = HttpClient(HostRateLimiter(rate=20, burst=1))
+    loop = asyncio.get_running_loop()
+    try:
+        started = loop.time()
+        for _ in range(3):
+            async with client.get(url) as response:
+                await response.read()
+        elapsed = loop.time() - started
+    finally:
+        await client.close()
+    assert elapsed >= 0.09
@@ -0,0 +1,89 @@
+import asyncio
+from datetime import timedelta
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app
+from app.models.schemas import JobStatus
+from app.services.job_store import JobStore, JobStoreFullError
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+async def finished(value="done"):
+    return value
+
+async def wait_for(job):
+    await asyncio.gather(job.task, return_exceptions=True)
+    return job
+
+@pytest.mark.anyio
+async def test_completed_job_keeps_its_result():
+    store = JobStore()
+    job = await wait_for(store.submit("test", finished))
+    assert store.get(job.id).status == JobStatus.COMPLETED
+    assert job.result == "done"
+
+@pytest.mark.anyio
+async def test_failed_job_records_the_error():
+    async def failing():
+        raise RuntimeError("crew failed")
+    store = JobStore()
+    job = await wait_for(store.submit("test", failing))
+    assert job.status == JobStatus.FAILED
+    assert job.error == "crew failed"
+
+@pytest.mark.anyio
+async def test_finished_jobs_expire_after_the_ttl():
+    store = JobStore()
+    job = await wait_for(store.submit("test", finished))
+
+    job.finished_at -= timedelta(days=1)
+    assert store.get(job.id) is None
+    assert job.id not in store._jobs
+
+@pytest.mark.anyio
+async def test_running_jobs_do_not_expire():
+    store = JobStore()
+    job = store.submit("test", asyncio.Event().wait)
+    await asyncio.sleep(0)
+    job.created_at -= timedelta(days=1)
+    assert store.get(job.id) is job
+    await store.shutdown()
+
+@pytest.mark.anyio
+async def test_oldest_finished_job_evicted_when_full():
+    store = JobStore(max_jobs=2)
+    first = await wait_for(store.submit("test", finished))
+    second = await wait_for(store.submit("test", finished))
+    third = store.submit("test", finished)
+
+    assert store.get(first.id) is None
+    assert store.get(second.id) is second
+    assert store.get(third.id) is third
+    await wait_for(third)
+
+@pytest.mark.anyio
+async def test_full_of_running_jobs_rejects_new_ones():
+    store = JobStore(max_jobs=2)
+    for _ in range(2):
+        store.submit("test", asyncio.Event().wait)
+    with pytest.raises(JobStoreFullError):
+        store.submit("test", finished)
+    await store.shutdown()
+
+@pytest.mark.anyio
+async def test_cancelled_job_is_marked_failed():
+    store = JobStore()
+    job = store.submit("test", asyncio.Event().wait)
+    await asyncio.sleep(0)
+
+    await store.shutdown()
+    assert job.status == JobStatus.FAILED
+    assert job.error == "Job was cancelled"
+    assert job.finished_at is not None
+
+def test_unknown_job_is_404():
+    response = TestClient(app).get("/api/jobs/unknown")
+    assert response.status_code == 404
+    assert response.json()["detail"] == "Job unknown not found"
@@ -0,0 +1,68 @@
+import json
+import pytest
+from app.models.schemas import NewsArticle, NewsArticleCollection
+from app.services import market_digest as market_digest_module
+from app.services.market_digest import EMPTY_DIGEST, MarketDigestBuilder
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+NEWS = NewsArticleCollection(articles=[NewsArticle(
+    title="Sensex rises",
+    summary="Markets up",
+    url="https://news.example/1",
+    publishedAt="2026-10-18T10:00:00",
+    source="Example"
+)])
+
+ANALYSIS = {"market_trends": ["up"], "key_insights": ["rates"], "impact_analysis": ["equity"]}
+
+class FlakyLLM:
+    """LLM that fails until told to succeed, counting calls"""
+
+    def __init__(self):
+        self.calls = 0
+        self.fail = True
+
+    def call(self, prompt):
+        self.calls += 1
+        if self.fail:
+            raise RuntimeError("quota exceeded")
+        return json.dumps({"market_analysis": ANALYSIS})
+
+@pytest.fixture
+def llm(monkeypatch):
+    async def load_recent_news():
+        return NEWS
+    monkeypatch.setattr(market_digest_module, "load_recent_news", load_recent_news)
+    return FlakyLLM()
+
+@pytest.mark.anyio
+async def test_cold_start_failure_is_not_retried_on_every_request(llm):
+    builder = MarketDigestBuilder(llm)
+    for _ in range(5):
+        assert await builder.get() == EMPTY_DIGEST
+    assert llm.calls == 1
+    assert builder.stats()["failures"] == 1
+
+@pytest.mark.anyio
+async def test_same_news_not_rebuilt_while_backing_off(llm):
+    builder = MarketDigestBuilder(llm)
+    await builder.refresh(NEWS)
+    await builder.refresh(NEWS)
+    assert llm.calls == 1
+
+@pytest.mark.anyio
+async def test_build_retried_after_backoff(llm):
+    builder = MarketDigestBuilder(llm)
+    await builder.get()
+
+    builder.last_failure -= market_digest_module.MARKET_DIGEST_RETRY
+    llm.fail = False
+    digest = await builder.get()
+
+    assert llm.calls == 2
+    assert digest.version == 1
+    assert digest.analysis.dict() == ANALYSIS
+    assert not builder.backing_off
@@ -0,0 +1,73 @@
+import pytest
+from crewai.types.usage_metrics import UsageMetrics
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+from app.main import app
+from app.services.crew_executor import run_crew
+from app.services.metrics import stats_collector
+
+class StubLLM:
+    """Keeps lifetime token usage like a crewai LLM instance"""
+
+    def __init__(self):
+        self.usage = UsageMetrics()
+
+    def get_token_usage_summary(self):
+        return self.usage.model_copy()
+
+class StubCrew:
+    """Uses 100 prompt and 20 completion tokens per kickoff through a shared LLM"""
+
+    name = "stub_crew"
+
+    def __init__(self, llm):
+        self.llm = llm
+        self.task_callback = None
+
+    def copy(self):
+        # Copies share the LLM instance, as crewai's do
+        return StubCrew(self.llm)
+
+    def kickoff(self, inputs):
+        self.llm.usage.add_usage_metrics(UsageMetrics(
+            prompt_tokens=100, completion_tokens=20, total_tokens=120, successful_requests=1
+        ))
+        # Like CrewOutput.token_usage, report the LLM's lifetime usage
+        return type("CrewOutput", (), {"raw": "{}", "token_usage": self.llm.get_token_usage_summary()})()
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+@pytest.fixture
+def stub_llm(monkeypatch):
+    llm = StubLLM()
+    monkeypatch.setattr(stats_collector, "_llms", stats_collector._llms + [("stub_crew", llm)])
+    return llm
+
+def sample(name, labels):
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+@pytest.mark.anyio
+async def test_tokens_counted_once_across_kickoffs(stub_llm):
+    kickoffs_before = sample("crew_kickoff_duration_seconds_count", {"crew": "stub_crew", "status": "success"})
+    crew = StubCrew(stub_llm)
+    await run_crew(crew, inputs={})
+    await run_crew(crew, inputs={})
+
+    assert sample("llm_tokens_total", {"llm": "stub_crew", "type": "prompt"}) == 200
+    assert sample("llm_tokens_total", {"llm": "stub_crew", "type": "completion"}) == 40
+    assert sample("llm_requests_total", {"llm": "stub_crew"}) == 2
+    # CrewOutput.token_usage is cumulative, so it must not be added up per kickoff
+    assert REGISTRY.get_sample_value("crew_llm_tokens_total", {"crew": "stub_crew", "type": "prompt"}) is None
+    assert sample("crew_kickoff_duration_seconds_count", {"crew": "stub_crew", "status": "success"}) == kickoffs_before + 2
+
+def test_requests_labelled_by_route_template():
+    client = TestClient(app)
+    client.get("/api/jobs/first")
+    client.get("/api/jobs/second")
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert 'route="/api/jobs/{job_id}"' in response.text
+    assert "/api/jobs/first" not in response.text
@@ -0,0 +1,18 @@
+from app.services.near_duplicates import NEAR_DUPLICATE_THRESHOLD, minhash_signature, similarity
+from app.services.text_normalization import fold_text
+
+def test_fold_text_keeps_devanagari_vowel_signs():
+    assert fold_text("म्यूचुअल फंड, क्या है?") == "म्यूचुअल फंड क्या है"
+
+def test_fold_text_ascii():
+    assert fold_text("  Sensex_jumps 2.5%!  ") == "sensex jumps 2 5"
+
+def test_hindi_stories_are_told_apart():
+    first = minhash_signature("सेंसेक्स 500 अंक उछला, आईटी शेयरों में तेजी")
+    second = minhash_signature("रिजर्व बैंक ने रेपो दर को स्थिर रखा")
+    same = minhash_signature("सेंसेक्स 500 अंक उछला, आईटी शेयरों में तेजी!")
+    assert similarity(first, second) < NEAR_DUPLICATE_THRESHOLD
+    assert similarity(first, same) == 1.0
+
+def test_text_without_words_has_no_signature():
+    assert minhash_signature("!!! — ???") is None
@@ -0,0 +1,32 @@
+import pytest
+from app.models.schemas import NewsArticle
+from app.tools.news_fetcher import IndianFinanceNewsTools, NEWS_TOOL_LIMIT
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+ARTICLE = NewsArticle(
+    title="Sensex rises",
+    summary="Markets up",
+    url="https://news.example/1",
+    publishedAt="2026-10-18T10:00:00",
+    source="Example"
+)
+
+class RecordingStore:
+    def __init__(self):
+        self.limits = []
+
+    def recent_articles(self, limit):
+        self.limits.append(limit)
+        return [ARTICLE]
+
+@pytest.mark.anyio
+async def test_reads_recent_articles_from_the_store():
+    store = RecordingStore()
+
+    articles = await IndianFinanceNewsTools(store).combine_news_sources()
+
+    assert articles == [ARTICLE.dict()]
+    assert store.limits == [NEWS_TOOL_LIMIT]
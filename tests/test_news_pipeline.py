@@ -0,0 +1,166 @@
+import pytest
+from app.tools import html_parser
+from app.tools import news_pipeline as news_pipeline_module
+from app.tools.http_cache import FetchResult
+from app.tools.news_pipeline import NewsPipeline, NewsSource
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+SOURCE = NewsSource(
+    name="Example",
+    url="https://news.example/markets/",
+    page_url="https://news.example/markets/page-{page}/",
+    pages=3,
+    article_selector="li.story",
+    title_selector="h2 a",
+    summary_selector="p",
+    published_selector="time",
+    published_attribute="datetime",
+    timezone="UTC"
+)
+
+def listing(*stories):
+    """Listing page HTML for (link, title, published) stories"""
+    items = ''.join(
+        f'<li class="story"><h2><a href="{link}">{title}</a></h2>'
+        f'<p>{title} summary</p><time datetime="{published}"></time></li>'
+        for link, title, published in stories
+    )
+    return f"<html><body><ul>{items}</ul></body></html>"
+
+def local(published):
+    """A UTC listing time as the naive local time articles are stored with"""
+    return SOURCE.published_time(published)
+
+class FakePages:
+    """Scraper cache serving canned listing pages, recording the URLs fetched"""
+
+    def __init__(self, pages):
+        self.pages = pages
+        self.requested = []
+
+    async def get(self, url, headers=None):
+        self.requested.append(url)
+        page = self.pages[url]
+        if isinstance(page, str):
+            return FetchResult(200, page, True)
+        return page
+
+@pytest.fixture
+def pipeline(store, monkeypatch):
+    monkeypatch.setattr(news_pipeline_module, "article_store", store)
+    # Parse in threads; a worker process pool is not needed here
+    monkeypatch.setattr(html_parser, "HTML_PARSER_WORKERS", 0)
+    monkeypatch.setattr(html_parser, "_executor", None)
+    return NewsPipeline([SOURCE])
+
+def serve(monkeypatch, pages):
+    fake = FakePages(pages)
+    monkeypatch.setattr(news_pipeline_module, "scraper_http_cache", fake)
+    return fake
+
+@pytest.mark.anyio
+async def test_ingest_runs_every_stage_and_records_stats(pipeline, store, monkeypatch):
+    serve(monkeypatch, {
+        "https://news.example/markets/": listing(
+            ("/news/sensex-record", "Sensex hits record high", "2026-10-18T09:00:00Z"),
+            ("https://news.example/news/rupee-slides", "Rupee slides   against\n dollar", "2026-10-18T08:00:00Z"),
+            ("javascript:void(0)", "Not a link", "2026-10-18T07:00:00Z")
+        ),
+        "https://news.example/markets/page-2/": listing(
+            # Also on the first page, and only yielded once
+            ("/news/sensex-record", "Sensex hits record high", "2026-10-18T09:00:00Z"),
+            ("/news/gold-steady", "Gold holds steady", "2026-10-17T12:00:00Z")
+        ),
+        "https://news.example/markets/page-3/": FetchResult(304, "<html></html>", False)
+    })
+
+    assert await pipeline.ingest() == 3
+
+    urls = {
+        "https://news.example/news/sensex-record",
+        "https://news.example/news/rupee-slides",
+        "https://news.example/news/gold-steady"
+    }
+    assert store.known_urls(urls | {"javascript:void(0)"}) == urls
+    titles = {article.title for article in store.recent_articles()}
+    assert "Rupee slides against dollar" in titles
+
+    stats = pipeline.stats()["Example"]
+    assert stats["pages_fetched"] == 2
+    assert stats["pages_unchanged"] == 1
+    assert stats["pages_failed"] == 0
+    assert stats["articles_parsed"] == 5
+    assert stats["articles_new"] == 3
+    assert stats["articles_older"] == 0
+    assert stats["completed"] and not stats["stopped_early"]
+    assert stats["newest_published"] == local("2026-10-18T09:00:00Z").isoformat()
+    assert store.watermark("Example") == local("2026-10-18T09:00:00Z")
+
+@pytest.mark.anyio
+async def test_failed_page_keeps_the_watermark(pipeline, store, monkeypatch):
+    serve(monkeypatch, {
+        "https://news.example/markets/": listing(("/news/a", "Markets open higher", "2026-10-18T09:00:00Z")),
+        "https://news.example/markets/page-2/": FetchResult(503, None, False),
+        "https://news.example/markets/page-3/": FetchResult(304, "<html></html>", False)
+    })
+
+    assert await pipeline.ingest() == 1
+    stats = pipeline.stats()["Example"]
+    assert stats["pages_failed"] == 1
+    assert stats["completed"]
+    # The failed page may hold articles that were never stored
+    assert store.watermark("Example") is None
+
+@pytest.mark.anyio
+async def test_stream_without_new_only_yields_stored_articles(pipeline, store, monkeypatch):
+    page = listing(("/news/a", "Markets open higher", "2026-10-18T09:00:00Z"))
+    serve(monkeypatch, {
+        "https://news.example/markets/": page,
+        "https://news.example/markets/page-2/": FetchResult(304, page, False),
+        "https://news.example/markets/page-3/": FetchResult(304, page, False)
+    })
+    await pipeline.ingest()
+
+    assert [article async for article in pipeline.stream()] == []
+    assert [article.url async for article in pipeline.stream(new_only=False)] == ["https://news.example/news/a"]
+
+@pytest.mark.anyio
+async def test_ingest_stops_at_the_stored_watermark(pipeline, store, monkeypatch):
+    store.advance_watermarks({"Example": local("2026-10-18T06:00:00Z")})
+    fake = serve(monkeypatch, {
+        "https://news.example/markets/": listing(
+            ("/news/new", "Fresh rally in banks", "2026-10-18T09:00:00Z"),
+            ("/news/stale", "Yesterday's close", "2026-10-17T15:00:00Z")
+        ),
+        "https://news.example/markets/page-2/": listing(
+            ("/news/old-1", "Last week's outlook", "2026-10-12T10:00:00Z"),
+            ("/news/old-2", "Earnings season preview", "2026-10-11T10:00:00Z")
+        ),
+        # Listings are newest first, so nothing past the stop is read; these
+        # are dated after the watermark to show they are never ingested
+        "https://news.example/markets/page-3/": listing(
+            ("/news/never-read", "Never read", "2026-10-18T10:00:00Z")
+        )
+    })
+
+    assert await pipeline.ingest() == 1
+    assert store.known_urls([
+        "https://news.example/news/new",
+        "https://news.example/news/stale",
+        "https://news.example/news/old-1",
+        "https://news.example/news/never-read"
+    ]) == {"https://news.example/news/new"}
+
+    stats = pipeline.stats()["Example"]
+    assert stats["watermark"] == local("2026-10-18T06:00:00Z").isoformat()
+    assert stats["articles_older"] == 3
+    assert stats["stopped_early"]
+    assert store.watermark("Example") == local("2026-10-18T09:00:00Z")
+    assert fake.requested[:2] == ["https://news.example/markets/", "https://news.example/markets/page-2/"]
+
+    # With the watermark advanced, the same listing stops on its first page
+    assert await pipeline.ingest() == 0
+    assert pipeline.stats()["Example"]["stopped_early"]
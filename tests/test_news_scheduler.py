@@ -0,0 +1,70 @@
+from datetime import timedelta
+import pytest
+from app.models.schemas import NewsArticle, NewsArticleCollection
+from app.services import news_scheduler as news_scheduler_module
+from app.services.news_scheduler import NewsScheduler
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+COLLECTION = NewsArticleCollection(articles=[NewsArticle(
+    title="Sensex rises",
+    summary="Markets up",
+    url="https://news.example/1",
+    publishedAt="2026-10-18T10:00:00",
+    source="Example"
+)])
+
+class FlakyFetch:
+    """Fetch that fails until told to succeed, counting calls"""
+
+    def __init__(self):
+        self.calls = 0
+        self.fail = True
+
+    async def __call__(self):
+        self.calls += 1
+        if self.fail:
+            raise RuntimeError("source down")
+        return COLLECTION
+
+@pytest.mark.anyio
+async def test_failed_refresh_is_not_retried_on_every_request(monkeypatch):
+    monkeypatch.setattr(news_scheduler_module, "NEWS_COLD_START_TIMEOUT", 1)
+    fetch = FlakyFetch()
+    scheduler = NewsScheduler(fetch)
+
+    for _ in range(5):
+        assert (await scheduler.get_latest()).articles == []
+    assert fetch.calls == 1
+    assert scheduler.backing_off
+    assert not scheduler.is_stale
+
+@pytest.mark.anyio
+async def test_retry_delay_doubles_up_to_the_interval(monkeypatch):
+    monkeypatch.setattr(news_scheduler_module, "NEWS_REFRESH_RETRY", timedelta(seconds=30))
+    scheduler = NewsScheduler(FlakyFetch(), interval=timedelta(seconds=100))
+
+    delays = []
+    for _ in range(4):
+        await scheduler.refresh()
+        delays.append(scheduler.retry_delay.total_seconds())
+    assert delays == [30, 60, 100, 100]
+
+@pytest.mark.anyio
+async def test_refresh_retried_after_backoff_and_success_resets(monkeypatch):
+    fetch = FlakyFetch()
+    scheduler = NewsScheduler(fetch)
+    await scheduler.refresh()
+
+    # Once the backoff has passed the next request refreshes again
+    scheduler.last_failure -= scheduler.retry_delay
+    assert scheduler.is_stale
+    fetch.fail = False
+    await scheduler.refresh()
+
+    assert fetch.calls == 2
+    assert scheduler.consecutive_failures == 0
+    assert not scheduler.backing_off
+    assert (await scheduler.get_latest()).articles == COLLECTION.articles
@@ -0,0 +1,69 @@
+import random
+import pytest
+from app.models.schemas import NewsArticle
+from app.services import article_store as article_store_module
+
+FILLER = [f"filler{index}" for index in range(400)]
+
+def article(number, title, summary=""):
+    # Distinct filler words keep articles from being linked as near-duplicates
+    words = random.Random(number).sample(FILLER, 12)
+    return NewsArticle(
+        title=f"{title} {' '.join(words[:4])}",
+        summary=f"{summary} {' '.join(words[4:])}",
+        url=f"https://news.example/{number}",
+        publishedAt="2026-10-18T10:00:00",
+        source="Example"
+    )
+
+def search_all(store, query, page_size):
+    """Every result over all pages, checking has_more on each"""
+    results, page = [], 1
+    while True:
+        articles, has_more = store.search(query, page=page, page_size=page_size)
+        results += [found.url for found in articles]
+        if not has_more:
+            return results
+        assert len(articles) == page_size
+        page += 1
+
+def test_old_relevant_article_ranks_first_when_all_matches_fit(store):
+    store.upsert_articles([article(0, "Gold gold record", "gold demand")])
+    store.upsert_articles([article(number, "Markets wrap", "gold steady") for number in range(1, 40)])
+
+    articles, has_more = store.search("gold", page_size=10)
+    assert articles[0].url == "https://news.example/0"
+    assert has_more
+
+def test_pages_past_the_window_reach_every_match(store, monkeypatch):
+    monkeypatch.setattr(article_store_module, "NEWS_SEARCH_WINDOW", 5)
+    store.upsert_articles([article(number, "Sensex update", "sensex") for number in range(23)])
+
+    results = search_all(store, "sensex", page_size=4)
+    assert len(results) == 23
+    assert len(set(results)) == 23
+    # Past the ranked window, older matches follow newest first
+    assert results[5:] == [f"https://news.example/{number}" for number in range(17, -1, -1)]
+
+def test_window_is_ranked_by_relevance(store, monkeypatch):
+    monkeypatch.setattr(article_store_module, "NEWS_SEARCH_WINDOW", 5)
+    store.upsert_articles([article(number, "Update", "rupee") for number in range(10)])
+    store.upsert_articles([article(10, "Rupee rupee slides", "rupee")])
+    store.upsert_articles([article(number, "Update", "rupee") for number in range(11, 14)])
+
+    articles, _ = store.search("rupee", page_size=3)
+    assert articles[0].url == "https://news.example/10"
+
+def test_has_more_is_exact_at_the_end(store, monkeypatch):
+    monkeypatch.setattr(article_store_module, "NEWS_SEARCH_WINDOW", 5)
+    store.upsert_articles([article(number, "Nifty", "nifty") for number in range(10)])
+
+    assert store.search("nifty", page=1, page_size=5)[1] is True
+    articles, has_more = store.search("nifty", page=2, page_size=5)
+    assert len(articles) == 5 and not has_more
+    assert store.search("nifty", page=3, page_size=5) == ([], False)
+
+def test_no_match(store):
+    store.upsert_articles([article(0, "Nifty", "nifty")])
+    assert store.search("zebra") == ([], False)
+    assert store.search("   ") == ([], False)
@@ -0,0 +1,82 @@
+import json
+import re
+import pytest
+from app.models.schemas import NewsArticle
+from app.services.news_summaries import ArticleSummarizer
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+ARTICLES = [
+    NewsArticle(
+        title=title,
+        summary=f"{title} scraped summary",
+        url=f"https://news.example/{index}",
+        publishedAt="2026-10-18T10:00:00",
+        source="Example"
+    )
+    for index, title in enumerate(["Sensex hits record high", "Rupee slides against dollar"])
+]
+
+class CountingLLM:
+    """Summarizes every article in the prompt, counting calls"""
+
+    def __init__(self):
+        self.calls = 0
+        self.fail = False
+
+    def call(self, prompt):
+        self.calls += 1
+        if self.fail:
+            raise RuntimeError("quota exceeded")
+        articles = re.findall(r"^\[(\d+)\] (.+)$", prompt, re.MULTILINE)
+        return json.dumps([{"id": int(index), "summary": f"LLM: {title}"} for index, title in articles])
+
+@pytest.fixture
+def llm():
+    return CountingLLM()
+
+@pytest.fixture
+def summarizer(llm, store):
+    return ArticleSummarizer(llm, store._session_factory)
+
+@pytest.mark.anyio
+async def test_summary_served_from_the_cache(summarizer, llm):
+    first = await summarizer.summarize(ARTICLES)
+    assert llm.calls == 1
+    assert [summary.summary for summary in first] == [
+        "LLM: Sensex hits record high", "LLM: Rupee slides against dollar"
+    ]
+
+    second = await summarizer.summarize(ARTICLES)
+    assert llm.calls == 1
+    assert second == first
+    assert summarizer.stats()["hits"] == 2
+    assert summarizer.stats()["misses"] == 2
+
+@pytest.mark.anyio
+async def test_stored_summaries_survive_a_restart(summarizer, llm, store):
+    await summarizer.summarize(ARTICLES)
+    restarted = ArticleSummarizer(llm, store._session_factory)
+    summaries = await restarted.summarize(ARTICLES)
+    assert llm.calls == 1
+    assert summaries[0].summary == "LLM: Sensex hits record high"
+
+@pytest.mark.anyio
+async def test_changed_content_is_summarized_again(summarizer, llm):
+    await summarizer.summarize(ARTICLES)
+    edited = ARTICLES[0].model_copy(update={"title": "Sensex hits fresh record high"})
+    summaries = await summarizer.summarize([edited, ARTICLES[1]])
+    assert llm.calls == 2
+    assert summaries[0].summary == "LLM: Sensex hits fresh record high"
+
+@pytest.mark.anyio
+async def test_failed_summary_keeps_the_scraped_one_and_is_retried(summarizer, llm):
+    llm.fail = True
+    summaries = await summarizer.summarize(ARTICLES)
+    assert [summary.summary for summary in summaries] == [article.summary for article in ARTICLES]
+
+    llm.fail = False
+    await summarizer.summarize(ARTICLES)
+    assert llm.calls == 2
@@ -0,0 +1,84 @@
+import asyncio
+import json
+import time
+import httpx
+import pytest
+from app.main import app
+from app.models.schemas import NewsArticle, NewsArticleCollection
+from app.services import financial_chat_service
+from app.services.news_scheduler import news_scheduler
+
+# How long each stubbed crew kickoff blocks its worker thread
+CREW_SECONDS = 1.0
+
+# Concurrent chats; more than the crew worker pool, so some also queue
+CHATS = 8
+
+# Slowest acceptable response from a cheap route while the chats run
+MAX_CHEAP_ROUTE_SECONDS = 0.25
+
+class SlowCrew:
+    """Stands in for the chat crew, blocking its thread like a real kickoff"""
+
+    name = "slow_chat"
+
+    def copy(self):
+        return self
+
+    def kickoff(self, inputs):
+        time.sleep(CREW_SECONDS)
+        return json.dumps({"advice": {"analysis": f"Answer to {inputs['query']}", "recommendations": []}})
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+@pytest.fixture
+def slow_chat(monkeypatch):
+    monkeypatch.setattr(financial_chat_service, "chat_crew", SlowCrew())
+    financial_chat_service.chat_response_cache.clear()
+
+@pytest.fixture
+async def stored_news(monkeypatch):
+    collection = NewsArticleCollection(articles=[NewsArticle(
+        title="Sensex closes higher",
+        summary="Benchmarks gained on IT buying.",
+        url="https://example.com/sensex",
+        publishedAt="2026-10-18T15:30:00",
+        source="Example"
+    )])
+
+    async def fetch():
+        return collection
+
+    monkeypatch.setattr(news_scheduler, "_fetch", fetch)
+    monkeypatch.setattr(news_scheduler, "_listeners", [])
+    await news_scheduler.refresh()
+
+@pytest.mark.anyio
+async def test_cheap_routes_stay_fast_while_chats_run(slow_chat, stored_news):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        started = time.perf_counter()
+        chats = [
+            asyncio.create_task(client.post("/api/financial/chat", json={"query": f"question {index}"}))
+            for index in range(CHATS)
+        ]
+        await asyncio.sleep(0.1)
+
+        latencies = []
+        while not all(chat.done() for chat in chats):
+            for path in ("/", "/api/news/latest"):
+                request_started = time.perf_counter()
+                response = await client.get(path)
+                latencies.append(time.perf_counter() - request_started)
+                assert response.status_code == 200
+            await asyncio.sleep(0.05)
+
+        responses = await asyncio.gather(*chats)
+        elapsed = time.perf_counter() - started
+
+    assert all(response.status_code == 200 for response in responses)
+    assert elapsed >= CREW_SECONDS
+    assert len(latencies) >= 10
+    assert max(latencies) < MAX_CHEAP_ROUTE_SECONDS
@@ -0,0 +1,91 @@
+import json
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app
+
+PROFILE = {
+    "age": 30,
+    "income": 1200000,
+    "dependents": 1,
+    "investment_horizon": 10,
+    "risk_tolerance": "moderate",
+    "existing_investments": [{"type": "equity", "amount": 500000}]
+}
+
+@pytest.fixture
+def client():
+    return TestClient(app)
+
+def test_scores_valid_profiles(client):
+    response = client.post("/api/wealth/risk/batch", json=[PROFILE, PROFILE])
+    assert response.status_code == 200
+    body = response.json()
+    assert body["count"] == 2
+    assert all(result["risk_score"] is not None for result in body["results"])
+
+def test_rejects_null_numeric_field(client):
+    response = client.post("/api/wealth/risk/batch", json=[PROFILE, {**PROFILE, "income": None}])
+    assert response.status_code == 400
+    assert "income" in response.json()["detail"]
+    assert "rows 1" in response.json()["detail"]
+
+def test_rejects_non_numeric_string(client):
+    profiles = [PROFILE, PROFILE, {**PROFILE, "age": "thirty"}, {**PROFILE, "age": "forty"}]
+    response = client.post("/api/wealth/risk/batch", json=profiles)
+    assert response.status_code == 400
+    assert "age missing or not a number in rows 2, 3" in response.json()["detail"]
+
+def test_rejects_missing_risk_tolerance(client):
+    response = client.post("/api/wealth/risk/batch", json=[{**PROFILE, "risk_tolerance": None}])
+    assert response.status_code == 400
+    assert "risk_tolerance missing or not a string in rows 0" in response.json()["detail"]
+
+def test_rejects_invalid_ndjson_rows(client):
+    payload = "\n".join(json.dumps(profile) for profile in [PROFILE, {**PROFILE, "dependents": None}])
+    response = client.post(
+        "/api/wealth/risk/batch",
+        content=payload,
+        headers={"content-type": "application/x-ndjson"}
+    )
+    assert response.status_code == 400
+    assert "dependents" in response.json()["detail"]
+
+@pytest.mark.parametrize("profiles", [[1, 2], [PROFILE, None], [PROFILE, "profile"], [PROFILE, [PROFILE]]])
+def test_rejects_non_object_profiles(client, profiles):
+    response = client.post("/api/wealth/risk/batch", json=profiles)
+    assert response.status_code == 400
+    assert "must be JSON objects" in response.json()["detail"]
+
+def test_rejects_non_object_ndjson_lines(client):
+    response = client.post(
+        "/api/wealth/risk/batch",
+        content=json.dumps(PROFILE) + "\n42\n",
+        headers={"content-type": "application/x-ndjson"}
+    )
+    assert response.status_code == 400
+    assert "rows 1" in response.json()["detail"]
+
+def test_rejects_malformed_ndjson(client):
+    response = client.post(
+        "/api/wealth/risk/batch",
+        content=json.dumps(PROFILE) + "\n{not json\n",
+        headers={"content-type": "application/x-ndjson"}
+    )
+    assert response.status_code == 400
+
+@pytest.mark.parametrize("field", ["income", "age"])
+def test_rejects_negative_values(client, field):
+    response = client.post("/api/wealth/risk/batch", json=[PROFILE, {**PROFILE, field: -1}])
+    assert response.status_code == 400
+    assert f"{field} negative in rows 1" in response.json()["detail"]
+
+@pytest.mark.parametrize("tolerance", [5, ["high"], {"level": "high"}])
+def test_rejects_non_string_risk_tolerance(client, tolerance):
+    response = client.post("/api/wealth/risk/batch", json=[{**PROFILE, "risk_tolerance": tolerance}])
+    assert response.status_code == 400
+    assert "risk_tolerance missing or not a string in rows 0" in response.json()["detail"]
+
+def test_empty_batch(client):
+    response = client.post("/api/wealth/risk/batch", json=[])
+    assert response.status_code == 200
+    assert response.json()["count"] == 0
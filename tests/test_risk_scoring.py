@@ -0,0 +1,81 @@
+import itertools
+import math
+import pandas as pd
+import pytest
+from app.models.schemas import UserProfile
+from app.services.risk_scoring import (
+    CONSERVATIVE_MAX, FACTOR_WEIGHTS, INCOME_CEILING, INCOME_FLOOR, MODERATE_MAX,
+    equity_share, score_risk, score_risk_frame, tolerance_factor
+)
+
+def reference_score(profile: UserProfile):
+    """The per-profile scorer the vectorized one replaced, as (score, category)"""
+    clip = lambda value: min(1.0, max(0.0, value))
+    income = max(profile.income, 1.0)
+    factors = {
+        'age': clip((60 - profile.age) / 40),
+        'income': clip(math.log10(income / INCOME_FLOOR) / math.log10(INCOME_CEILING / INCOME_FLOOR)),
+        'dependents': clip(1 - profile.dependents / 4),
+        'horizon': clip(profile.investment_horizon / 20),
+        'portfolio': equity_share(profile.existing_investments),
+        'tolerance': tolerance_factor(profile.risk_tolerance)
+    }
+    score = round(sum(FACTOR_WEIGHTS[name] * value for name, value in factors.items()), 1)
+    if score <= CONSERVATIVE_MAX:
+        category = 'Conservative'
+    elif score <= MODERATE_MAX:
+        category = 'Moderate'
+    else:
+        category = 'Aggressive'
+    return score, category
+
+PORTFOLIOS = [
+    [],
+    [{"type": "equity", "amount": 100}],
+    [{"type": "fixed deposit", "amount": 100}],
+    [{"type": "equity", "amount": 30}, {"type": "debt", "amount": 70}]
+]
+
+def profiles():
+    for age, income, dependents, horizon, portfolio, tolerance in itertools.product(
+        range(18, 66, 3),
+        [1, 3_00_000, 12_00_000, 50_00_000, 3_00_00_000],
+        range(0, 5),
+        range(0, 22, 3),
+        range(len(PORTFOLIOS)),
+        ['low', 'moderate', 'aggressive', 'unknown']
+    ):
+        yield UserProfile(
+            age=age,
+            income=income,
+            dependents=dependents,
+            investment_horizon=horizon,
+            existing_investments=PORTFOLIOS[portfolio],
+            risk_tolerance=tolerance,
+            goals=[]
+        )
+
+@pytest.fixture(scope="module")
+def band_edge_profiles():
+    """Profiles whose reference score is within 0.5 of a category boundary"""
+    edge_profiles = [
+        profile for profile in profiles()
+        if any(abs(reference_score(profile)[0] - edge) <= 0.5 for edge in (CONSERVATIVE_MAX, MODERATE_MAX))
+    ]
+    scores = {reference_score(profile)[0] for profile in edge_profiles}
+    # Both boundaries are hit exactly, with profiles either side of them
+    assert {CONSERVATIVE_MAX, MODERATE_MAX} <= scores
+    assert any(score < CONSERVATIVE_MAX for score in scores) and any(CONSERVATIVE_MAX < score < 31 for score in scores)
+    assert any(69 < score < MODERATE_MAX for score in scores) and any(score > MODERATE_MAX for score in scores)
+    return edge_profiles
+
+def test_single_profile_scorer_matches_reference_on_band_edges(band_edge_profiles):
+    for profile in band_edge_profiles:
+        analysis = score_risk(profile)
+        assert (analysis.risk_score, analysis.risk_category) == reference_score(profile), profile
+
+def test_batch_scorer_matches_single_profile_scorer_on_band_edges(band_edge_profiles):
+    frame = pd.DataFrame([dict(profile) for profile in band_edge_profiles])
+    for profile, analysis in zip(band_edge_profiles, score_risk_frame(frame)):
+        assert analysis == score_risk(profile)
+        assert (analysis.risk_score, analysis.risk_category) == reference_score(profile)
@@ -0,0 +1,105 @@
+from contextlib import asynccontextmanager
+import asyncio
+import pytest
+from app.services.cache import DiskCache, TieredCache
+from app.tools import html_parser
+from app.tools import search_query
+from app.tools.search_query import CustomSearchTool
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+def page(text):
+    return f"<html><body><article><p>{text}</p></article></body></html>"
+
+PAGES = {
+    "https://a.example/sensex": page("The Sensex rose 500 points as banks rallied on strong quarterly results."),
+    "https://b.example/nifty": page("The Nifty and Sensex closed higher while the rupee held steady."),
+    "https://c.example/gold": page("Gold prices in India eased as the Sensex gained and demand slowed.")
+}
+
+class FakeResponse:
+    def __init__(self, body):
+        self.status = 200
+        self.body = body
+
+    async def text(self):
+        return self.body
+
+class FakeClient:
+    """Serves the canned pages, waiting `delays[url]` seconds first"""
+
+    def __init__(self, delays=None):
+        self.delays = delays or {}
+        self.requested = []
+
+    @asynccontextmanager
+    async def get(self, url, **kwargs):
+        self.requested.append(url)
+        await asyncio.sleep(self.delays.get(url, 0))
+        yield FakeResponse(PAGES[url])
+
+@pytest.fixture
+def searches(tmp_path, monkeypatch):
+    """Queries sent to the search engine; each returns every canned page"""
+    for name in ("search_results_cache", "page_text_cache"):
+        cache = TieredCache(100, 3600, DiskCache(str(tmp_path / name), 1024 * 1024))
+        monkeypatch.setattr(search_query, name, cache)
+    monkeypatch.setattr(html_parser, "HTML_PARSER_WORKERS", 0)
+    monkeypatch.setattr(html_parser, "_executor", None)
+
+    queries = []
+    async def search_links(self, client, query, limit, lang, timeout):
+        queries.append(query)
+        return list(PAGES)[:limit]
+    monkeypatch.setattr(CustomSearchTool, "_search_links", search_links)
+    return queries
+
+@pytest.mark.anyio
+async def test_repeated_search_served_from_cache(searches):
+    tool = CustomSearchTool()
+    client = FakeClient()
+
+    first = await tool._search(client, "Sensex today", 3, "en", 5000)
+    second = await tool._search(client, "  sensex   TODAY ", 3, "en", 5000)
+
+    assert searches == ["Sensex today"]
+    assert sorted(client.requested) == sorted(PAGES)
+    assert second == first
+    assert [result["url"] for result in first] == list(PAGES)
+    stats = search_query.get_search_cache_stats()
+    assert (stats["results"]["hits"], stats["results"]["misses"]) == (1, 1)
+    assert (stats["pages"]["hits"], stats["pages"]["misses"]) == (3, 3)
+
+@pytest.mark.anyio
+async def test_page_text_shared_between_queries(searches):
+    tool = CustomSearchTool()
+    client = FakeClient()
+
+    await tool._search(client, "Sensex today", 2, "en", 5000)
+    await tool._search(client, "Sensex gold", 3, "en", 5000)
+
+    assert searches == ["Sensex today", "Sensex gold"]
+    # Only the page the first search did not return is scraped again
+    assert client.requested == list(PAGES)[:2] + ["https://c.example/gold"]
+
+@pytest.mark.anyio
+async def test_partial_results_returned_at_the_deadline(searches):
+    tool = CustomSearchTool()
+    client = FakeClient(delays={"https://b.example/nifty": 5})
+    loop = asyncio.get_running_loop()
+
+    started = loop.time()
+    results = await tool._search(client, "Sensex today", 3, "en", 300)
+    elapsed = loop.time() - started
+
+    assert elapsed < 2
+    assert [result["url"] for result in results] == ["https://a.example/sensex", "https://c.example/gold"]
+    assert all("Sensex" in result["content"] for result in results)
+
+    # The page that missed the deadline was not cached, and is scraped next time
+    client.delays.clear()
+    results = await tool._search(client, "Sensex today", 3, "en", 5000)
+    assert [result["url"] for result in results] == list(PAGES)
+    assert client.requested.count("https://b.example/nifty") == 2
@@ -0,0 +1,82 @@
+import asyncio
+import pytest
+from app.services.single_flight import SingleFlight
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+class Work:
+    """Work that blocks until released, counting how often it runs"""
+
+    def __init__(self, error=None):
+        self.calls = 0
+        self.error = error
+        self.release = asyncio.Event()
+
+    async def __call__(self):
+        self.calls += 1
+        await self.release.wait()
+        if self.error:
+            raise self.error
+        return object()
+
+@pytest.mark.anyio
+async def test_concurrent_identical_calls_run_once_and_share_the_result():
+    flight = SingleFlight("test")
+    work = Work()
+    callers = [asyncio.ensure_future(flight.do("key", work)) for _ in range(5)]
+    await asyncio.sleep(0)
+    work.release.set()
+
+    results = await asyncio.gather(*callers)
+    assert work.calls == 1
+    assert all(result is results[0] for result in results)
+    assert flight.stats() == {"in_flight": 0, "executions": 1, "coalesced": 4}
+
+@pytest.mark.anyio
+async def test_different_keys_run_separately():
+    flight = SingleFlight("test")
+    work = Work()
+    work.release.set()
+    await asyncio.gather(flight.do("a", work), flight.do("b", work))
+    assert work.calls == 2
+
+@pytest.mark.anyio
+async def test_exception_reaches_every_waiter():
+    flight = SingleFlight("test")
+    work = Work(error=RuntimeError("crew failed"))
+    callers = [asyncio.ensure_future(flight.do("key", work)) for _ in range(3)]
+    await asyncio.sleep(0)
+    work.release.set()
+
+    results = await asyncio.gather(*callers, return_exceptions=True)
+    assert work.calls == 1
+    assert all(isinstance(result, RuntimeError) and str(result) == "crew failed" for result in results)
+
+@pytest.mark.anyio
+async def test_key_cleared_afterwards():
+    flight = SingleFlight("test")
+    work = Work(error=RuntimeError("crew failed"))
+    work.release.set()
+    with pytest.raises(RuntimeError):
+        await flight.do("key", work)
+    assert flight.stats()["in_flight"] == 0
+
+    # A later call starts a fresh run instead of reusing the failed one
+    work.error = None
+    await flight.do("key", work)
+    assert work.calls == 2
+
+@pytest.mark.anyio
+async def test_cancelled_caller_does_not_cancel_the_others():
+    flight = SingleFlight("test")
+    work = Work()
+    first = asyncio.ensure_future(flight.do("key", work))
+    second = asyncio.ensure_future(flight.do("key", work))
+    await asyncio.sleep(0)
+
+    first.cancel()
+    work.release.set()
+    assert await second is not None
+    assert work.calls == 1
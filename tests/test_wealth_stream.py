@@ -0,0 +1,68 @@
+import json
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app
+from app.models.schemas import MarketAnalysis, MarketDigest
+from app.services import wealth_service
+
+REQUEST = {
+    "age": 30,
+    "income": 1200000,
+    "dependents": 1,
+    "investment_horizon": 10,
+    "risk_tolerance": "moderate",
+    "existing_investments": [{"type": "equity", "amount": 500000}],
+    "goals": [{"type": "home", "target_amount": 5000000, "timeline": 8}]
+}
+
+ANALYSIS = MarketAnalysis(market_trends=["up"], key_insights=["rates"], impact_analysis=["equity"])
+
+RECOMMENDATIONS = {
+    "specific_recommendations": [
+        {"type": "equity", "instrument": "Index Fund", "allocation": 60, "reasoning": "Growth"}
+    ]
+}
+
+class TaskOutput:
+    def __init__(self, raw):
+        self.raw = raw
+
+@pytest.fixture
+def client(monkeypatch):
+    async def get_digest():
+        return MarketDigest(version=1, news_hash="hash", analysis=ANALYSIS)
+
+    async def stream_crew(crew, inputs):
+        content = json.dumps({"recommendations": RECOMMENDATIONS})
+        yield "task", TaskOutput(content)
+        # A task the stream has no event name for
+        yield "task", TaskOutput('{"extra": true}')
+        yield "result", content
+
+    monkeypatch.setattr(wealth_service.market_digest, "get", get_digest)
+    monkeypatch.setattr(wealth_service, "stream_crew", stream_crew)
+    return TestClient(app)
+
+def parse_events(body):
+    events = []
+    for block in body.strip().split("\n\n"):
+        event, data = block.split("\n")
+        events.append((event[len("event: "):], json.loads(data[len("data: "):])))
+    return events
+
+def test_stream_sends_unwrapped_payloads(client):
+    response = client.post("/api/wealth/advice/stream", json=REQUEST)
+    assert response.status_code == 200
+    events = parse_events(response.text)
+    assert [event for event, _ in events] == [
+        "risk_analysis", "market_analysis", "recommendations", "task", "result"
+    ]
+    data = dict(events)
+    assert "risk_score" in data["risk_analysis"]
+    assert data["market_analysis"] == ANALYSIS.dict()
+    assert data["recommendations"] == RECOMMENDATIONS
+
+    result = data["result"]
+    assert result["risk_analysis"] == data["risk_analysis"]
+    assert result["market_analysis"] == data["market_analysis"]
+    assert [goal["type"] for goal in result["goal_projections"]] == ["home"]
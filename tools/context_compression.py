@@ -0,0 +1,135 @@
+from collections import Counter
+from typing import Any, Dict, List, Tuple
+import math
+import os
+import re
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+# Estimated tokens of page text handed to the LLM per research search
+RESEARCH_CONTEXT_TOKEN_BUDGET = int(os.getenv("RESEARCH_CONTEXT_TOKEN_BUDGET", "1500"))
+
+# Words per passage that pages are split into for ranking
+PASSAGE_WORDS = int(os.getenv("RESEARCH_PASSAGE_WORDS", "80"))
+
+# Characters per token, for estimating prompt size without a tokenizer
+CHARS_PER_TOKEN = 4
+
+# BM25 term-frequency saturation and length normalization
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Placed between non-adjacent passages of the same page
+PASSAGE_SEPARATOR = " ... "
+
+WORD = re.compile(r'\w+')
+
+def chunk_passages(text: str, words: int = PASSAGE_WORDS) -> List[str]:
+    """
+    Split page text into passages of about `words` words.
+
+    Text blocks (lines) are kept whole and packed together while they fit;
+    longer blocks are split.
+    """
+    passages: List[str] = []
+    current: List[str] = []
+    count = 0
+    for line in text.split('\n'):
+        line_words = line.split()
+        while len(line_words) > words:
+            if current:
+                passages.append(' '.join(current))
+                current, count = [], 0
+            passages.append(' '.join(line_words[:words]))
+            line_words = line_words[words:]
+        if not line_words:
+            continue
+        if current and count + len(line_words) > words:
+            passages.append(' '.join(current))
+            current, count = [], 0
+        current.extend(line_words)
+        count += len(line_words)
+    if current:
+        passages.append(' '.join(current))
+    return passages
+
+def bm25_scores(query: str, passages: List[str]) -> List[float]:
+    """BM25 score of each passage for the query, with IDF over the passages themselves"""
+    terms = set(WORD.findall(query.lower()))
+    tokenized = [WORD.findall(passage.lower()) for passage in passages]
+    if not terms or not tokenized:
+        return [0.0] * len(passages)
+
+    average = sum(len(tokens) for tokens in tokenized) / len(tokenized) or 1
+    frequencies = [Counter(tokens) for tokens in tokenized]
+    documents = {term: sum(1 for frequency in frequencies if term in frequency) for term in terms}
+    idf = {
+        term: math.log(1 + (len(passages) - count + 0.5) / (count + 0.5))
+        for term, count in documents.items()
+    }
+
+    scores = []
+    for tokens, frequency in zip(tokenized, frequencies):
+        norm = BM25_K1 * (1 - BM25_B + BM25_B * len(tokens) / average)
+        scores.append(sum(
+            idf[term] * frequency[term] * (BM25_K1 + 1) / (frequency[term] + norm)
+            for term in terms if term in frequency
+        ))
+    return scores
+
+def compress_results(
+    query: str,
+    results: List[Dict[str, Any]],
+    token_budget: int = RESEARCH_CONTEXT_TOKEN_BUDGET
+) -> List[Dict[str, Any]]:
+    """
+    Cut search results down to the passages most relevant to the query.
+
+    Every page's content is split into passages, which are ranked
+    together by BM25 against the query and taken best first until
+    `token_budget` is spent. Passages sharing no terms with the query are
+    skipped, unless no passage does. Each page keeps its chosen passages
+    in page order; pages with none chosen are dropped. Results with an error
+    instead of content are passed through.
+    """
+    passages: List[Tuple[int, int, str]] = []
+    for page, result in enumerate(results):
+        for position, passage in enumerate(chunk_passages(result.get("content") or "")):
+            passages.append((page, position, passage))
+    if not passages:
+        return results
+
+    scores = bm25_scores(query, [passage for _, _, passage in passages])
+    # Best first; ties go to passages earlier in a page, then to higher ranked pages
+    ranked = sorted(range(len(passages)), key=lambda index: (-scores[index], passages[index][1], passages[index][0]))
+    # With nothing relevant anywhere, fall back to the pages' leading passages
+    relevant_only = scores[ranked[0]] > 0
+
+    chosen: Dict[int, List[Tuple[int, str]]] = {}
+    remaining = token_budget * CHARS_PER_TOKEN
+    for index in ranked:
+        page, position, passage = passages[index]
+        if relevant_only and scores[index] <= 0:
+            break
+        if len(passage) > remaining:
+            continue
+        chosen.setdefault(page, []).append((position, passage))
+        remaining -= len(passage)
+
+    compressed = []
+    for page, result in enumerate(results):
+        if "content" not in result:
+            compressed.append(result)
+            continue
+        if page not in chosen:
+            continue
+        content, previous = [], None
+        for position, passage in sorted(chosen[page]):
+            if previous is not None:
+                content.append(' ' if position == previous + 1 else PASSAGE_SEPARATOR)
+            content.append(passage)
+            previous = position
+        compressed.append({**result, "content": ''.join(content)})
+    return compressed
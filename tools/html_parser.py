@@ -0,0 +1,184 @@
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, TypeVar
+import asyncio
+import multiprocessing
+import os
+import re
+from bs4 import BeautifulSoup
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+def _default_parser() -> str:
+    try:
+        import lxml  # noqa: F401
+        return 'lxml'
+    except ImportError:
+        return 'html.parser'
+
+# BeautifulSoup tree builder: 'lxml' is several times faster than the
+# pure-Python 'html.parser', which is used when lxml is not installed
+HTML_PARSER = os.getenv("HTML_PARSER") or _default_parser()
+
+# Worker processes used for parsing; 0 parses in a thread instead
+HTML_PARSER_WORKERS = int(os.getenv("HTML_PARSER_WORKERS", str(min(4, os.cpu_count() or 1))))
+
+T = TypeVar("T")
+
+# Elements that never hold an article's main content
+BOILERPLATE_TAGS = ['script', 'style', 'noscript', 'template', 'iframe', 'svg', 'form', 'button', 'nav', 'header', 'footer', 'aside']
+
+# Class or id fragments of navigation, ads and other page chrome
+BOILERPLATE_PATTERN = re.compile(
+    r'(^|[-_ ])(nav|navbar|menu|footer|header|sidebar|breadcrumbs?|ads?|advert\w*|promo|sponsored|'
+    r'cookie|consent|newsletter|subscribe|share|social|related|recommended|comments?|popup|modal)($|[-_ ])',
+    re.IGNORECASE
+)
+
+# Text blocks that make up the main content
+CONTENT_TAGS = ['h1', 'h2', 'h3', 'h4', 'p', 'li', 'blockquote', 'pre', 'tr']
+
+# Blocks kept however short: headings and table rows, which hold figures
+SHORT_BLOCK_TAGS = {'h1', 'h2', 'h3', 'h4', 'tr'}
+
+# Shortest text block kept, in characters
+MIN_BLOCK_CHARS = 40
+
+# A container with this many paragraphs is content, whatever its class says
+MIN_CONTENT_PARAGRAPHS = 5
+
+_executor: Optional[ProcessPoolExecutor] = None
+
+def make_soup(html: str) -> BeautifulSoup:
+    """Parse HTML with the configured backend"""
+    return BeautifulSoup(html, HTML_PARSER)
+
+def parse_listing(html: str, source: Dict[str, Any]) -> List[Dict[str, str]]:
+    """
+    Raw title, link, summary and publish time of each article on a listing page.
+
+    `source` is a news source registry entry; links and publish times are
+    returned as found in the page and parsed when articles are normalized.
+    """
+    articles = []
+    for item in make_soup(html).select(source['article_selector']):
+        try:
+            title_elem = item.select_one(source['title_selector'])
+            if not title_elem:
+                continue
+            link_elem = item.select_one(source['link_selector']) if source.get('link_selector') else title_elem
+            summary_elem = item.select_one(source['summary_selector']) if source.get('summary_selector') else None
+            published_elem = item.select_one(source['published_selector']) if source.get('published_selector') else None
+
+            published = ''
+            if published_elem:
+                if source.get('published_attribute'):
+                    published = published_elem.get(source['published_attribute']) or ''
+                else:
+                    published = published_elem.text.strip()
+
+            articles.append({
+                'title': title_elem.text.strip(),
+                'link': (link_elem.get('href') or '') if link_elem else '',
+                'summary': summary_elem.text.strip() if summary_elem else '',
+                'published': published
+            })
+        except Exception as e:
+            print(f"Error parsing article: {str(e)}")
+            continue
+    return articles
+
+def parse_search_result_links(html: str, limit: int) -> List[str]:
+    """Result URLs on a DuckDuckGo HTML results page"""
+    result_links = []
+    for link in make_soup(html).find_all("a", class_="result__url"):
+        href = link.get("href")
+        if href and href.startswith("http"):
+            result_links.append(href)
+        if len(result_links) >= limit:
+            break
+    return result_links
+
+def _is_boilerplate(element) -> bool:
+    if element.attrs is None:
+        return False
+    names = ' '.join(element.get('class') or []) + ' ' + (element.get('id') or '')
+    if not (BOILERPLATE_PATTERN.search(names) or element.get('role') in ('navigation', 'banner', 'contentinfo')):
+        return False
+    # Wrappers named like chrome, e.g. "page-header-wrapper", may hold the article
+    return not (element.find(['article', 'main']) or len(element.find_all('p', limit=MIN_CONTENT_PARAGRAPHS)) >= MIN_CONTENT_PARAGRAPHS)
+
+def extract_main_text(html: str) -> str:
+    """
+    Main content of a page as text blocks separated by newlines.
+
+    Drops scripts, navigation, headers, footers, ads and similar chrome,
+    then reads the headings and paragraphs of the page's <article> or
+    <main> element, or otherwise of the element holding the most
+    paragraph text. Falls back to all visible body text.
+    """
+    soup = make_soup(html)
+    body = soup.find("body") or soup
+    for element in body.find_all(BOILERPLATE_TAGS):
+        element.decompose()
+    for element in body.find_all(_is_boilerplate):
+        if not element.decomposed:
+            element.decompose()
+
+    root = body.find("article") or body.find("main") or body.find(attrs={"role": "main"})
+    if root is None:
+        # The container with the most paragraph text
+        weights: Dict[int, int] = {}
+        parents = {}
+        for paragraph in body.find_all("p"):
+            parent = paragraph.parent
+            if parent is not None:
+                weights[id(parent)] = weights.get(id(parent), 0) + len(paragraph.get_text(strip=True))
+                parents[id(parent)] = parent
+        root = parents[max(weights, key=weights.get)] if weights else body
+        if root is not body and root.parent is not None and sum(weights.values()) > 2 * weights[id(root)]:
+            # Paragraphs are spread over several sibling containers
+            root = body
+
+    blocks = []
+    for element in root.find_all(CONTENT_TAGS):
+        # Text of nested blocks is read from the innermost one
+        if element.find(CONTENT_TAGS):
+            continue
+        text = ' '.join(element.get_text(' ', strip=True).split())
+        if len(text) >= MIN_BLOCK_CHARS or (element.name in SHORT_BLOCK_TAGS and text):
+            blocks.append(text)
+    if not blocks:
+        text = ' '.join(body.stripped_strings)
+        return text or "No body content found"
+    return '\n'.join(blocks)
+
+def get_parser_executor() -> Optional[ProcessPoolExecutor]:
+    """Return the shared parser process pool, or None if parsing runs in threads"""
+    global _executor
+    if _executor is None and HTML_PARSER_WORKERS > 0:
+        # Forking a process that runs crew and database threads is unsafe
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+        _executor = ProcessPoolExecutor(max_workers=HTML_PARSER_WORKERS, mp_context=context)
+    return _executor
+
+def shutdown_parser_executor() -> None:
+    """Shut down the parser process pool"""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=True, cancel_futures=True)
+        _executor = None
+
+async def run_parser(function: Callable[..., T], *args: Any) -> T:
+    """
+    Run a parse function off the event loop.
+
+    `function` must be defined at module level so it can be sent to a
+    worker process.
+    """
+    executor = get_parser_executor()
+    if executor is None:
+        return await asyncio.to_thread(function, *args)
+    return await asyncio.get_running_loop().run_in_executor(executor, function, *args)
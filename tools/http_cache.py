@@ -0,0 +1,105 @@
+from typing import Any, Dict, NamedTuple, Optional
+import asyncio
+import hashlib
+import json
+import os
+from dotenv import load_dotenv
+from ..services.cache import DiskCache
+from ..services.metrics import stats_collector
+from .http_client import HttpClient, http_client
+
+# Load environment variables
+load_dotenv()
+
+# Where scraped pages and their validators are kept between runs
+SCRAPER_CACHE_DIR = os.getenv(
+    "SCRAPER_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(__file__)), '.cache', 'scraper')
+)
+SCRAPER_CACHE_MAX_BYTES = int(os.getenv("SCRAPER_CACHE_MAX_MB", "64")) * 1024 * 1024
+
+class FetchResult(NamedTuple):
+    status: int
+    text: Optional[str]
+    changed: bool
+
+class HttpCache:
+    """
+    Conditional GETs for scraped pages, backed by a DiskCache.
+
+    Stores each page's body with its ETag and Last-Modified headers and
+    sends them back as If-None-Match / If-Modified-Since. A page counts
+    as unchanged on a 304, or on a 200 whose body is identical to the
+    cached one (for sites without validators), so callers can skip
+    parsing it.
+    """
+
+    def __init__(self, cache: DiskCache, client: HttpClient = http_client):
+        self.cache = cache
+        self.client = client
+        self.downloaded = 0
+        self.not_modified = 0
+        self.unchanged = 0
+
+    async def _load(self, url: str) -> Optional[Dict[str, Any]]:
+        data = await asyncio.to_thread(self.cache.get, url)
+        if data is None:
+            return None
+        try:
+            return json.loads(data)
+        except ValueError:
+            return None
+
+    async def _store(self, url: str, entry: Dict[str, Any]) -> None:
+        await asyncio.to_thread(self.cache.set, url, json.dumps(entry).encode('utf-8'))
+
+    async def get(
+        self,
+        url: str,
+        headers: Optional[Dict[str, str]] = None
+    ) -> FetchResult:
+        """Fetch a page, revalidating the cached copy if there is one"""
+        entry = await self._load(url)
+        request_headers = dict(headers or {})
+        if entry:
+            if entry.get('etag'):
+                request_headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                request_headers['If-Modified-Since'] = entry['last_modified']
+
+        async with self.client.get(url, headers=request_headers) as response:
+            if response.status == 304 and entry:
+                self.not_modified += 1
+                return FetchResult(304, entry['body'], False)
+            if response.status != 200:
+                return FetchResult(response.status, None, False)
+            body = await response.text()
+            etag = response.headers.get('ETag')
+            last_modified = response.headers.get('Last-Modified')
+
+        self.downloaded += 1
+        digest = hashlib.sha256(body.encode('utf-8')).hexdigest()
+        changed = entry is None or entry.get('sha256') != digest
+        if not changed:
+            self.unchanged += 1
+
+        await self._store(url, {
+            'etag': etag,
+            'last_modified': last_modified,
+            'sha256': digest,
+            'body': body
+        })
+        return FetchResult(200, body, changed)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return revalidation counters and disk cache usage"""
+        return {
+            "downloaded": self.downloaded,
+            "not_modified": self.not_modified,
+            "unchanged": self.unchanged,
+            "disk": self.cache.stats()
+        }
+
+# Shared conditional-fetch cache for the news scrapers
+scraper_http_cache = HttpCache(DiskCache(SCRAPER_CACHE_DIR, SCRAPER_CACHE_MAX_BYTES))
+stats_collector.register_cache("scraper_pages", scraper_http_cache.stats)
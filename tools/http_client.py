@@ -0,0 +1,167 @@
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional, TypeVar
+from urllib.parse import urlsplit
+import asyncio
+import concurrent.futures
+import os
+import threading
+import time
+import aiohttp
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+# Connection pool limits shared by every scraper and the search tool
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))
+HTTP_MAX_CONNECTIONS_PER_HOST = int(os.getenv("HTTP_MAX_CONNECTIONS_PER_HOST", "4"))
+HTTP_DNS_CACHE_SECONDS = int(os.getenv("HTTP_DNS_CACHE_SECONDS", "300"))
+HTTP_KEEPALIVE_SECONDS = float(os.getenv("HTTP_KEEPALIVE_SECONDS", "30"))
+HTTP_TIMEOUT_SECONDS = float(os.getenv("HTTP_TIMEOUT_SECONDS", "30"))
+
+# Requests per second allowed to any one host, and how many may burst at once
+HTTP_HOST_RATE = float(os.getenv("HTTP_HOST_RATE", "2"))
+HTTP_HOST_BURST = float(os.getenv("HTTP_HOST_BURST", "4"))
+
+T = TypeVar("T")
+
+class TokenBucket:
+    """
+    Token bucket refilled at `rate` tokens per second up to `capacity`.
+
+    Callers reserve a token and wait until it is due, so waiting callers
+    are served in order. Safe to share between threads.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Take a token, returning how many seconds to wait before using it"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    async def acquire(self) -> None:
+        delay = self.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+class HostRateLimiter:
+    """A token bucket per host"""
+
+    def __init__(self, rate: float = HTTP_HOST_RATE, burst: float = HTTP_HOST_BURST):
+        self.rate = rate
+        self.burst = burst
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def bucket(self, url: str) -> TokenBucket:
+        host = urlsplit(url).netloc.lower()
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                bucket = self._buckets[host] = TokenBucket(self.rate, self.burst)
+            return bucket
+
+    async def acquire(self, url: str) -> None:
+        """Wait until the URL's host may be sent another request"""
+        await self.bucket(url).acquire()
+
+class HttpClient:
+    """
+    Pooled aiohttp session shared by the scrapers and the search tool.
+
+    Keeps connections alive between requests, caches DNS lookups, caps
+    connections per host and rate limits each host with a token bucket.
+    Started and closed by the application lifespan; outside the app the
+    session is created on first use.
+    """
+
+    def __init__(self, rate_limiter: Optional[HostRateLimiter] = None):
+        self.rate_limiter = rate_limiter or HostRateLimiter()
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def start(self) -> None:
+        """Create the pooled session on the running event loop"""
+        if self._session is not None and not self._session.closed:
+            return
+        connector = aiohttp.TCPConnector(
+            limit=HTTP_MAX_CONNECTIONS,
+            limit_per_host=HTTP_MAX_CONNECTIONS_PER_HOST,
+            ttl_dns_cache=HTTP_DNS_CACHE_SECONDS,
+            keepalive_timeout=HTTP_KEEPALIVE_SECONDS
+        )
+        self._session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=HTTP_TIMEOUT_SECONDS)
+        )
+        self._loop = asyncio.get_running_loop()
+
+    async def close(self) -> None:
+        """Close the session and its pooled connections"""
+        if self._session is not None:
+            await self._session.close()
+        self._session = None
+        self._loop = None
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self.start()
+        return self._session
+
+    @asynccontextmanager
+    async def get(self, url: str, **kwargs: Any) -> AsyncIterator[aiohttp.ClientResponse]:
+        """GET a URL once its host's rate limit allows"""
+        await self.rate_limiter.acquire(url)
+        async with self.session.get(url, **kwargs) as response:
+            yield response
+
+    def run_sync(self, work: Callable[["HttpClient"], Awaitable[T]], timeout: Optional[float] = None) -> T:
+        """
+        Run `work(client)` from a worker thread and wait for its result.
+
+        Runs on the application's event loop so it shares the pool. Outside
+        the app, runs on a private event loop with a temporary session that
+        still shares this client's rate limits. If `timeout` expires the work
+        is cancelled before TimeoutError is raised.
+        """
+        loop = self._loop
+        if loop is not None and loop.is_running():
+            try:
+                running = asyncio.get_running_loop()
+            except RuntimeError:
+                running = None
+            if running is loop:
+                raise RuntimeError("run_sync must not be called from the event loop thread")
+            future = asyncio.run_coroutine_threadsafe(work(self), loop)
+            try:
+                return future.result(timeout)
+            except concurrent.futures.TimeoutError:
+                # Stop the work so it releases its connections and rate limit slots
+                future.cancel()
+                raise
+
+        async def standalone() -> T:
+            client = HttpClient(self.rate_limiter)
+            client.start()
+            try:
+                return await asyncio.wait_for(work(client), timeout)
+            finally:
+                await client.close()
+
+        return asyncio.run(standalone())
+
+# Shared HTTP client for the application
+http_client = HttpClient()
@@ -0,0 +1,390 @@
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional, Set, Tuple
+from urllib.parse import urljoin
+import asyncio
+import json
+import os
+import time
+from zoneinfo import ZoneInfo
+from dotenv import load_dotenv
+from fake_useragent import UserAgent
+from pydantic import BaseModel
+from ..models.schemas import NewsArticle
+from ..services.article_store import article_store, normalize_url
+from ..services.metrics import SCRAPER_FETCH_SECONDS, SCRAPER_PAGES, SCRAPER_PARSE_SECONDS
+from .http_cache import scraper_http_cache
+from .html_parser import parse_listing, run_parser
+
+# Load environment variables
+load_dotenv()
+
+# Declarative registry of the news sites to scrape
+NEWS_SOURCES_PATH = os.getenv(
+    "NEWS_SOURCES_PATH",
+    os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data', 'news_sources.json')
+)
+
+# Pages of one source fetched at the same time, unless the source sets 'concurrency'
+SCRAPER_PAGE_CONCURRENCY = int(os.getenv("SCRAPER_PAGE_CONCURRENCY", "4"))
+
+# Sources crawled at the same time
+NEWS_SOURCE_CONCURRENCY = int(os.getenv("NEWS_SOURCE_CONCURRENCY", "8"))
+
+# New articles written to the store per upsert while a crawl streams in
+NEWS_INGEST_BATCH_SIZE = int(os.getenv("NEWS_INGEST_BATCH_SIZE", "50"))
+
+# Sentinel pushed onto the merged stream once every source has finished
+_DONE = object()
+
+class NewsSource(BaseModel):
+    """A news site in the source registry"""
+    name: str
+    url: str
+    # URL of pages after the first, with a {page} placeholder
+    page_url: Optional[str] = None
+    pages: int = 1
+    concurrency: Optional[int] = None
+    article_selector: str
+    title_selector: str
+    # Defaults to the title element itself
+    link_selector: Optional[str] = None
+    summary_selector: Optional[str] = None
+    # Element holding the publish time, read from `published_attribute` if
+    # set and from its text otherwise
+    published_selector: Optional[str] = None
+    published_attribute: Optional[str] = None
+    # strptime formats of the publish time, tried before ISO 8601
+    published_formats: List[str] = []
+    # Time zone of publish times given without an offset
+    timezone: str = "Asia/Kolkata"
+    enabled: bool = True
+
+    def page_urls(self) -> List[str]:
+        if not self.page_url:
+            return [self.url]
+        return [self.url] + [self.page_url.format(page=page) for page in range(2, self.pages + 1)]
+
+    def published_time(self, value: str) -> Optional[datetime]:
+        """Parse a scraped publish time as naive local time, like stored articles; None if it cannot be"""
+        value = ' '.join(value.split())
+        if not value:
+            return None
+        published_at = None
+        for published_format in self.published_formats:
+            try:
+                published_at = datetime.strptime(value, published_format)
+                break
+            except ValueError:
+                continue
+        if published_at is None:
+            try:
+                published_at = datetime.fromisoformat(value.replace('Z', '+00:00'))
+            except ValueError:
+                return None
+        if published_at.tzinfo is None:
+            published_at = published_at.replace(tzinfo=ZoneInfo(self.timezone))
+        return published_at.astimezone().replace(tzinfo=None)
+
+def load_news_sources(path: str = NEWS_SOURCES_PATH) -> List[NewsSource]:
+    """Load the enabled sources from the registry"""
+    with open(path) as f:
+        data = json.load(f)
+    sources = [NewsSource(**source) for source in data['sources']]
+    return [source for source in sources if source.enabled]
+
+class SourceStats:
+    """Counters and timings for the latest crawl of one source"""
+
+    def __init__(self):
+        self.started_at = datetime.now()
+        self.duration_seconds = 0.0
+        self.fetch_seconds = 0.0
+        self.parse_seconds = 0.0
+        self.pages_fetched = 0
+        self.pages_unchanged = 0
+        self.pages_failed = 0
+        self.articles_parsed = 0
+        self.articles_older = 0
+        self.articles_new = 0
+        self.stopped_early = False
+        self.completed = False
+        # Watermark the crawl started from, and the newest publish time it found
+        self.watermark: Optional[datetime] = None
+        self.newest_published: Optional[datetime] = None
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "started_at": self.started_at.isoformat(),
+            "duration_seconds": round(self.duration_seconds, 3),
+            "fetch_seconds": round(self.fetch_seconds, 3),
+            "parse_seconds": round(self.parse_seconds, 3),
+            "pages_fetched": self.pages_fetched,
+            "pages_unchanged": self.pages_unchanged,
+            "pages_failed": self.pages_failed,
+            "articles_parsed": self.articles_parsed,
+            "articles_older": self.articles_older,
+            "articles_new": self.articles_new,
+            "stopped_early": self.stopped_early,
+            "completed": self.completed,
+            "watermark": self.watermark.isoformat() if self.watermark else None,
+            "newest_published": self.newest_published.isoformat() if self.newest_published else None
+        }
+
+class NewsPipeline:
+    """
+    Streaming scraper for every source in the registry.
+
+    Each source runs through fetch -> parse -> normalize -> dedupe stages,
+    chained as async generators that pass one listing page at a time.
+    Pages of a source are fetched concurrently and handed on in page
+    order. Listings are newest first, so a page holding only articles
+    published before the source's watermark, or only articles already in
+    the article store, ends that source's crawl. The watermark is the
+    newest publish time ingested from the source and is advanced after
+    each complete ingest. Sources are crawled concurrently and their
+    articles merged into one stream.
+    """
+
+    def __init__(self, sources: Optional[List[NewsSource]] = None):
+        self._sources = sources
+        self._stats: Dict[str, SourceStats] = {}
+        self.ua = UserAgent()
+
+    @property
+    def sources(self) -> List[NewsSource]:
+        if self._sources is None:
+            self._sources = load_news_sources()
+        return self._sources
+
+    def _headers(self) -> Dict[str, str]:
+        return {
+            'User-Agent': self.ua.random,
+            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+            'Accept-Language': 'en-US,en;q=0.5',
+            'DNT': '1',
+            'Connection': 'keep-alive',
+            'Upgrade-Insecure-Requests': '1',
+        }
+
+    async def fetch(self, source: NewsSource, stats: SourceStats) -> AsyncIterator[Tuple[str, Optional[str]]]:
+        """Yield (page URL, HTML) in page order; HTML is None if unchanged or failed"""
+        semaphore = asyncio.Semaphore(source.concurrency or SCRAPER_PAGE_CONCURRENCY)
+        headers = self._headers()
+
+        async def fetch_page(url: str) -> Optional[str]:
+            async with semaphore:
+                started = time.perf_counter()
+                try:
+                    response = await scraper_http_cache.get(url, headers)
+                except Exception as e:
+                    print(f"Error fetching {url}: {str(e)}")
+                    stats.pages_failed += 1
+                    SCRAPER_PAGES.labels(source.name, "failed").inc()
+                    return None
+                finally:
+                    elapsed = time.perf_counter() - started
+                    stats.fetch_seconds += elapsed
+                    SCRAPER_FETCH_SECONDS.labels(source.name).observe(elapsed)
+
+            if response.changed:
+                stats.pages_fetched += 1
+                SCRAPER_PAGES.labels(source.name, "fetched").inc()
+                return response.text
+            if response.status in (200, 304):
+                stats.pages_unchanged += 1
+                SCRAPER_PAGES.labels(source.name, "unchanged").inc()
+            else:
+                stats.pages_failed += 1
+                SCRAPER_PAGES.labels(source.name, "failed").inc()
+            return None
+
+        urls = source.page_urls()
+        tasks = [asyncio.create_task(fetch_page(url)) for url in urls]
+        try:
+            for url, task in zip(urls, tasks):
+                yield url, await task
+        finally:
+            # Stop fetching pages nobody will read
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def parse(
+        self,
+        source: NewsSource,
+        pages: AsyncIterator[Tuple[str, Optional[str]]],
+        stats: SourceStats
+    ) -> AsyncIterator[Tuple[str, List[Dict[str, str]]]]:
+        """Yield (page URL, raw articles) for each changed page"""
+        source_config = source.model_dump()
+        async for url, html in pages:
+            if not html:
+                continue
+            started = time.perf_counter()
+            raw_articles = await run_parser(parse_listing, html, source_config)
+            elapsed = time.perf_counter() - started
+            stats.parse_seconds += elapsed
+            SCRAPER_PARSE_SECONDS.labels(source.name).observe(elapsed)
+            stats.articles_parsed += len(raw_articles)
+            yield url, raw_articles
+
+    async def normalize(
+        self,
+        source: NewsSource,
+        pages: AsyncIterator[Tuple[str, List[Dict[str, str]]]],
+        since: Optional[datetime],
+        stats: SourceStats
+    ) -> AsyncIterator[List[NewsArticle]]:
+        """
+        Yield each page's articles with clean text, absolute URLs and publish times.
+
+        Articles published before `since` are dropped, and the source stops
+        at the first page whose dated articles all are. Articles without a
+        readable publish time are kept and stamped with the current time.
+        """
+        async for url, raw_articles in pages:
+            articles = []
+            dated = older = 0
+            for raw in raw_articles:
+                title = ' '.join(raw['title'].split())
+                link = urljoin(url, raw['link'].strip()) if raw['link'] else ''
+                if not title or not link.startswith('http'):
+                    continue
+                published_at = source.published_time(raw.get('published', ''))
+                if published_at is not None:
+                    dated += 1
+                    if since is not None and published_at < since:
+                        older += 1
+                        continue
+                    if stats.newest_published is None or published_at > stats.newest_published:
+                        stats.newest_published = published_at
+                articles.append(NewsArticle(
+                    title=title,
+                    summary=' '.join(raw['summary'].split()),
+                    url=link,
+                    publishedAt=(published_at or datetime.now()).isoformat(),
+                    source=source.name
+                ))
+            stats.articles_older += older
+            yield articles
+
+            if dated and older == dated:
+                stats.stopped_early = True
+                return
+
+    async def dedupe(
+        self,
+        pages: AsyncIterator[List[NewsArticle]],
+        seen: Set[str],
+        new_only: bool,
+        stats: SourceStats
+    ) -> AsyncIterator[NewsArticle]:
+        """
+        Yield articles not already yielded in this run.
+
+        With `new_only`, articles already in the article store are dropped
+        too. Stops the source once a page holds only stored articles.
+        """
+        async for articles in pages:
+            if not articles:
+                continue
+            known = await asyncio.to_thread(article_store.known_urls, [article.url for article in articles])
+            for article in articles:
+                key = normalize_url(article.url)
+                if key in seen:
+                    continue
+                seen.add(key)
+                if article.url in known:
+                    if new_only:
+                        continue
+                else:
+                    stats.articles_new += 1
+                yield article
+
+            if len(known) == len({article.url for article in articles}):
+                stats.stopped_early = True
+                return
+
+    async def crawl(self, source: NewsSource, seen: Set[str], new_only: bool = True) -> AsyncIterator[NewsArticle]:
+        """Run one source through every stage"""
+        stats = SourceStats()
+        self._stats[source.name] = stats
+        started = time.perf_counter()
+        if new_only:
+            stats.watermark = await asyncio.to_thread(article_store.watermark, source.name)
+
+        pages = self.fetch(source, stats)
+        raw_pages = self.parse(source, pages, stats)
+        normalized = self.normalize(source, raw_pages, stats.watermark, stats)
+        articles = self.dedupe(normalized, seen, new_only, stats)
+        try:
+            async for article in articles:
+                yield article
+            stats.completed = True
+        finally:
+            # Close downstream first so cancellation reaches the page fetches
+            for stage in (articles, normalized, raw_pages, pages):
+                await stage.aclose()
+            stats.duration_seconds = time.perf_counter() - started
+
+    async def stream(self, new_only: bool = True) -> AsyncIterator[NewsArticle]:
+        """
+        Crawl every source concurrently, yielding articles as they are found.
+
+        With `new_only`, only articles not yet in the article store are
+        yielded; otherwise every article found is.
+        """
+        queue: asyncio.Queue = asyncio.Queue()
+        seen: Set[str] = set()
+        semaphore = asyncio.Semaphore(NEWS_SOURCE_CONCURRENCY)
+
+        async def crawl_source(source: NewsSource) -> None:
+            async with semaphore:
+                try:
+                    async for article in self.crawl(source, seen, new_only):
+                        await queue.put(article)
+                except Exception as e:
+                    print(f"Error crawling {source.name}: {str(e)}")
+
+        tasks = [asyncio.create_task(crawl_source(source)) for source in self.sources]
+        finished = asyncio.gather(*tasks)
+        finished.add_done_callback(lambda _: queue.put_nowait(_DONE))
+        try:
+            while (item := await queue.get()) is not _DONE:
+                yield item
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def ingest(self, batch_size: int = NEWS_INGEST_BATCH_SIZE) -> int:
+        """
+        Crawl every source, writing new articles to the store in batches.
+
+        Then advances the watermark of each source crawled completely.
+        Returns how many articles were stored.
+        """
+        stored = 0
+        batch: List[NewsArticle] = []
+        async for article in self.stream():
+            batch.append(article)
+            if len(batch) >= batch_size:
+                stored += await asyncio.to_thread(article_store.upsert_articles, batch)
+                batch = []
+        if batch:
+            stored += await asyncio.to_thread(article_store.upsert_articles, batch)
+
+        await asyncio.to_thread(article_store.advance_watermarks, {
+            name: stats.newest_published
+            for name, stats in self._stats.items()
+            # A failed page may hold older articles that were never stored
+            if stats.completed and stats.pages_failed == 0 and stats.newest_published is not None
+        })
+        return stored
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Stats of the latest crawl of each source"""
+        return {name: stats.as_dict() for name, stats in self._stats.items()}
+
+# Shared news ingestion pipeline
+news_pipeline = NewsPipeline()
@@ -1,24 +1,153 @@
-import requests
-from bs4 import BeautifulSoup
+import asyncio
+import os
+import aiohttp
 from crewai.tools import BaseTool
+from dotenv import load_dotenv
 from pydantic import BaseModel, Field
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Type
 from urllib.parse import urljoin
+from ..services.cache import DiskCache, TieredCache
+from ..services.metrics import stats_collector
+from .http_client import HttpClient, http_client
+from .context_compression import RESEARCH_CONTEXT_TOKEN_BUDGET, compress_results
+from .html_parser import extract_main_text, parse_search_result_links, run_parser
+
+# Load environment variables
+load_dotenv()
+
+# Longest a single result page may take; the search's overall deadline still applies
+SEARCH_PAGE_TIMEOUT_SECONDS = float(os.getenv("SEARCH_PAGE_TIMEOUT_SECONDS", "10"))
+
+# Extra time a crew thread waits for the search past its deadline, so
+# the pages that finished in time are still returned
+SEARCH_DEADLINE_GRACE_SECONDS = 2.0
+
+# Where search results and page text are kept between runs
+SEARCH_CACHE_DIR = os.getenv(
+    "SEARCH_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(__file__)), '.cache', 'search')
+)
+
+# Result URLs of each search query
+SEARCH_RESULTS_CACHE_TTL_SECONDS = int(os.getenv("SEARCH_RESULTS_CACHE_TTL_SECONDS", "1800"))
+SEARCH_RESULTS_CACHE_MAX_ENTRIES = int(os.getenv("SEARCH_RESULTS_CACHE_MAX_ENTRIES", "1000"))
+SEARCH_RESULTS_CACHE_MAX_BYTES = int(os.getenv("SEARCH_RESULTS_CACHE_MAX_MB", "8")) * 1024 * 1024
+
+# Extracted text of each scraped result page
+SEARCH_PAGE_CACHE_TTL_SECONDS = int(os.getenv("SEARCH_PAGE_CACHE_TTL_SECONDS", "21600"))
+SEARCH_PAGE_CACHE_MAX_ENTRIES = int(os.getenv("SEARCH_PAGE_CACHE_MAX_ENTRIES", "200"))
+SEARCH_PAGE_CACHE_MAX_BYTES = int(os.getenv("SEARCH_PAGE_CACHE_MAX_MB", "64")) * 1024 * 1024
+
+# Bumped whenever the extracted page text changes, so stale text is never served
+PAGE_TEXT_VERSION = 2
+
+search_results_cache = TieredCache(
+    max_entries=SEARCH_RESULTS_CACHE_MAX_ENTRIES,
+    ttl_seconds=SEARCH_RESULTS_CACHE_TTL_SECONDS,
+    disk=DiskCache(os.path.join(SEARCH_CACHE_DIR, 'results'), SEARCH_RESULTS_CACHE_MAX_BYTES)
+)
+page_text_cache = TieredCache(
+    max_entries=SEARCH_PAGE_CACHE_MAX_ENTRIES,
+    ttl_seconds=SEARCH_PAGE_CACHE_TTL_SECONDS,
+    disk=DiskCache(os.path.join(SEARCH_CACHE_DIR, f'pages-v{PAGE_TEXT_VERSION}'), SEARCH_PAGE_CACHE_MAX_BYTES)
+)
+
+stats_collector.register_cache("search_results", search_results_cache.stats)
+stats_collector.register_cache("search_pages", page_text_cache.stats)
+
+def get_search_cache_stats() -> Dict[str, Any]:
+    """Return hit/miss statistics for the search result and page text caches"""
+    return {
+        "results": search_results_cache.stats(),
+        "pages": page_text_cache.stats()
+    }
 
 
 class CustomSearchToolSchema(BaseModel):
     query: str = Field(description="Search query about Indian financial markets")
     limit: Optional[int] = Field(default=5, description="Number of search results to return")
     lang: Optional[str] = Field(default="en", description="Language code")
-    timeout: Optional[int] = Field(default=60000, description="Timeout in milliseconds")
+    timeout: Optional[int] = Field(default=20000, description="Overall deadline in milliseconds")
 
 
 class CustomSearchTool(BaseTool):
     name: str = "Indian Financial Market Search Tool"
     description: str = "Performs a search using DuckDuckGo specifically for Indian financial market information and scrapes result pages"
-    args_schema = CustomSearchToolSchema
+    args_schema: Type[BaseModel] = CustomSearchToolSchema
+
+    def _run(self, query: str, limit: int = 5, lang: str = "en", timeout: int = 20000) -> List[Dict[str, Any]]:
+        # Runs in a crew worker thread; the requests go through the shared HTTP client
+        try:
+            return http_client.run_sync(
+                lambda client: self._search(client, query, limit, lang, timeout),
+                timeout=timeout / 1000 + SEARCH_DEADLINE_GRACE_SECONDS
+            )
+        except Exception as e:
+            return []
 
-    def _run(self, query: str, limit: int = 5, lang: str = "en", timeout: int = 60000) -> List[Dict[str, Any]]:
+    async def _arun(self, query: str, limit: int = 5, lang: str = "en", timeout: int = 20000) -> List[Dict[str, Any]]:
+        try:
+            return await self._search(http_client, query, limit, lang, timeout)
+        except Exception as e:
+            return []
+
+    async def _search(
+        self,
+        client: HttpClient,
+        query: str,
+        limit: int,
+        lang: str,
+        timeout: int
+    ) -> List[Dict[str, Any]]:
+        """
+        Search, then scrape the result pages concurrently.
+
+        Everything must finish within `timeout` milliseconds; pages still
+        loading at the deadline are dropped and the rest are returned in
+        search result order. Result URLs and page text are served from
+        cache when fresh, so a repeated search needs no network at all.
+        Page text is cut down to the passages most relevant to the query,
+        within RESEARCH_CONTEXT_TOKEN_BUDGET tokens across all pages.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout / 1000
+
+        query_key = f"{lang}:{limit}:{' '.join(query.lower().split())}"
+        result_links = await asyncio.to_thread(search_results_cache.get, query_key)
+        if result_links is None:
+            result_links = await self._search_links(client, query, limit, lang, timeout)
+            if result_links:
+                await asyncio.to_thread(search_results_cache.set, query_key, result_links)
+        if not result_links:
+            return []
+
+        # Scrape the result pages at the same time, until the deadline
+        page_timeout = int(min(SEARCH_PAGE_TIMEOUT_SECONDS, max(deadline - loop.time(), 0)) * 1000)
+        tasks = [asyncio.create_task(self.scrape_page(client, url, timeout=page_timeout)) for url in result_links]
+        await asyncio.wait(tasks, timeout=max(deadline - loop.time(), 0))
+
+        results = []
+        for url, task in zip(result_links, tasks):
+            if not task.done():
+                task.cancel()
+                continue
+            error = task.exception()
+            if error is not None:
+                results.append({
+                    "url": url,
+                    "error": str(error) or type(error).__name__
+                })
+            else:
+                results.append({
+                    "url": url,
+                    "content": task.result()
+                })
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+        return await asyncio.to_thread(compress_results, query, results, RESEARCH_CONTEXT_TOKEN_BUDGET)
+
+    async def _search_links(self, client: HttpClient, query: str, limit: int, lang: str, timeout: int) -> List[str]:
+        """Result URLs of a DuckDuckGo search"""
         # Add "India" to the query to focus on Indian markets
         india_query = f"{query} India financial markets"
         search_url = f"https://duckduckgo.com/html/?q={india_query}&kl={lang}"
@@ -27,57 +156,32 @@ class CustomSearchTool(BaseTool):
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
         }
 
-        try:
-            response = requests.get(search_url, headers=headers, timeout=timeout / 1000)
-            if response.status_code != 200:
-                raise Exception(f"Error fetching search results. Status code: {response.status_code}")
-
-            soup = BeautifulSoup(response.text, "html.parser")
-            
-            # Extract result links
-            result_links = []
-            for link in soup.find_all("a", class_="result__url"):
-                href = link.get("href")
-                if href and href.startswith("http"):
-                    result_links.append(href)
-                if len(result_links) >= limit:
-                    break
-
-            # Scrape each result page
-            results = []
-            for url in result_links:
-                try:
-                    content = self.scrape_page(url, timeout=timeout)
-                    results.append({
-                        "url": url,
-                        "content": content
-                    })
-                except Exception as e:
-                    results.append({
-                        "url": url,
-                        "error": str(e)
-                    })
-
-            return results
-        except Exception as e:
-            return []
+        async with client.get(search_url, headers=headers, timeout=aiohttp.ClientTimeout(total=timeout / 1000)) as response:
+            if response.status != 200:
+                raise Exception(f"Error fetching search results. Status code: {response.status}")
+            html = await response.text()
+
+        # Extract result links
+        return await run_parser(parse_search_result_links, html, limit)
 
-    def scrape_page(self, url: str, timeout: int) -> str:
+    async def scrape_page(self, client: HttpClient, url: str, timeout: int) -> str:
+        """Main text of the page at the URL, from cache if scraped recently"""
+        content = await asyncio.to_thread(page_text_cache.get, url)
+        if content is not None:
+            return content
+        content = await self._scrape_page(client, url, timeout)
+        await asyncio.to_thread(page_text_cache.set, url, content)
+        return content
+
+    async def _scrape_page(self, client: HttpClient, url: str, timeout: int) -> str:
         """Scrapes the content of the page at the provided URL."""
         headers = {
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
         }
         
-        try:
-            response = requests.get(url, headers=headers, timeout=timeout / 1000)
-            if response.status_code != 200:
-                raise Exception(f"Error fetching page. Status code: {response.status_code}")
+        async with client.get(url, headers=headers, timeout=aiohttp.ClientTimeout(total=timeout / 1000)) as response:
+            if response.status != 200:
+                raise Exception(f"Error fetching page. Status code: {response.status}")
+            html = await response.text()
 
-            soup = BeautifulSoup(response.text, "html.parser")
-            body = soup.find("body")
-            if not body:
-                return "No body content found"
-
-            return " ".join(body.stripped_strings)
-        except Exception as e:
-            raise
+        return await run_parser(extract_main_text, html)
\ No newline at end of file